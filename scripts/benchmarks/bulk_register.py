@@ -0,0 +1,92 @@
+"""
+Bulk registration benchmark.
+
+Registers --users new users through the application, wired to the
+docker-compose services, once with concurrent calls to the single-item
+POST /api/v1/users/register and once with POST /api/v1/users/register:batch
+carrying --batch-size users per call. Requests go through an in-process
+ASGI call with rate limiting off. Reports the registration throughput.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import orjson
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.container import container
+from app.main import create_app
+from app.presentation.batch import NDJSON_MEDIA_TYPE
+
+PASSWORD = "benchmark-password"  # noqa: S105 Possible hardcoded password
+ADMIN_TOKEN = "benchmark-admin-token"  # noqa: S105 Possible hardcoded password
+
+
+def payloads(users: int) -> list[dict[str, str]]:
+    run = uuid.uuid4().hex[:8]
+    return [
+        {"email": f"benchmark-{run}-{index}@example.com", "password": PASSWORD}
+        for index in range(users)
+    ]
+
+
+async def single(client: AsyncClient, users: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def register(payload: dict[str, str]) -> None:
+        async with semaphore:
+            response = await client.post("/api/v1/users/register", json=payload)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(register(payload) for payload in payloads(users)))
+    return time.perf_counter() - start
+
+
+async def batch(client: AsyncClient, users: int, batch_size: int) -> float:
+    items = payloads(users)
+    start = time.perf_counter()
+    for first in range(0, users, batch_size):
+        response = await client.post(
+            "/api/v1/users/register:batch",
+            content=b"\n".join(
+                orjson.dumps(item) for item in items[first : first + batch_size]
+            ),
+            headers={
+                "Content-Type": NDJSON_MEDIA_TYPE,
+                "Authorization": f"Bearer {ADMIN_TOKEN}",
+            },
+        )
+        response.raise_for_status()
+        if failed := response.json()["failed"]:
+            msg = f"{failed} users of the batch were not registered"
+            raise RuntimeError(msg)
+    return time.perf_counter() - start
+
+
+async def main(users: int, batch_size: int, concurrency: int) -> None:
+    settings.rate_limits = {}
+    settings.admin_token = ADMIN_TOKEN
+    await container.init()
+    app = create_app()
+    print(f"users: {users:,}, batch size: {batch_size:,}, concurrency: {concurrency}")
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://benchmark", timeout=600
+    ) as client:
+        elapsed = await single(client, users, concurrency)
+        print(f"{'single':<8} {users / elapsed:>10,.0f} users/s")
+        elapsed = await batch(client, users, batch_size)
+        print(f"{'batch':<8} {users / elapsed:>10,.0f} users/s")
+    await container.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.batch_size, args.concurrency))
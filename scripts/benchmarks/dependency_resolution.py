@@ -0,0 +1,123 @@
+"""
+Dependency resolution benchmark.
+
+Compares the per-request cost of FastAPI resolving a use case built per
+request (async generator dependency on an async generator unit of work
+dependency) against returning a singleton use case that opens its unit of
+work per call. Requests go through an in-process ASGI call with stubbed
+collaborators, so only routing and dependency resolution are measured.
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+from typing import Annotated
+from unittest.mock import Mock
+
+from fastapi import Depends, FastAPI
+
+from app.application.use_cases.register_user import RegisterUserUseCase
+
+# Shared stubs, so that only the use case wiring differs between the apps
+UOW = Mock()
+CODE_STORE = Mock()
+EVENT_PUBLISHER = Mock()
+
+
+def per_request_app() -> FastAPI:
+    app = FastAPI()
+
+    async def uow() -> AsyncGenerator[Mock]:
+        yield UOW
+
+    async def use_case(
+        uow: Annotated[Mock, Depends(uow)],
+    ) -> AsyncGenerator[RegisterUserUseCase]:
+        yield RegisterUserUseCase(
+            uow_factory=lambda: uow,
+            code_store=CODE_STORE,
+            event_publisher=EVENT_PUBLISHER,
+        )
+
+    @app.post("/")
+    async def route(
+        use_case: Annotated[RegisterUserUseCase, Depends(use_case)],
+    ) -> bool:
+        return use_case is not None
+
+    return app
+
+
+def singleton_app() -> FastAPI:
+    app = FastAPI()
+    singleton = RegisterUserUseCase(
+        uow_factory=lambda: UOW,
+        code_store=CODE_STORE,
+        event_publisher=EVENT_PUBLISHER,
+    )
+
+    async def use_case() -> RegisterUserUseCase:
+        return singleton
+
+    @app.post("/")
+    async def route(
+        use_case: Annotated[RegisterUserUseCase, Depends(use_case)],
+    ) -> bool:
+        return use_case is not None
+
+    return app
+
+
+async def request(app: FastAPI) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+
+    async def receive() -> dict[str, object]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(_message: dict[str, object]) -> None:
+        return None
+
+    await app(scope, receive, send)
+
+
+async def time_requests(app: FastAPI, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await request(app)
+    return (time.perf_counter() - start) / iterations
+
+
+async def main(iterations: int) -> None:
+    per_request = per_request_app()
+    singleton = singleton_app()
+    await time_requests(per_request, 1_000)
+    await time_requests(singleton, 1_000)
+
+    before = await time_requests(per_request, iterations)
+    after = await time_requests(singleton, iterations)
+
+    print(f"iterations:              {iterations:,}")
+    print(f"per-request use case:    {before * 1e6:.2f} us")
+    print(f"singleton use case:      {after * 1e6:.2f} us")
+    print(f"saved per request:       {(before - after) * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,109 @@
+"""
+Email delivery benchmark.
+
+Sends verification emails to a local aiosmtpd server, once with a new SMTP
+connection per mail and once through the pooled SmtpEmailSender.
+"""
+
+import argparse
+import asyncio
+import smtplib
+import socket
+import time
+
+from aiosmtpd.controller import Controller
+
+from app.infrastructure.email.smtp_email_sender import SmtpEmailSender
+from app.infrastructure.email.templates import render_event_email
+
+SENDER = "no-reply@example.com"
+DOMAINS = ("gmail.com", "outlook.com", "yahoo.com", "example.com")
+
+
+class SinkHandler:
+    async def handle_DATA(self, _server, _session, _envelope) -> str:  # noqa: N802 aiosmtpd hook name
+        return "250 Message accepted"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _messages(count: int):
+    return [
+        render_event_email(
+            {
+                "event_type": "UserRegistered",
+                "payload": {
+                    "email": f"user{i}@{DOMAINS[i % len(DOMAINS)]}",
+                    "code": f"{i % 10_000:04d}",
+                },
+            },
+            SENDER,
+        )
+        for i in range(count)
+    ]
+
+
+async def connect_per_mail(port: int, messages, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    def send(message) -> None:
+        with smtplib.SMTP("127.0.0.1", port) as connection:
+            connection.send_message(message)
+
+    async def send_limited(message) -> None:
+        async with semaphore:
+            await asyncio.to_thread(send, message)
+
+    await asyncio.gather(*(send_limited(message) for message in messages))
+
+
+async def pooled(port: int, messages, pool_size: int) -> int:
+    sender = SmtpEmailSender(
+        "127.0.0.1", port, pool_size=pool_size, per_domain_limit=pool_size
+    )
+    try:
+        await asyncio.gather(*(sender.send(message) for message in messages))
+    finally:
+        await sender.close()
+    return sender.connections_opened
+
+
+async def main(count: int, pool_size: int) -> None:
+    port = _free_port()
+    controller = Controller(SinkHandler(), hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        messages = _messages(count)
+
+        start = time.perf_counter()
+        await connect_per_mail(port, messages, pool_size)
+        per_mail_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        connections = await pooled(port, messages, pool_size)
+        pooled_elapsed = time.perf_counter() - start
+    finally:
+        controller.stop()
+
+    print(f"messages:             {count:,}")
+    print(f"concurrency:          {pool_size}")
+    print(
+        f"connect per mail:     {count / per_mail_elapsed:,.0f} msg/s "
+        f"({count:,} connections)"
+    )
+    print(
+        f"pooled sessions:      {count / pooled_elapsed:,.0f} msg/s "
+        f"({connections} connections)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2_000)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.pool_size))
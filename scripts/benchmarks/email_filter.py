@@ -0,0 +1,49 @@
+"""
+Email filter benchmark.
+
+Reports the Bloom filter size for the target user count, and measures the
+false positive rate and the cost of a check on a filter scaled down to
+--sample users at the same bits per user, so it fits a quick run.
+"""
+
+import argparse
+import time
+
+from app.infrastructure.email_filter.bloom_filter import BloomFilter, BloomParameters
+
+
+def main(users: int, false_positive_rate: float, sample: int) -> None:
+    parameters = BloomParameters.for_capacity(users, false_positive_rate)
+    print(f"users:                 {users:,}")
+    print(f"target fp rate:        {false_positive_rate:.2%}")
+    print(f"bits / hashes:         {parameters.bits:,} / {parameters.hashes}")
+    print(f"memory:                {parameters.bits / 8 / 1024 / 1024:,.1f} MiB")
+    print(f"bits per user:         {parameters.bits / users:.2f}")
+    print(f"expected fp rate:      {parameters.false_positive_rate(users):.3%}")
+
+    bloom_filter = BloomFilter(
+        BloomParameters.for_capacity(sample, false_positive_rate)
+    )
+    start = time.perf_counter()
+    for index in range(sample):
+        bloom_filter.add(f"user{index}@example.com")
+    add_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    false_positives = sum(
+        f"absent{index}@example.com" in bloom_filter for index in range(sample)
+    )
+    check_elapsed = time.perf_counter() - start
+
+    print(f"measured fp rate:      {false_positives / sample:.3%} ({sample:,} users)")
+    print(f"add:                   {add_elapsed / sample * 1e6:.2f} us")
+    print(f"check:                 {check_elapsed / sample * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100_000_000)
+    parser.add_argument("--false-positive-rate", type=float, default=0.01)
+    parser.add_argument("--sample", type=int, default=1_000_000)
+    args = parser.parse_args()
+    main(args.users, args.false_positive_rate, args.sample)
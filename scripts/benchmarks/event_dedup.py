@@ -0,0 +1,85 @@
+"""
+Event deduplication benchmark.
+
+Simulates a steady 1M events/hour stream through MemoryEventDeduplicator
+and reports the steady-state memory and the cost of one claim.
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from uuid import uuid4
+
+from app.infrastructure.event_deduplicator.memory_event_deduplicator import (
+    MemoryEventDeduplicator,
+)
+
+
+class SimulatedClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def fill(
+    deduplicator: MemoryEventDeduplicator,
+    clock: SimulatedClock,
+    event_ids: list[str],
+    interval: float,
+) -> None:
+    for event_id in event_ids:
+        clock.now += interval
+        await deduplicator.claim(event_id)
+
+
+async def main(events_per_hour: int, window_seconds: int) -> None:
+    interval = 3600 / events_per_hour
+    # Two windows so that eviction is running at steady state
+    total = int(2 * window_seconds / interval)
+
+    # Memory: ids are allocated while tracing, as they would be when decoded
+    clock = SimulatedClock()
+    deduplicator = MemoryEventDeduplicator(
+        window_seconds=window_seconds, max_entries=events_per_hour, clock=clock
+    )
+    tracemalloc.start()
+    for _ in range(total):
+        clock.now += interval
+        await deduplicator.claim(str(uuid4()))
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    ids_in_window = len(deduplicator)
+
+    # Lookup cost on a fresh instance with pre-generated ids
+    clock = SimulatedClock()
+    deduplicator = MemoryEventDeduplicator(
+        window_seconds=window_seconds, max_entries=events_per_hour, clock=clock
+    )
+    event_ids = [str(uuid4()) for _ in range(total)]
+    start = time.perf_counter()
+    await fill(deduplicator, clock, event_ids, interval)
+    elapsed = time.perf_counter() - start
+
+    duplicates = event_ids[-10_000:]
+    start = time.perf_counter()
+    await fill(deduplicator, clock, duplicates, 0)
+    duplicate_elapsed = time.perf_counter() - start
+
+    print(f"events/hour:          {events_per_hour:,}")
+    print(f"window:               {window_seconds}s")
+    print(f"ids in window:        {ids_in_window:,}")
+    print(f"memory (steady):      {current / 1024 / 1024:.1f} MiB")
+    print(f"bytes per id:         {current / ids_in_window:.0f}")
+    print(f"claim (new id):       {elapsed / total * 1e6:.2f} us")
+    print(f"claim (duplicate):    {duplicate_elapsed / len(duplicates) * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events-per-hour", type=int, default=1_000_000)
+    parser.add_argument("--window-seconds", type=int, default=600)
+    args = parser.parse_args()
+    asyncio.run(main(args.events_per_hour, args.window_seconds))
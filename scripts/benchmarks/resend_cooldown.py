@@ -0,0 +1,113 @@
+"""
+Resend cooldown benchmark.
+
+Measures the cost of a resend-code request for an existing user without a
+cooldown (user lookup, bcrypt verify, code write, publish) against a
+request rejected by the cooldown. The user repository and the event
+publisher are in-process stubs. The code store is in memory, or Redis with
+--redis-url, which adds the one round trip a rejection costs.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import time
+from types import TracebackType
+from typing import Self
+
+import redis.asyncio as redis
+
+from app.application.dto.user_dto import ResendCodeRequest
+from app.application.exceptions import ResendCooldownError
+from app.application.ports.code_store import CodeStore
+from app.application.use_cases.resend_code import ResendCodeUseCase
+from app.domain import DomainEvent, Email, Password, User
+from app.infrastructure.code_store.memory_code_store import MemoryCodeStore
+from app.infrastructure.code_store.redis_code_store import RedisCodeStore
+
+EMAIL = Email("user@example.com")
+PASSWORD = "securepassword123"  # noqa: S105 Possible hardcoded password
+# bcrypt makes a full request take hundreds of milliseconds
+FULL_ITERATIONS = 10
+
+
+class StubUserRepository:
+    def __init__(self, user: User) -> None:
+        self._user = user
+
+    async def get_by_email(self, _email: Email) -> User:
+        return self._user
+
+
+class StubUnitOfWork:
+    def __init__(self, user: User) -> None:
+        self.user_repository = StubUserRepository(user)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        return None
+
+
+class StubEventPublisher:
+    async def publish(self, _event: DomainEvent) -> None:
+        return None
+
+
+async def time_requests(use_case: ResendCodeUseCase, iterations: int) -> float:
+    request = ResendCodeRequest(EMAIL, PASSWORD)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with contextlib.suppress(ResendCooldownError):
+            await use_case.execute(request)
+    return (time.perf_counter() - start) / iterations
+
+
+def create_use_case(user: User, code_store: CodeStore) -> ResendCodeUseCase:
+    uow = StubUnitOfWork(user)
+    return ResendCodeUseCase(
+        uow_factory=lambda: uow,
+        code_store=code_store,
+        event_publisher=StubEventPublisher(),
+    )
+
+
+async def main(iterations: int, redis_url: str | None) -> None:
+    user = User.create(email=EMAIL, password=Password.create(PASSWORD))
+    client = None
+    if redis_url is None:
+        open_store: CodeStore = MemoryCodeStore(cooldown_seconds=0)
+        cooling_store: CodeStore = MemoryCodeStore(cooldown_seconds=3600)
+    else:
+        client = redis.from_url(redis_url, decode_responses=True)
+        await client.delete(f"resend_cooldown:{EMAIL}")
+        open_store = RedisCodeStore(client, cooldown_seconds=0)
+        cooling_store = RedisCodeStore(client, cooldown_seconds=3600)
+
+    # Without a cooldown every request does the full work
+    full = await time_requests(create_use_case(user, open_store), FULL_ITERATIONS)
+    # The first request starts the cooldown, all the others are rejected
+    rejected = await time_requests(create_use_case(user, cooling_store), iterations)
+
+    if client is not None:
+        await client.delete(f"resend_cooldown:{EMAIL}")
+        await client.aclose()
+
+    print(f"code store:          {'redis' if redis_url else 'memory'}")
+    print(f"full request:        {full * 1e6:,.1f} us")
+    print(f"rejected request:    {rejected * 1e6:,.1f} us")
+    print(f"speedup:             {full / rejected:,.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.redis_url))
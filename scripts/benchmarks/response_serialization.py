@@ -0,0 +1,131 @@
+"""
+Response serialization benchmark.
+
+Compares the per-request cost of the register route response path before
+(use case result -> response schema -> FastAPI validation + serialization)
+and after (use case result -> orjson bytes), both for the serialization
+step alone and through a full in-process ASGI request.
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from fastapi import FastAPI, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.application.dto.user_dto import RegisterUserResponse
+from app.domain import Email, UserId
+from app.presentation.responses import JSONBytesResponse, register_user_response
+from app.presentation.schemas.users import RegisterResponseSchema
+
+RESULT = RegisterUserResponse(
+    user_id=UserId.generate(),
+    email=Email("user@example.com"),
+    message=RegisterResponseSchema.model_fields["message"].default,
+)
+ADAPTER = TypeAdapter(RegisterResponseSchema)
+
+
+def schema_path() -> bytes:
+    schema = RegisterResponseSchema(
+        user_id=RESULT.user_id.value,
+        email=RESULT.email.value,
+        message=RESULT.message,
+    )
+    # What FastAPI does with a returned model: validate it again, encode it
+    validated = ADAPTER.validate_python(schema, from_attributes=True)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def lean_path() -> bytes:
+    return register_user_response(RESULT).body
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/before", status_code=status.HTTP_201_CREATED)
+    async def before() -> RegisterResponseSchema:
+        return RegisterResponseSchema(
+            user_id=RESULT.user_id.value,
+            email=RESULT.email.value,
+            message=RESULT.message,
+        )
+
+    @app.post(
+        "/after",
+        status_code=status.HTTP_201_CREATED,
+        response_model=RegisterResponseSchema,
+        response_class=JSONBytesResponse,
+    )
+    async def after() -> JSONBytesResponse:
+        return register_user_response(RESULT)
+
+    return app
+
+
+async def request(app: FastAPI, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+
+    async def receive() -> dict[str, object]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(_message: dict[str, object]) -> None:
+        return None
+
+    await app(scope, receive, send)
+
+
+def time_sync(function: Callable[[], bytes], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations
+
+
+async def time_async(function: Callable[[], Awaitable[None]], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await function()
+    return (time.perf_counter() - start) / iterations
+
+
+async def main(iterations: int) -> None:
+    app = create_app()
+    for path in ("/before", "/after"):
+        await time_async(lambda path=path: request(app, path), 1_000)
+
+    schema = time_sync(schema_path, iterations)
+    lean = time_sync(lean_path, iterations)
+    before = await time_async(lambda: request(app, "/before"), iterations)
+    after = await time_async(lambda: request(app, "/after"), iterations)
+
+    print(f"iterations:               {iterations:,}")
+    print(f"serialize (schema path):  {schema * 1e6:.2f} us")
+    print(f"serialize (orjson path):  {lean * 1e6:.2f} us")
+    print(f"request (schema path):    {before * 1e6:.2f} us")
+    print(f"request (orjson path):    {after * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,130 @@
+"""
+User export benchmark.
+
+Seeds --rows users into a schema of Postgres (DATABASE_URL), then exports
+them as NDJSON or CSV, each way in a fresh process: streamed
+from a server-side cursor in batches of --batch-size, as `export-users` and
+the admin endpoint do, and fetched all at once. Reports rows per second and
+the peak RSS of the process, which only the fetch grows with the table.
+"""
+
+import argparse
+import asyncio
+import resource
+import time
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import asyncpg
+
+from app.application.ports.user_exporter import export_columns
+from app.config import settings
+from app.infrastructure.database.user_export import export_users
+from app.presentation.export_encoders import encode
+
+SCHEMA = "benchmark_export"
+SEED_CHUNK = 1_000_000
+
+USERS_TABLE = """
+CREATE TABLE users (
+    id UUID PRIMARY KEY,
+    email VARCHAR(255) NOT NULL,
+    hashed_password VARCHAR(255) NOT NULL,
+    is_active BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    version INTEGER NOT NULL DEFAULT 1
+)
+"""
+
+SEED = """
+INSERT INTO users (id, email, hashed_password, is_active, created_at)
+SELECT gen_random_uuid(), 'user' || i || '@example.com',
+    '$2b$12$' || md5(i::text) || md5(i::text), i % 2 = 0, now()
+FROM generate_series($1::bigint, $2::bigint) AS i
+"""
+
+
+async def seed(rows: int) -> None:
+    connection = await asyncpg.connect(settings.database_url)
+    await connection.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await connection.execute(f"CREATE SCHEMA {SCHEMA}")
+    await connection.execute(f"SET search_path TO {SCHEMA}")
+    await connection.execute(USERS_TABLE)
+    for first in range(0, rows, SEED_CHUNK):
+        last = min(first + SEED_CHUNK, rows) - 1
+        await connection.execute(SEED, first, last)
+    await connection.close()
+
+
+async def fetched(pool: asyncpg.Pool) -> AsyncIterator[list[Any]]:
+    columns = ", ".join(export_columns())
+    async with pool.acquire() as connection:
+        yield await connection.fetch(f"SELECT {columns} FROM users")  # noqa: S608 fixed columns
+
+
+async def export(mode: str, export_format: str, batch_size: int) -> int:
+    pool = await asyncpg.create_pool(
+        dsn=settings.database_url,
+        min_size=1,
+        max_size=1,
+        server_settings={"search_path": SCHEMA},
+    )
+    batches = (
+        export_users([pool], batch_size=batch_size)
+        if mode == "stream"
+        else fetched(pool)
+    )
+    rows = 0
+
+    async def counted() -> AsyncIterator[list[Any]]:
+        nonlocal rows
+        async for batch in batches:
+            rows += len(batch)
+            yield batch
+
+    # The encoded chunks are dropped, as a client reading fast enough would
+    async for _chunk in encode(counted(), export_format, export_columns()):
+        pass
+    await pool.close()
+    return rows
+
+
+def run(mode: str, export_format: str, batch_size: int) -> tuple[int, float, int]:
+    start = time.perf_counter()
+    rows = asyncio.run(export(mode, export_format, batch_size))
+    elapsed = time.perf_counter() - start
+    # KiB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rows, elapsed, peak_rss
+
+
+def main(rows: int, batch_size: int, *, skip_seed: bool) -> None:
+    if not skip_seed:
+        start = time.perf_counter()
+        asyncio.run(seed(rows))
+        print(f"seeded {rows:,} rows in {time.perf_counter() - start:,.0f}s")
+    print(f"batch size: {batch_size:,}")
+    for export_format in ("ndjson", "csv"):
+        for mode in ("stream", "fetch"):
+            # A fresh process each, so that peak RSS is that of one export
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                exported, elapsed, peak_rss = executor.submit(
+                    run, mode, export_format, batch_size
+                ).result()
+            print(
+                f"{export_format:<6} {mode:<6} {exported:>12,} rows "
+                f"{exported / elapsed:>10,.0f} rows/s "
+                f"peak RSS {peak_rss / 1024:>8,.0f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--batch-size", type=int, default=settings.export_batch_size)
+    parser.add_argument(
+        "--skip-seed", action="store_true", help=f"reuse the {SCHEMA} schema"
+    )
+    args = parser.parse_args()
+    main(args.rows, args.batch_size, skip_seed=args.skip_seed)
@@ -0,0 +1,149 @@
+"""
+Admin user listing benchmark.
+
+Applies the migrations to a schema of Postgres (DATABASE_URL), seeds --rows
+users spread over --months monthly partitions, then reports page latencies
+of the admin listing at increasing page depths: keyset pagination, as
+GET /api/v1/users does, against OFFSET pagination of the same page, and
+keyset pagination of an email prefix search.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from uuid import UUID
+
+import asyncpg
+
+from app.config import settings
+from app.infrastructure.database.migrator import PostgresMigrator
+from app.infrastructure.database.user_listing import list_users
+
+SCHEMA = "benchmark_listing"
+SEED_CHUNK = 1_000_000
+
+SEED = """
+WITH seeded AS (
+    SELECT gen_random_uuid() AS id, 'user' || i || '@example.com' AS email,
+        now() - random() * make_interval(months => $3) AS created_at
+    FROM generate_series($1::bigint, $2::bigint) AS i
+), inserted AS (
+    INSERT INTO users (id, email, hashed_password, is_active, created_at)
+    SELECT id, email, 'x', random() < 0.9, created_at FROM seeded
+)
+INSERT INTO user_emails (email, user_id, created_at)
+SELECT email, id, created_at FROM seeded
+"""
+
+OFFSET_PAGE = "SELECT * FROM users ORDER BY created_at, id OFFSET $1 LIMIT $2"
+
+# Cursors of the deep pages, found the slow way once
+CURSOR = "SELECT created_at, id FROM users ORDER BY created_at, id OFFSET $1 LIMIT 1"
+PREFIX_CURSOR = """
+SELECT created_at, user_id FROM user_emails WHERE email LIKE $2
+ORDER BY created_at, user_id OFFSET $1 LIMIT 1
+"""
+
+
+async def seed(pool: asyncpg.Pool, rows: int, months: int) -> None:
+    async with pool.acquire() as connection:
+        await connection.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await connection.execute(f"CREATE SCHEMA {SCHEMA}")
+    await PostgresMigrator(pool).migrate()
+    async with pool.acquire() as connection:
+        await connection.execute("SELECT ensure_users_partitions(1, $1)", months + 1)
+        for first in range(0, rows, SEED_CHUNK):
+            last = min(first + SEED_CHUNK, rows) - 1
+            await connection.execute(SEED, first, last, months)
+        await connection.execute("ANALYZE")
+
+
+async def latencies(
+    samples: int, operation: Callable[[], Awaitable[object]]
+) -> tuple[float, float]:
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await operation()
+        timings.append(time.perf_counter() - start)
+    percentiles = statistics.quantiles(timings, n=100)
+    return percentiles[49] * 1e3, percentiles[98] * 1e3
+
+
+async def cursor_at(
+    pool: asyncpg.Pool, offset: int, prefix: str | None
+) -> tuple[datetime, UUID] | None:
+    async with pool.acquire() as connection:
+        if prefix is None:
+            row = await connection.fetchrow(CURSOR, offset)
+        else:
+            row = await connection.fetchrow(PREFIX_CURSOR, offset, prefix + "%")
+    return (row[0], row[1]) if row else None
+
+
+async def run(pool: asyncpg.Pool, depth: int, limit: int, samples: int) -> None:
+    offset = depth * limit
+    after = await cursor_at(pool, offset, None)
+    if after is None:
+        return
+    keyset_p50, keyset_p99 = await latencies(
+        samples, lambda: list_users([pool], limit, after)
+    )
+
+    async def offset_page() -> None:
+        async with pool.acquire() as connection:
+            await connection.fetch(OFFSET_PAGE, offset, limit)
+
+    offset_p50, offset_p99 = await latencies(samples, offset_page)
+
+    line = (
+        f"page {depth:>9,} keyset p50 {keyset_p50:>8,.2f} ms p99 {keyset_p99:>8,.2f} "
+        f"ms offset p50 {offset_p50:>9,.2f} ms p99 {offset_p99:>9,.2f} ms"
+    )
+    prefix_after = await cursor_at(pool, offset, "user1")
+    if prefix_after is not None:
+        prefix_p50, prefix_p99 = await latencies(
+            samples,
+            lambda: list_users([pool], limit, prefix_after, email_prefix="user1"),
+        )
+        line += f" prefix p50 {prefix_p50:>8,.2f} ms p99 {prefix_p99:>8,.2f} ms"
+    print(line)
+
+
+async def main(
+    rows: int, months: int, limit: int, samples: int, *, skip_seed: bool
+) -> None:
+    pool = await asyncpg.create_pool(
+        dsn=settings.database_url,
+        min_size=1,
+        max_size=2,
+        server_settings={"search_path": SCHEMA},
+    )
+    if not skip_seed:
+        start = time.perf_counter()
+        await seed(pool, rows, months)
+        print(f"seeded {rows:,} rows in {time.perf_counter() - start:,.0f}s")
+    print(f"rows: {rows:,}, page size: {limit}, samples: {samples}")
+    depth = 1
+    while depth * limit < rows:
+        await run(pool, depth, limit, samples)
+        depth *= 10
+    await pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument(
+        "--skip-seed", action="store_true", help=f"reuse the {SCHEMA} schema"
+    )
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.rows, args.months, args.limit, args.samples, skip_seed=args.skip_seed)
+    )
@@ -0,0 +1,98 @@
+"""
+User lookup benchmark.
+
+Runs concurrent get_by_email calls against Postgres (DATABASE_URL), each in
+its own unit of work as a request would, once with one query and one
+pooled connection per lookup and once through the batching loader.
+Reports the read throughput, the number of queries and the number of
+connections the pool had to open.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import asyncpg
+
+from app.config import settings
+from app.domain import Email
+from app.infrastructure.database.postgres_unit_of_work import PostgresUnitOfWork
+from app.infrastructure.database.user_loader import PostgresUserLoader
+
+EMAIL_PATTERN = "benchmark-lookup-{}@example.com"
+
+
+async def seed(pool: asyncpg.Pool, users: int) -> None:
+    await pool.executemany(
+        """
+        WITH claimed AS (
+            INSERT INTO user_emails (email, user_id, created_at)
+            VALUES ($2, $1, $3)
+            ON CONFLICT (email) DO NOTHING
+            RETURNING user_id
+        )
+        INSERT INTO users (id, email, hashed_password, is_active, created_at)
+        SELECT $1, $2, 'x', FALSE, $3 FROM claimed
+        """,
+        [
+            (uuid4(), EMAIL_PATTERN.format(index), datetime.now(UTC))
+            for index in range(users)
+        ],
+    )
+
+
+async def run(
+    lookups: int, users: int, concurrency: int, *, batched: bool
+) -> tuple[float, int, int]:
+    pool = await asyncpg.create_pool(
+        dsn=settings.database_url, min_size=1, max_size=concurrency
+    )
+    loader = PostgresUserLoader(pool) if batched else None
+    emails = [Email(EMAIL_PATTERN.format(index % users)) for index in range(lookups)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(email: Email) -> None:
+        async with semaphore, PostgresUnitOfWork(pool, loader) as uow:
+            await uow.user_repository.get_by_email(email)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(lookup(email) for email in emails))
+    elapsed = time.perf_counter() - start
+    queries = loader.queries if loader is not None else lookups
+    connections = pool.get_size()
+    await pool.close()
+    return elapsed, queries, connections
+
+
+async def main(lookups: int, users: int, concurrency: int) -> None:
+    pool = await asyncpg.create_pool(dsn=settings.database_url, max_size=2)
+    await seed(pool, users)
+
+    print(f"lookups: {lookups:,}, concurrency: {concurrency}")
+    for batched in (False, True):
+        elapsed, queries, connections = await run(
+            lookups, users, concurrency, batched=batched
+        )
+        label = "batched" if batched else "per request"
+        print(
+            f"{label:<12} {lookups / elapsed:>10,.0f} lookups/s "
+            f"{queries:>8,} queries {connections:>4} connections"
+        )
+
+    for table in ("users", "user_emails"):
+        await pool.execute(
+            f"DELETE FROM {table} WHERE email LIKE $1",  # noqa: S608 constant table names
+            EMAIL_PATTERN.format("%"),
+        )
+    await pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lookups", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.lookups, args.users, args.concurrency))
@@ -0,0 +1,225 @@
+"""
+Partitioned users table benchmark.
+
+Seeds the same rows, spread over --months months of created_at, into two
+schemas of Postgres (DATABASE_URL): the former single users table with a
+unique email index, and the monthly partitioned users table with its
+user_emails table. Then reports, for each, single registration insert and
+lookup by email latencies, and the total size of tables and indexes.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, date, datetime
+from uuid import uuid4
+
+import asyncpg
+
+from app.config import settings
+
+SEED_CHUNK = 1_000_000
+
+FLAT_SCHEMA = """
+CREATE TABLE users (
+    id UUID PRIMARY KEY,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    hashed_password VARCHAR(255) NOT NULL,
+    is_active BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+)
+"""
+
+PARTITIONED_SCHEMA = """
+CREATE TABLE users (
+    id UUID NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    hashed_password VARCHAR(255) NOT NULL,
+    is_active BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE TABLE user_emails (
+    email VARCHAR(255) PRIMARY KEY,
+    user_id UUID NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL
+)
+"""
+
+FLAT_SEED = """
+INSERT INTO users (id, email, hashed_password, is_active, created_at)
+SELECT gen_random_uuid(), 'user' || i || '@example.com', 'x', FALSE,
+    now() - random() * make_interval(months => $3)
+FROM generate_series($1::bigint, $2::bigint) AS i
+"""
+
+PARTITIONED_SEED = """
+WITH seeded AS (
+    SELECT gen_random_uuid() AS id, 'user' || i || '@example.com' AS email,
+        now() - random() * make_interval(months => $3) AS created_at
+    FROM generate_series($1::bigint, $2::bigint) AS i
+), inserted AS (
+    INSERT INTO users (id, email, hashed_password, is_active, created_at)
+    SELECT id, email, 'x', FALSE, created_at FROM seeded
+)
+INSERT INTO user_emails (email, user_id, created_at)
+SELECT email, id, created_at FROM seeded
+"""
+
+FLAT_LOOKUP = "SELECT * FROM users WHERE email = $1"
+
+PARTITIONED_LOOKUP = """
+SELECT users.* FROM user_emails
+JOIN users ON users.id = user_emails.user_id
+    AND users.created_at = user_emails.created_at
+WHERE user_emails.email = $1
+"""
+
+
+async def flat_insert(connection: asyncpg.Connection, email: str) -> None:
+    await connection.execute(
+        """
+        INSERT INTO users (id, email, hashed_password, is_active, created_at)
+        VALUES ($1, $2, 'x', FALSE, $3)
+        """,
+        uuid4(),
+        email,
+        datetime.now(UTC),
+    )
+
+
+async def partitioned_insert(connection: asyncpg.Connection, email: str) -> None:
+    user_id, created_at = uuid4(), datetime.now(UTC)
+    async with connection.transaction():
+        await connection.execute(
+            """
+            INSERT INTO user_emails (email, user_id, created_at)
+            VALUES ($1, $2, $3)
+            """,
+            email,
+            user_id,
+            created_at,
+        )
+        await connection.execute(
+            """
+            INSERT INTO users (id, email, hashed_password, is_active, created_at)
+            VALUES ($1, $2, 'x', FALSE, $3)
+            """,
+            user_id,
+            email,
+            created_at,
+        )
+
+
+def add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+async def create_partitions(connection: asyncpg.Connection, months: int) -> None:
+    # One spare month each side, the server may not be in UTC
+    this_month = datetime.now(UTC).date().replace(day=1)
+    for offset in range(-months - 1, 2):
+        start = add_months(this_month, offset)
+        end = add_months(this_month, offset + 1)
+        await connection.execute(
+            f"CREATE TABLE users_p{start:%Y_%m} PARTITION OF users "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+
+
+async def latencies(
+    samples: int, operation: Callable[[int], Awaitable[object]]
+) -> tuple[float, float]:
+    timings = []
+    for index in range(samples):
+        start = time.perf_counter()
+        await operation(index)
+        timings.append(time.perf_counter() - start)
+    percentiles = statistics.quantiles(timings, n=100)
+    return percentiles[49] * 1e6, percentiles[98] * 1e6
+
+
+async def run(
+    connection: asyncpg.Connection,
+    schema: str,
+    *,
+    partitioned: bool,
+    rows: int,
+    months: int,
+    samples: int,
+) -> None:
+    await connection.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    await connection.execute(f"CREATE SCHEMA {schema}")
+    await connection.execute(f"SET search_path TO {schema}")
+    await connection.execute(PARTITIONED_SCHEMA if partitioned else FLAT_SCHEMA)
+    if partitioned:
+        await create_partitions(connection, months)
+
+    start = time.perf_counter()
+    for first in range(0, rows, SEED_CHUNK):
+        last = min(first + SEED_CHUNK, rows) - 1
+        await connection.execute(
+            PARTITIONED_SEED if partitioned else FLAT_SEED, first, last, months
+        )
+    await connection.execute("ANALYZE")
+    seed_seconds = time.perf_counter() - start
+
+    insert = partitioned_insert if partitioned else flat_insert
+    insert_p50, insert_p99 = await latencies(
+        samples, lambda index: insert(connection, f"new{index}@example.com")
+    )
+    lookup = PARTITIONED_LOOKUP if partitioned else FLAT_LOOKUP
+    lookup_p50, lookup_p99 = await latencies(
+        samples,
+        lambda _: connection.fetchrow(
+            lookup,
+            f"user{random.randrange(rows)}@example.com",  # noqa: S311 not for security
+        ),
+    )
+    size = await connection.fetchval(
+        """
+        SELECT sum(pg_total_relation_size(relid)) FROM pg_stat_user_tables
+        WHERE schemaname = $1
+        """,
+        schema,
+    )
+
+    label = "partitioned" if partitioned else "single table"
+    print(
+        f"{label:<13} seeded in {seed_seconds:>7,.0f}s "
+        f"insert p50 {insert_p50:>7,.0f} µs p99 {insert_p99:>7,.0f} µs "
+        f"lookup p50 {lookup_p50:>7,.0f} µs p99 {lookup_p99:>7,.0f} µs "
+        f"{size / 2**30:>7,.1f} GiB"
+    )
+    await connection.execute(f"DROP SCHEMA {schema} CASCADE")
+
+
+async def main(rows: int, months: int, samples: int) -> None:
+    connection = await asyncpg.connect(settings.database_url)
+    print(f"rows: {rows:,}, months: {months}, samples: {samples:,}")
+    for schema, partitioned in (
+        ("benchmark_flat", False),
+        ("benchmark_partitioned", True),
+    ):
+        await run(
+            connection,
+            schema,
+            partitioned=partitioned,
+            rows=rows,
+            months=months,
+            samples=samples,
+        )
+    await connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000_000)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--samples", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.months, args.samples))
@@ -0,0 +1,81 @@
+"""
+UUID primary key benchmark.
+
+Inserts the same number of rows into two tables shaped like users against
+Postgres (DATABASE_URL), one keyed by uuid4 and one by UUIDv7, in COPY
+batches. Reports insert throughput over the run and over its last batches,
+where random keys pay for page splits and cache misses once the primary
+key index outgrows shared buffers, and the final primary key index size.
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+import asyncpg
+
+from app.config import settings
+from app.domain.uuid7 import uuid7
+
+TABLE_PATTERN = "benchmark_keys_{}"
+
+
+async def run(
+    pool: asyncpg.Pool, name: str, generate: Callable[[], UUID], rows: int, batch: int
+) -> tuple[float, float, int]:
+    table = TABLE_PATTERN.format(name)
+    await pool.execute(f"DROP TABLE IF EXISTS {table}")
+    await pool.execute(
+        f"""
+        CREATE TABLE {table} (
+            id UUID PRIMARY KEY,
+            email VARCHAR(255) NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL
+        )
+        """
+    )
+
+    tail_rows = min(rows, 10 * batch)
+    tail_start = 0.0
+    start = time.perf_counter()
+    async with pool.acquire() as connection:
+        for offset in range(0, rows, batch):
+            if offset == rows - tail_rows:
+                tail_start = time.perf_counter()
+            now = datetime.now(UTC)
+            records = [
+                (generate(), f"user{index}@example.com", now)
+                for index in range(offset, min(offset + batch, rows))
+            ]
+            await connection.copy_records_to_table(table, records=records)
+    end = time.perf_counter()
+
+    index_size = await pool.fetchval(
+        "SELECT pg_relation_size($1::regclass)", f"{table}_pkey"
+    )
+    await pool.execute(f"DROP TABLE {table}")
+    return rows / (end - start), tail_rows / (end - tail_start), index_size
+
+
+async def main(rows: int, batch: int) -> None:
+    pool = await asyncpg.create_pool(dsn=settings.database_url, max_size=2)
+    print(f"rows: {rows:,}, batch: {batch:,}")
+    for name, generate in (("uuid4", uuid4), ("uuid7", uuid7)):
+        overall, tail, index_size = await run(pool, name, generate, rows, batch)
+        print(
+            f"{name:<6} {overall:>10,.0f} rows/s overall "
+            f"{tail:>10,.0f} rows/s last batches "
+            f"{index_size / 2**20:>8,.1f} MiB pkey index"
+        )
+    await pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=50_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch))
@@ -3,20 +3,43 @@
 import asyncio
 import json
 import signal
+from typing import Literal
 
+import redis.asyncio as redis
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from rabbitmq_amqp_python_client import (
     AddressHelper,
     AMQPMessagingHandler,
     AsyncEnvironment,
+    AsyncPublisher,
     ConnectionClosed,
     Converter,
     Event,
-    ExchangeSpecification,
-    ExchangeToQueueBindingSpecification,
-    ExchangeType,
-    QuorumQueueSpecification,
+    Message,
+)
+
+from app.application.ports.email_sender import EmailSender
+from app.application.ports.event_deduplicator import EventDeduplicator
+from app.infrastructure.email.console_email_sender import ConsoleEmailSender
+from app.infrastructure.email.smtp_email_sender import SmtpEmailSender
+from app.infrastructure.email.templates import render_event_email
+from app.infrastructure.event_consumer.delivery_pipeline import (
+    DeliveryPipeline,
+    Outcome,
+)
+from app.infrastructure.event_deduplicator.memory_event_deduplicator import (
+    MemoryEventDeduplicator,
+)
+from app.infrastructure.event_deduplicator.redis_event_deduplicator import (
+    RedisEventDeduplicator,
+)
+from app.infrastructure.event_publisher.topology import (
+    ATTEMPT_PROPERTY,
+    RetryPolicy,
+    declare_retry_queues,
+    declare_topology,
+    retry_queue_name,
 )
 
 
@@ -33,41 +56,182 @@ class Settings(BaseSettings):
     rabbitmq_routing_key: str = Field(default=...)
     rabbitmq_retry_seconds: int = Field(default=2)
 
+    # Failed messages wait in <queue>.retry.<n>s queues, then go to <queue>.dlq.
+    # Delays add up to less than the verification code TTL.
+    rabbitmq_retry_delays_seconds: list[int] = Field(default=[5, 15, 30])
+    rabbitmq_max_attempts: int = Field(default=4)
+
+    # Event deduplication, "redis" shares the window between consumer processes
+    event_dedup_backend: Literal["memory", "redis"] = "memory"
+    event_dedup_window_seconds: int = 600
+    event_dedup_max_entries: int = 500_000
+    redis_url: str | None = None
+
+    # Email delivery, printed to console when no SMTP host is configured
+    smtp_host: str | None = None
+    smtp_port: int = 25
+    smtp_username: str | None = None
+    smtp_password: str | None = None
+    smtp_starttls: bool = False
+    smtp_from_address: str = "no-reply@example.com"
+    smtp_pool_size: int = 4
+    smtp_batch_size: int = 50
+    smtp_per_domain_limit: int = 2
+
+    # Deliveries processed at the same time, default: enough to fill every
+    # SMTP session's batch
+    consumer_max_in_flight: int | None = None
+
+    @property
+    def max_in_flight(self) -> int:
+        return self.consumer_max_in_flight or self.smtp_pool_size * self.smtp_batch_size
+
 
 settings = Settings()
 
+# Seconds between two settlements of the deliveries finished meanwhile
+SETTLE_INTERVAL_SECONDS = 0.01
+
+
+def create_deduplicator() -> EventDeduplicator:
+    if settings.event_dedup_backend == "redis":
+        if settings.redis_url is None:
+            msg = "REDIS_URL is required when EVENT_DEDUP_BACKEND=redis"
+            raise ValueError(msg)
+        return RedisEventDeduplicator(
+            redis.from_url(settings.redis_url, decode_responses=True),
+            window_seconds=settings.event_dedup_window_seconds,
+        )
+    return MemoryEventDeduplicator(
+        window_seconds=settings.event_dedup_window_seconds,
+        max_entries=settings.event_dedup_max_entries,
+    )
+
+
+def create_email_sender() -> EmailSender:
+    if settings.smtp_host is None:
+        return ConsoleEmailSender()
+    return SmtpEmailSender(
+        settings.smtp_host,
+        settings.smtp_port,
+        pool_size=settings.smtp_pool_size,
+        batch_size=settings.smtp_batch_size,
+        per_domain_limit=settings.smtp_per_domain_limit,
+        username=settings.smtp_username,
+        password=settings.smtp_password,
+        starttls=settings.smtp_starttls,
+    )
+
 
 class MyMessageHandler(AMQPMessagingHandler):
-    def __init__(self):
+    """
+    Message handler, called from the consumer worker thread.
+
+    Deliveries are processed on the event loop (deduplication, email
+    delivery, retry publishing), up to `max_in_flight` at a time so that
+    the SMTP sessions fill their batches, and settled back on this thread
+    as they finish. Failed messages are republished to a delayed retry
+    queue with an incremented `attempt` property, and dead-lettered once
+    the retry policy gives up, so they never hot-loop on the main queue.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        deduplicator: EventDeduplicator,
+        retry_publisher: AsyncPublisher,
+        retry_policy: RetryPolicy,
+        queue_name: str,
+        email_sender: EmailSender,
+        max_in_flight: int,
+    ):
         super().__init__()
+        self._deduplicator = deduplicator
+        self._email_sender = email_sender
+        self._retry_publisher = retry_publisher
+        self._retry_policy = retry_policy
+        self._queue_name = queue_name
+        self._pipeline: DeliveryPipeline[Event] = DeliveryPipeline(
+            loop, self._settle, max_in_flight=max_in_flight
+        )
+        self._settle_scheduled = False
 
     def on_amqp_message(self, event: Event):
-        message_dict = json.loads(Converter.bytes_to_string(event.message.body))
-        print(f"Received message: {message_dict}")
-        self.delivery_context.accept(event)
+        try:
+            message_dict = json.loads(Converter.bytes_to_string(event.message.body))
+        except ValueError:
+            print("Dead-lettering undecodable message")
+            self.delivery_context.discard(event)
+            return
 
+        self._pipeline.submit(event, self._process(event.message, message_dict))
+        self._schedule_settle(event)
 
-async def declare_topology(
-    management,
-    *,
-    exchange_name: str,
-    queue_name: str,
-    routing_key: str,
-):
-    await management.declare_exchange(
-        ExchangeSpecification(name=exchange_name, exchange_type=ExchangeType.topic)
-    )
-    await management.declare_queue(
-        QuorumQueueSpecification(name=queue_name)
-        # QuorumQueueSpecification(name=queue_name, dead_letter_exchange="dead-letter")
-    )
-    await management.bind(
-        ExchangeToQueueBindingSpecification(
-            source_exchange=exchange_name,
-            destination_queue=queue_name,
-            binding_key=routing_key,
+    def on_timer_task(self, event: Event):
+        self._settle_scheduled = False
+        self._pipeline.settle_ready()
+        if self._pipeline.in_flight:
+            self._schedule_settle(event)
+
+    def _schedule_settle(self, event: Event) -> None:
+        # Finished deliveries are settled on this thread, from a timer
+        if not self._settle_scheduled:
+            self._settle_scheduled = True
+            event.container.schedule(SETTLE_INTERVAL_SECONDS, self)
+
+    def _settle(self, event: Event, outcome: Outcome) -> None:
+        if outcome is Outcome.ACCEPT:
+            self.delivery_context.accept(event)
+        elif outcome is Outcome.DISCARD:
+            self.delivery_context.discard(event)
+        else:
+            self.delivery_context.requeue(event)
+
+    async def _process(self, message: Message, message_dict: dict) -> Outcome:
+        event_id = message_dict.get("event_id")
+        if event_id and not await self._deduplicator.claim(event_id):
+            print(f"Skipping duplicate message: {event_id}")
+            return Outcome.ACCEPT
+
+        try:
+            await self._handle(message_dict)
+        except Exception as exc:  # noqa: BLE001 blind-except
+            if event_id:
+                await self._deduplicator.release(event_id)
+            return await self._retry_or_dead_letter(message, exc)
+
+        return Outcome.ACCEPT
+
+    async def _handle(self, message_dict: dict) -> None:
+        email = render_event_email(message_dict, settings.smtp_from_address)
+        if email is None:
+            print(f"Received message: {message_dict}")
+            return
+        await self._email_sender.send(email)
+
+    async def _retry_or_dead_letter(self, message: Message, exc: Exception) -> Outcome:
+        properties = message.application_properties or {}
+        attempt = int(properties.get(ATTEMPT_PROPERTY, 0)) + 1
+        delay_seconds = self._retry_policy.next_delay(attempt)
+        if delay_seconds is None:
+            print(f"Dead-lettering message after {attempt} attempts: {exc}")
+            return Outcome.DISCARD
+
+        retry_message = Message(
+            body=message.body,
+            application_properties={**properties, ATTEMPT_PROPERTY: attempt},
+            address=AddressHelper.queue_address(
+                retry_queue_name(self._queue_name, delay_seconds)
+            ),
         )
-    )
+        try:
+            await self._retry_publisher.publish(retry_message)
+        except Exception as publish_exc:  # noqa: BLE001 blind-except
+            print(f"Retry publish failed: {publish_exc}, requeueing message")
+            return Outcome.REQUEUE
+
+        print(f"Attempt {attempt} failed: {exc}, retrying in {delay_seconds} seconds")
+        return Outcome.ACCEPT
 
 
 def _install_sigint_handler(stop_event: asyncio.Event) -> asyncio.AbstractEventLoop:
@@ -81,13 +245,28 @@ def _install_sigint_handler(stop_event: asyncio.Event) -> asyncio.AbstractEventL
     return loop
 
 
-async def consume_messages(connection, queue_name: str) -> bool:
+async def consume_messages(
+    connection,
+    queue_name: str,
+    deduplicator: EventDeduplicator,
+    retry_publisher: AsyncPublisher,
+    retry_policy: RetryPolicy,
+    email_sender: EmailSender,
+) -> bool:
     addr_queue = AddressHelper.queue_address(queue_name)
-    handler = MyMessageHandler()
+    handler = MyMessageHandler(
+        asyncio.get_running_loop(),
+        deduplicator,
+        retry_publisher,
+        retry_policy,
+        queue_name,
+        email_sender,
+        settings.max_in_flight,
+    )
     stop_event = asyncio.Event()
 
     async with await connection.consumer(
-        addr_queue, message_handler=handler
+        addr_queue, message_handler=handler, credit=settings.max_in_flight
     ) as consumer:
         loop = _install_sigint_handler(stop_event)
         try:
@@ -116,17 +295,24 @@ async def consume_messages(connection, queue_name: str) -> bool:
     return stop_event.is_set()
 
 
-async def main() -> None:
-    exchange_name = settings.rabbitmq_exchange_name
-    queue_name = settings.rabbitmq_queue_name
-    routing_key = settings.rabbitmq_routing_key
-
+async def consume_forever(
+    exchange_name: str,
+    queue_name: str,
+    routing_key: str,
+    deduplicator: EventDeduplicator,
+    retry_policy: RetryPolicy,
+    email_sender: EmailSender,
+) -> None:
     while True:
         try:
             async with (
                 AsyncEnvironment(uri=settings.rabbitmq_url) as environment,
                 await environment.connection() as connection,
                 await connection.management() as management,
+                # The consumer connection is busy in its worker thread,
+                # retries are published on a connection of their own.
+                await environment.connection() as retry_connection,
+                await retry_connection.publisher() as retry_publisher,
             ):
                 await declare_topology(
                     management,
@@ -134,9 +320,19 @@ async def main() -> None:
                     queue_name=queue_name,
                     routing_key=routing_key,
                 )
+                await declare_retry_queues(
+                    management, queue_name=queue_name, retry_policy=retry_policy
+                )
 
                 print("RabbitMQ consumer is running - press `CTRL + C` to terminate.")
-                stopped_by_signal = await consume_messages(connection, queue_name)
+                stopped_by_signal = await consume_messages(
+                    connection,
+                    queue_name,
+                    deduplicator,
+                    retry_publisher,
+                    retry_policy,
+                    email_sender,
+                )
                 if stopped_by_signal:
                     break
         except ConnectionClosed:
@@ -153,5 +349,30 @@ async def main() -> None:
             continue
 
 
+async def main() -> None:
+    exchange_name = settings.rabbitmq_exchange_name
+    queue_name = settings.rabbitmq_queue_name
+    routing_key = settings.rabbitmq_routing_key
+    # Created once so that the dedup window survives reconnections
+    deduplicator = create_deduplicator()
+    retry_policy = RetryPolicy(
+        delays_seconds=tuple(settings.rabbitmq_retry_delays_seconds),
+        max_attempts=settings.rabbitmq_max_attempts,
+    )
+    email_sender = create_email_sender()
+
+    try:
+        await consume_forever(
+            exchange_name,
+            queue_name,
+            routing_key,
+            deduplicator,
+            retry_policy,
+            email_sender,
+        )
+    finally:
+        await email_sender.close()
+
+
 if __name__ == "__main__":
     asyncio.run(main())
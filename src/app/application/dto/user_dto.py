@@ -22,6 +22,23 @@ class RegisterUserResponse:
     message: str
 
 
+@dataclass(frozen=True, slots=True)
+class RegisterUsersItem:
+    """Request DTO for one user of a batch registration."""
+
+    email: Email
+    password: str
+
+
+@dataclass(frozen=True, slots=True)
+class RegisterUsersResult:
+    """Response DTO for one user of a batch registration."""
+
+    email: Email
+    user_id: UserId | None = None
+    error: Exception | None = None
+
+
 @dataclass(frozen=True, slots=True)
 class ActivateUserRequest:
     """Request DTO for user activation"""
@@ -1,5 +1,9 @@
 """Application layer exceptions."""
 
+import math
+
+from app.domain import UserId
+
 
 class ApplicationError(Exception):
     """Base class for application exceptions."""
@@ -13,6 +17,14 @@ class UserAlreadyExistsError(ApplicationError):
         super().__init__(f"User already exists with email: {email}")
 
 
+class ConcurrentUpdateError(ApplicationError):
+    """Raised when a user was saved by someone else since it was read"""
+
+    def __init__(self, email: str) -> None:
+        self.email = email
+        super().__init__(f"User was modified concurrently: {email}")
+
+
 class UserNotFoundError(ApplicationError):
     """Raised when user is not found"""
 
@@ -43,3 +55,37 @@ class VerificationCodeExpiredError(ApplicationError):
     def __init__(self, email: str) -> None:
         self.email = email
         super().__init__(f"Verification code has expired for user: {email}")
+
+
+class ResendCooldownError(ApplicationError):
+    """Raised when a new verification code is asked for too soon"""
+
+    def __init__(self, email: str, retry_after: float) -> None:
+        self.email = email
+        self.retry_after = retry_after
+        super().__init__(
+            f"Verification code was sent recently to user: {email}, "
+            f"retry in {math.ceil(retry_after)} seconds"
+        )
+
+
+class PartialCommitError(ApplicationError):
+    """Raised when a unit of work committed on some shards only"""
+
+    def __init__(self, committed: list[int], failed: int, saved: list[UserId]) -> None:
+        self.committed = committed
+        self.failed = failed
+        # Users added on the committed shards, the others were rolled back
+        self.saved = saved
+        super().__init__(
+            f"Commit failed on shard {failed} after shards {committed} "
+            "committed, the other shards were rolled back"
+        )
+
+
+class OperationInProgressError(ApplicationError):
+    """Raised when the same operation is still running elsewhere"""
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        super().__init__(f"Operation already in progress: {key}")
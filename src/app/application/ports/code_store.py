@@ -1,5 +1,6 @@
 """Verification code store port."""
 
+from collections.abc import Mapping, Sequence
 from typing import Protocol
 
 from app.domain import Email, VerificationCode
@@ -12,10 +13,30 @@ class CodeStore(Protocol):
         """Save verification code with TTL."""
         ...
 
+    async def save_many(self, codes: Mapping[Email, VerificationCode]) -> None:
+        """Save verification codes with TTL, in one round trip."""
+        ...
+
     async def get(self, email: Email) -> VerificationCode | None:
         """Get verification code if not expired."""
         ...
 
+    async def get_many(self, emails: Sequence[Email]) -> list[VerificationCode | None]:
+        """Get verification codes of emails, in one round trip."""
+        ...
+
     async def delete(self, email: Email) -> None:
         """Delete verification code."""
         ...
+
+    async def cooldown_remaining(self, email: Email) -> float:
+        """Return the seconds left of the resend cooldown of email, 0 if none."""
+        ...
+
+    async def start_cooldown(self, email: Email) -> float:
+        """
+        Start the resend cooldown of email.
+
+        Return 0 if it was started, else the seconds left of the running one.
+        """
+        ...
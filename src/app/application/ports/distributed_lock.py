@@ -0,0 +1,16 @@
+"""Distributed lock port."""
+
+from contextlib import AbstractAsyncContextManager
+from typing import Protocol
+
+
+class DistributedLock(Protocol):
+    """Port for a lock shared by all application instances."""
+
+    def hold(self, key: str) -> AbstractAsyncContextManager[None]:
+        """
+        Hold the lock of key, waiting while another holder has it.
+
+        Raise OperationInProgressError if it cannot be acquired in time.
+        """
+        ...
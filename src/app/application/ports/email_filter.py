@@ -0,0 +1,26 @@
+"""Email existence filter port."""
+
+from collections.abc import Iterable
+from typing import Protocol
+
+from app.domain import Email
+
+
+class EmailFilter(Protocol):
+    """
+    Port for a probabilistic set of registered emails.
+
+    False positives are possible, false negatives are not.
+    """
+
+    async def might_contain(self, email: Email) -> bool:
+        """Return False only if email is definitely not registered."""
+        ...
+
+    async def add(self, email: Email) -> None:
+        """Record a registered email."""
+        ...
+
+    async def add_many(self, emails: Iterable[str]) -> None:
+        """Record registered emails, in one round trip."""
+        ...
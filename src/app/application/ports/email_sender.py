@@ -0,0 +1,16 @@
+"""Email sender port."""
+
+from email.message import EmailMessage
+from typing import Protocol
+
+
+class EmailSender(Protocol):
+    """Port for sending emails."""
+
+    async def send(self, message: EmailMessage) -> None:
+        """Send a single email."""
+        ...
+
+    async def close(self) -> None:
+        """Release connections."""
+        ...
@@ -0,0 +1,15 @@
+"""Event deduplicator port."""
+
+from typing import Protocol
+
+
+class EventDeduplicator(Protocol):
+    """Port for remembering already processed event ids within a time window."""
+
+    async def claim(self, event_id: str) -> bool:
+        """Mark event as seen. Return False if it was already seen in the window."""
+        ...
+
+    async def release(self, event_id: str) -> None:
+        """Forget event so that a redelivery is processed again."""
+        ...
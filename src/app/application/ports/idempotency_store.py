@@ -0,0 +1,42 @@
+"""Idempotency store port."""
+
+from dataclasses import dataclass
+from typing import Protocol
+
+
+@dataclass(frozen=True, slots=True)
+class IdempotencyRecord:
+    """Response stored under an idempotency key, or an in-flight marker."""
+
+    fingerprint: str
+    status_code: int | None = None
+    content_type: str = ""
+    body: bytes = b""
+
+    @property
+    def in_flight(self) -> bool:
+        return self.status_code is None
+
+
+class IdempotencyStore(Protocol):
+    """Port for responses stored under client supplied idempotency keys."""
+
+    async def claim(self, key: str, fingerprint: str) -> IdempotencyRecord | None:
+        """
+        Mark key as in flight if it is unknown.
+
+        Return None if the caller claimed the key, else the existing record.
+        """
+        ...
+
+    async def get(self, key: str) -> IdempotencyRecord | None:
+        """Get the record of key."""
+        ...
+
+    async def complete(self, key: str, record: IdempotencyRecord) -> None:
+        """Store the final response of key."""
+        ...
+
+    async def release(self, key: str) -> None:
+        """Forget key so that a retry runs the request again."""
+        ...
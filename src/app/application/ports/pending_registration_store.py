@@ -0,0 +1,39 @@
+"""Pending registration store port."""
+
+from collections.abc import Sequence
+from typing import Protocol
+
+from app.domain import Email, User
+
+
+class PendingRegistrationStore(Protocol):
+    """Port for registrations waiting for activation, stored with TTL."""
+
+    async def add(self, user: User) -> bool:
+        """
+        Store user unless a registration is already pending for its email.
+
+        Return whether it was stored.
+        """
+        ...
+
+    async def add_many(self, users: Sequence[User]) -> list[bool]:
+        """
+        Store each user unless a registration is already pending for its
+        email, in one round trip.
+
+        Return whether each was stored.
+        """
+        ...
+
+    async def get(self, email: Email) -> User | None:
+        """Get the pending registration of email if not expired."""
+        ...
+
+    async def delete(self, email: Email) -> None:
+        """Delete the pending registration of email."""
+        ...
+
+    async def delete_many(self, emails: Sequence[Email]) -> None:
+        """Delete the pending registrations of emails, in one round trip."""
+        ...
@@ -0,0 +1,15 @@
+"""Rate limiter port."""
+
+from typing import Protocol
+
+
+class RateLimiter(Protocol):
+    """Port for token bucket rate limiting."""
+
+    async def acquire(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """
+        Take one token from the key's bucket.
+
+        Return 0 if the token was granted, else the seconds to wait for one.
+        """
+        ...
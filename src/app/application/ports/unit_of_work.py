@@ -1,5 +1,6 @@
 """Unit of Work port for DB transactions"""
 
+from collections.abc import Callable
 from types import TracebackType
 from typing import Protocol, Self
 
@@ -23,3 +24,6 @@ class UnitOfWork(Protocol):
     async def commit(self) -> None: ...
 
     async def rollback(self) -> None: ...
+
+
+type UnitOfWorkFactory = Callable[[], UnitOfWork]
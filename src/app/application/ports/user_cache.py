@@ -0,0 +1,24 @@
+"""User cache port."""
+
+from typing import Protocol
+
+from app.domain import Email, User
+
+
+class UserCache(Protocol):
+    """Port for a bounded TTL cache of users by normalized email."""
+
+    hits: int
+    misses: int
+
+    async def get(self, email: Email) -> User | None:
+        """Get a fresh copy of the cached user, None on a miss."""
+        ...
+
+    async def set(self, user: User) -> None:
+        """Cache user."""
+        ...
+
+    async def invalidate(self, email: Email) -> None:
+        """Drop the cached user, on every instance that caches it."""
+        ...
@@ -0,0 +1,21 @@
+"""User export port."""
+
+from collections.abc import AsyncIterator
+from typing import Any, Protocol
+
+EXPORT_COLUMNS = ("id", "email", "is_active", "created_at", "version")
+
+
+def export_columns(*, with_password_hash: bool = False) -> tuple[str, ...]:
+    """Columns of the exported rows, in order."""
+    if with_password_hash:
+        return (*EXPORT_COLUMNS, "hashed_password")
+    return EXPORT_COLUMNS
+
+
+class UserExporter(Protocol):
+    """Port for the export of all users, in bounded batches."""
+
+    def __call__(self, *, with_password_hash: bool = False) -> AsyncIterator[list[Any]]:
+        """Batches of rows keyed by `export_columns(with_password_hash=...)`."""
+        ...
@@ -0,0 +1,25 @@
+"""User listing port."""
+
+from datetime import UTC, datetime
+from typing import Protocol
+from uuid import UUID
+
+from app.domain import User
+
+# Start of the (created_at, id) keyset, before every user
+FIRST_PAGE: tuple[datetime, UUID] = (datetime.min.replace(tzinfo=UTC), UUID(int=0))
+
+
+class UserLister(Protocol):
+    """Port for the keyset-paginated listing of all users."""
+
+    async def __call__(
+        self,
+        limit: int,
+        after: tuple[datetime, UUID] = FIRST_PAGE,
+        *,
+        is_active: bool | None = None,
+        email_prefix: str | None = None,
+    ) -> list[User]:
+        """The first `limit` users after `after`, in (created_at, id) order."""
+        ...
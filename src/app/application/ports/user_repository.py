@@ -1,5 +1,6 @@
 """User repository port."""
 
+from collections.abc import Sequence
 from typing import Protocol
 
 from app.domain import Email, User, UserId
@@ -17,5 +18,18 @@ class UserRepository(Protocol):
         ...
 
     async def save(self, user: User) -> None:
-        """Save user."""
+        """
+        Save user, or only its changed fields if it was saved before.
+
+        Raises ConcurrentUpdateError if the user was saved by someone else
+        since it was read.
+        """
+        ...
+
+    async def add_many(self, users: Sequence[User]) -> list[User]:
+        """
+        Save new users at once, skipping those whose email is registered.
+
+        Return the users saved.
+        """
         ...
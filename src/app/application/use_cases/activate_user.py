@@ -9,7 +9,10 @@ from app.application.exceptions import (
 )
 from app.application.ports.code_store import CodeStore
 from app.application.ports.event_publisher import EventPublisher
-from app.application.ports.unit_of_work import UnitOfWork
+from app.application.ports.pending_registration_store import (
+    PendingRegistrationStore,
+)
+from app.application.ports.unit_of_work import UnitOfWorkFactory
 
 
 class ActivateUserUseCase:
@@ -18,27 +21,36 @@ class ActivateUserUseCase:
 
     - Validates basic auth
     - Validates verification code
-    - Activates user account
-    - Deletes verification code
+    - Activates user account, saving a pending registration for the first
+      time
+    - Deletes verification code and pending registration
     - Publishes UserActivated event
     """
 
     def __init__(
         self,
-        uow: UnitOfWork,
+        uow_factory: UnitOfWorkFactory,
         code_store: CodeStore,
         event_publisher: EventPublisher,
+        pending_registrations: PendingRegistrationStore | None = None,
     ) -> None:
-        self._uow: UnitOfWork = uow
+        self._uow_factory: UnitOfWorkFactory = uow_factory
         self._code_store: CodeStore = code_store
         self._event_publisher: EventPublisher = event_publisher
+        self._pending_registrations: PendingRegistrationStore | None = (
+            pending_registrations
+        )
 
     async def execute(self, request: ActivateUserRequest) -> ActivateUserResponse:
         email = request.email
         password = request.password
 
-        async with self._uow:
-            user = await self._uow.user_repository.get_by_email(email)
+        async with self._uow_factory() as uow:
+            user = await uow.user_repository.get_by_email(email)
+            pending = False
+            if user is None and self._pending_registrations is not None:
+                user = await self._pending_registrations.get(email)
+                pending = user is not None
             if not user:
                 raise UserNotFoundError(email.value)
 
@@ -53,13 +65,17 @@ class ActivateUserUseCase:
                 raise VerificationCodeInvalidError(email.value)
 
             user.activate()
-            await self._uow.user_repository.save(user)
+            await uow.user_repository.save(user)
 
             await self._code_store.delete(email)
 
             events = user.collect_events()
             await self._event_publisher.publish_all(events)
 
+        # Only once the row is committed, see RegisterUserUseCase
+        if pending and self._pending_registrations is not None:
+            await self._pending_registrations.delete(email)
+
         return ActivateUserResponse(
             user_id=user.id,
             email=email,
@@ -3,16 +3,24 @@
 from app.application.dto.user_dto import RegisterUserRequest, RegisterUserResponse
 from app.application.exceptions import UserAlreadyExistsError
 from app.application.ports.code_store import CodeStore
+from app.application.ports.email_filter import EmailFilter
 from app.application.ports.event_publisher import EventPublisher
-from app.application.ports.unit_of_work import UnitOfWork
-from app.domain import User, VerificationCode
+from app.application.ports.pending_registration_store import (
+    PendingRegistrationStore,
+)
+from app.application.ports.unit_of_work import UnitOfWorkFactory
+from app.domain import Email, Password, User, VerificationCode
 
 
 class RegisterUserUseCase:
     """
     Use Case: Register a new user.
 
+    - Skips the existence lookup when the email filter rules the email out,
+      the unique constraint on save stays the final authority
     - Creates user with email and password
+    - With a pending registration store, keeps the user there until
+      activation instead of saving it
     - Generates verification code
     - Stores code with TTL
     - Publishes UserRegistered event
@@ -20,28 +28,41 @@ class RegisterUserUseCase:
 
     def __init__(
         self,
-        uow: UnitOfWork,
+        uow_factory: UnitOfWorkFactory,
         code_store: CodeStore,
         event_publisher: EventPublisher,
+        email_filter: EmailFilter | None = None,
+        pending_registrations: PendingRegistrationStore | None = None,
     ) -> None:
-        self._uow: UnitOfWork = uow
+        self._uow_factory: UnitOfWorkFactory = uow_factory
         self._code_store: CodeStore = code_store
         self._event_publisher: EventPublisher = event_publisher
+        self._email_filter: EmailFilter | None = email_filter
+        self._pending_registrations: PendingRegistrationStore | None = (
+            pending_registrations
+        )
 
     async def execute(self, request: RegisterUserRequest) -> RegisterUserResponse:
         email = request.email
         password = request.password
 
-        async with self._uow:
-            if await self._uow.user_repository.get_by_email(email):
-                raise UserAlreadyExistsError(email.value)
-
-            user = User.create(email=email, password=password)
-            await self._uow.user_repository.save(user)
-            code = VerificationCode.generate()
-            await self._code_store.save(email, code)
+        if self._pending_registrations is not None:
+            user = await self._register_pending(
+                self._pending_registrations, email, password
+            )
+            await self._send_code(user)
+        else:
+            async with self._uow_factory() as uow:
+                # A definitely absent email goes straight to insert
+                existing = await self._might_exist(email) and (
+                    await uow.user_repository.get_by_email(email)
+                )
+                if existing:
+                    raise UserAlreadyExistsError(email.value)
 
-            await self._event_publisher.publish_all(user.collect_events())
+                user = User.create(email=email, password=password)
+                await uow.user_repository.save(user)
+                await self._send_code(user)
 
         return RegisterUserResponse(
             user_id=user.id,
@@ -49,3 +70,41 @@ class RegisterUserUseCase:
             message="User registered. "
             "Please check your email for verification code to activate your account.",
         )
+
+    async def _register_pending(
+        self,
+        pending_registrations: PendingRegistrationStore,
+        email: Email,
+        password: Password,
+    ) -> User:
+        user = User.create(email=email, password=password)
+        # Claimed before the lookup: activation inserts the row before it
+        # deletes the pending registration, so either the claim fails or
+        # the lookup sees the row
+        if not await pending_registrations.add(user):
+            raise UserAlreadyExistsError(email.value)
+        try:
+            async with self._uow_factory() as uow:
+                existing = await self._might_exist(email) and (
+                    await uow.user_repository.get_by_email(email)
+                )
+        except BaseException:
+            await pending_registrations.delete(email)
+            raise
+        if existing:
+            await pending_registrations.delete(email)
+            raise UserAlreadyExistsError(email.value)
+        return user
+
+    async def _send_code(self, user: User) -> None:
+        if self._email_filter is not None:
+            await self._email_filter.add(user.email)
+        code = VerificationCode.generate()
+        await self._code_store.save(user.email, code)
+
+        await self._event_publisher.publish_all(user.collect_events())
+
+    async def _might_exist(self, email: Email) -> bool:
+        if self._email_filter is None:
+            return True
+        return await self._email_filter.might_contain(email)
@@ -0,0 +1,148 @@
+"""Register users use case."""
+
+import asyncio
+from collections.abc import Sequence
+
+from app.application.dto.user_dto import RegisterUsersItem, RegisterUsersResult
+from app.application.exceptions import PartialCommitError, UserAlreadyExistsError
+from app.application.ports.code_store import CodeStore
+from app.application.ports.email_filter import EmailFilter
+from app.application.ports.event_publisher import EventPublisher
+from app.application.ports.pending_registration_store import (
+    PendingRegistrationStore,
+)
+from app.application.ports.unit_of_work import UnitOfWorkFactory
+from app.domain import Email, Password, User, VerificationCode
+from app.domain.exceptions import InvalidPasswordError
+
+
+def _hash_password(plain_password: str) -> Password | InvalidPasswordError:
+    try:
+        return Password.create(plain_password)
+    except InvalidPasswordError as exc:
+        return exc
+
+
+class RegisterUsersUseCase:
+    """
+    Use Case: Register a batch of users.
+
+    - Hashes the passwords in worker threads, bcrypt releases the GIL, at
+      most `hash_concurrency` at a time across all the batches in flight
+    - Saves the users of each chunk of `chunk_size` in one transaction,
+      skipping the emails already registered or repeated in the batch
+    - Stores the verification codes of the chunk at once
+    - Publishes the UserRegistered events of the chunk at once
+    - Reports one result per item, a failed item does not fail the others.
+      When a chunk spanning shards is only committed on some of them, its
+      users saved there are registered and the others fail with the
+      PartialCommitError
+
+    Users are saved right away, even when single registrations are kept in
+    a pending registration store until activation. With that store, each
+    email is claimed there first, as a single registration does, so that no
+    email is both pending and saved: an email already pending fails as
+    registered. The claims are released once the chunk is saved.
+    """
+
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        code_store: CodeStore,
+        event_publisher: EventPublisher,
+        email_filter: EmailFilter | None = None,
+        pending_registrations: PendingRegistrationStore | None = None,
+        chunk_size: int = 1000,
+        hash_concurrency: int = 4,
+    ) -> None:
+        self._uow_factory: UnitOfWorkFactory = uow_factory
+        self._code_store: CodeStore = code_store
+        self._event_publisher: EventPublisher = event_publisher
+        self._email_filter: EmailFilter | None = email_filter
+        self._pending_registrations: PendingRegistrationStore | None = (
+            pending_registrations
+        )
+        self._chunk_size = chunk_size
+        # Shared by the concurrent batches, so that they do not fill the
+        # default thread pool
+        self._hash_slots = asyncio.Semaphore(hash_concurrency)
+
+    async def execute(
+        self, items: Sequence[RegisterUsersItem]
+    ) -> list[RegisterUsersResult]:
+        results: list[RegisterUsersResult] = []
+        for start in range(0, len(items), self._chunk_size):
+            results.extend(
+                await self._register_chunk(items[start : start + self._chunk_size])
+            )
+        return results
+
+    async def _register_chunk(
+        self, items: Sequence[RegisterUsersItem]
+    ) -> list[RegisterUsersResult]:
+        passwords = await asyncio.gather(
+            *(self._hash_password(item.password) for item in items)
+        )
+
+        users: dict[int, User] = {}
+        errors: dict[int, Exception] = {}
+        for index, (item, password) in enumerate(zip(items, passwords, strict=True)):
+            if isinstance(password, InvalidPasswordError):
+                errors[index] = password
+            else:
+                users[index] = User.create(email=item.email, password=password)
+
+        claimed = await self._claim(users)
+        added: list[User] = []
+        partial_commit: PartialCommitError | None = None
+        try:
+            async with self._uow_factory() as uow:
+                added = await uow.user_repository.add_many(list(users.values()))
+                if added:
+                    await self._send_codes(added)
+        except PartialCommitError as exc:
+            partial_commit = exc
+        finally:
+            # Released once the rows are committed, see RegisterUserUseCase
+            if self._pending_registrations is not None and claimed:
+                await self._pending_registrations.delete_many(claimed)
+        added_ids = {user.id for user in added}
+        saved_ids = added_ids if partial_commit is None else set(partial_commit.saved)
+
+        results = []
+        for index, item in enumerate(items):
+            user = users.get(index)
+            if user is not None and user.id in saved_ids:
+                results.append(RegisterUsersResult(item.email, user_id=user.id))
+            elif user is not None and user.id in added_ids:
+                results.append(RegisterUsersResult(item.email, error=partial_commit))
+            else:
+                error = errors.get(index) or UserAlreadyExistsError(item.email.value)
+                results.append(RegisterUsersResult(item.email, error=error))
+        return results
+
+    async def _claim(self, users: dict[int, User]) -> list[Email]:
+        """Claim the emails in the pending store, dropping those pending"""
+        if self._pending_registrations is None or not users:
+            return []
+        stored = await self._pending_registrations.add_many(list(users.values()))
+        for index, was_stored in zip(list(users), stored, strict=True):
+            if not was_stored:
+                del users[index]
+        return [user.email for user in users.values()]
+
+    async def _hash_password(
+        self, plain_password: str
+    ) -> Password | InvalidPasswordError:
+        async with self._hash_slots:
+            return await asyncio.to_thread(_hash_password, plain_password)
+
+    async def _send_codes(self, users: list[User]) -> None:
+        if self._email_filter is not None:
+            await self._email_filter.add_many(user.email.value for user in users)
+        await self._code_store.save_many(
+            {user.email: VerificationCode.generate() for user in users}
+        )
+        await self._event_publisher.publish_all(
+            [event for user in users for event in user.collect_events()]
+        )
@@ -1,10 +1,17 @@
 """Resend verification code use case."""
 
 from app.application.dto.user_dto import ResendCodeRequest, ResendCodeResponse
-from app.application.exceptions import InvalidCredentialsError, UserNotFoundError
+from app.application.exceptions import (
+    InvalidCredentialsError,
+    ResendCooldownError,
+    UserNotFoundError,
+)
 from app.application.ports.code_store import CodeStore
 from app.application.ports.event_publisher import EventPublisher
-from app.application.ports.unit_of_work import UnitOfWork
+from app.application.ports.pending_registration_store import (
+    PendingRegistrationStore,
+)
+from app.application.ports.unit_of_work import UnitOfWorkFactory
 from app.domain import UserNewVerificationCodeCreated, VerificationCode
 
 
@@ -12,7 +19,9 @@ class ResendCodeUseCase:
     """
     Use Case: Resend verification code.
 
-    - Validates credentials (Basic Auth)
+    - Rejects requests inside the per-email resend cooldown
+    - Validates credentials (Basic Auth), of a saved or pending user
+    - Starts the resend cooldown
     - Generates new verification code
     - Stores code with TTL
     - Publishes UserRegistered event (to trigger email)
@@ -20,26 +29,44 @@ class ResendCodeUseCase:
 
     def __init__(
         self,
-        uow: UnitOfWork,
+        uow_factory: UnitOfWorkFactory,
         code_store: CodeStore,
         event_publisher: EventPublisher,
+        pending_registrations: PendingRegistrationStore | None = None,
     ) -> None:
-        self._uow: UnitOfWork = uow
+        self._uow_factory: UnitOfWorkFactory = uow_factory
         self._code_store: CodeStore = code_store
         self._event_publisher: EventPublisher = event_publisher
+        self._pending_registrations: PendingRegistrationStore | None = (
+            pending_registrations
+        )
 
     async def execute(self, request: ResendCodeRequest) -> ResendCodeResponse:
         email = request.email
         password = request.password
 
-        async with self._uow:
-            user = await self._uow.user_repository.get_by_email(email)
+        # Checked first: a rejected request costs one code store call,
+        # no DB lookup and no bcrypt. Only read, so that requests with bad
+        # credentials cannot lock the owner of email out.
+        retry_after = await self._code_store.cooldown_remaining(email)
+        if retry_after:
+            raise ResendCooldownError(email.value, retry_after)
+
+        async with self._uow_factory() as uow:
+            user = await uow.user_repository.get_by_email(email)
+            if user is None and self._pending_registrations is not None:
+                user = await self._pending_registrations.get(email)
             if not user:
                 raise UserNotFoundError(email.value)
 
             if not user.verify_password(password):
                 raise InvalidCredentialsError(email.value)
 
+            # Started atomically, a concurrent request may have won the race
+            retry_after = await self._code_store.start_cooldown(email)
+            if retry_after:
+                raise ResendCooldownError(email.value, retry_after)
+
             code = VerificationCode.generate()
             await self._code_store.save(email, code)
 
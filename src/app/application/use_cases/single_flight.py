@@ -0,0 +1,62 @@
+"""Single-flight wrapper for use cases."""
+
+import asyncio
+from collections.abc import Callable, Hashable
+from typing import Protocol
+
+from app.application.ports.distributed_lock import DistributedLock
+
+
+class UseCase[RequestT, ResponseT](Protocol):
+    """Any use case: one request DTO in, one response DTO out."""
+
+    async def execute(self, request: RequestT) -> ResponseT: ...
+
+
+class SingleFlight[RequestT: Hashable, ResponseT]:
+    """
+    Run identical concurrent calls of a use case once and share the result.
+
+    Calls are keyed by the frozen request DTO, so only requests with the same
+    normalized email and the same credentials are coalesced. Errors are
+    shared like results. With a `lock`, the call is also serialized across
+    instances on `lock_key(request)`: a duplicate handled by another
+    instance runs after this one instead of alongside it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        use_case: UseCase[RequestT, ResponseT],
+        *,
+        lock: DistributedLock | None = None,
+        lock_key: Callable[[RequestT], str] = str,
+    ) -> None:
+        self.name = name
+        self._use_case = use_case
+        self._lock = lock
+        self._lock_key = lock_key
+        self._in_flight: dict[RequestT, asyncio.Task[ResponseT]] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def execute(self, request: RequestT) -> ResponseT:
+        self.calls += 1
+        task = self._in_flight.get(request)
+        if task is None:
+            task = asyncio.create_task(self._execute(request))
+            self._in_flight[request] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(request, None))
+        else:
+            self.coalesced += 1
+        # A caller going away must not cancel the call shared with the others
+        return await asyncio.shield(task)
+
+    def metrics(self) -> dict[str, int]:
+        return {"calls": self.calls, "coalesced": self.coalesced}
+
+    async def _execute(self, request: RequestT) -> ResponseT:
+        if self._lock is None:
+            return await self._use_case.execute(request)
+        async with self._lock.hold(f"{self.name}:{self._lock_key(request)}"):
+            return await self._use_case.execute(request)
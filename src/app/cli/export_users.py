@@ -0,0 +1,101 @@
+"""`export-users` command: streams users to NDJSON or CSV"""
+
+import argparse
+import contextlib
+import logging
+import sys
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import IO, Any
+
+import asyncpg
+
+from app.application.ports.user_exporter import export_columns
+from app.config import settings
+from app.infrastructure.database.user_export import export_users as export_batches
+from app.presentation.export_encoders import encode
+
+logger = logging.getLogger(__name__)
+
+
+def add_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser(
+        "export-users",
+        help="stream the users of the database and its shards to NDJSON or CSV",
+        description=(
+            "Write every user, read in batches from a server-side cursor, so "
+            "that memory use does not grow with the table."
+        ),
+    )
+    parser.add_argument(
+        "--format", dest="export_format", choices=("ndjson", "csv"), default="ndjson"
+    )
+    parser.add_argument("--output", type=Path, help="output file, default: stdout")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.export_batch_size,
+        help="rows per cursor fetch",
+    )
+    parser.add_argument(
+        "--with-password-hash",
+        action="store_true",
+        help="include the bcrypt hashed_password column",
+    )
+    parser.set_defaults(command=export_users)
+
+
+async def write_export(
+    batches: AsyncIterator[list[Any]],
+    output: IO[bytes],
+    export_format: str,
+    columns: tuple[str, ...],
+) -> int:
+    """Write the encoded batches, return the number of rows"""
+    rows = 0
+
+    async def counted() -> AsyncIterator[list[Any]]:
+        nonlocal rows
+        async for batch in batches:
+            rows += len(batch)
+            yield batch
+
+    async for chunk in encode(counted(), export_format, columns):
+        output.write(chunk)
+    output.flush()
+    return rows
+
+
+async def export_users(args: argparse.Namespace) -> None:
+    urls = [settings.database_url, *settings.database_shard_urls]
+    pools = [await asyncpg.create_pool(dsn=url, min_size=1, max_size=1) for url in urls]
+    start = time.perf_counter()
+    try:
+        with contextlib.ExitStack() as stack:
+            output = (
+                stack.enter_context(args.output.open("wb"))
+                if args.output
+                else sys.stdout.buffer
+            )
+            rows = await write_export(
+                export_batches(
+                    pools,
+                    batch_size=args.batch_size,
+                    with_password_hash=args.with_password_hash,
+                ),
+                output,
+                args.export_format,
+                export_columns(with_password_hash=args.with_password_hash),
+            )
+    finally:
+        for pool in pools:
+            await pool.close()
+    elapsed = time.perf_counter() - start
+    # stdout may be the export itself
+    logger.info(
+        "Exported %d users in %.1fs, %.0f rows/s",
+        rows,
+        elapsed,
+        rows / elapsed if elapsed else 0.0,
+    )
@@ -0,0 +1,310 @@
+"""`import-users` command: loads users from a CSV file"""
+
+import argparse
+import asyncio
+import csv
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import partial
+from pathlib import Path
+
+import asyncpg
+
+from app.application.ports.unit_of_work import UnitOfWork, UnitOfWorkFactory
+from app.config import settings
+from app.domain import Email, Password, User, UserId
+from app.domain.exceptions import DomainError, InvalidPasswordError
+from app.infrastructure.database.partition_maintainer import (
+    PostgresPartitionMaintainer,
+)
+from app.infrastructure.database.postgres_unit_of_work import PostgresUnitOfWork
+from app.infrastructure.database.shard_map import ShardMap
+from app.infrastructure.database.sharded_unit_of_work import ShardedUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y"})
+
+# Modular crypt format of bcrypt: $2b$<cost>$<22 salt + 31 hash characters>
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+BCRYPT_HASH_LENGTH = 60
+
+
+def add_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser(
+        "import-users",
+        help="load users from a CSV file into the database and its shards",
+        description=(
+            "Load users from a CSV file with an email column, a password or "
+            "hashed_password (bcrypt) column, and optional is_active and "
+            "created_at (ISO 8601) columns. Emails already registered are "
+            "skipped. The rows done are recorded in a checkpoint file after "
+            "each chunk, a new run resumes after them."
+        ),
+    )
+    parser.add_argument("path", type=Path, help="CSV file, with a header row")
+    parser.add_argument(
+        "--chunk-size", type=int, default=10_000, help="users per transaction"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="password hashing processes, default: one per core",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="checkpoint file, default: the CSV path with a .checkpoint suffix",
+    )
+    parser.add_argument(
+        "--active",
+        action="store_true",
+        help="import users without an is_active column as active, else the "
+        "inactive ones are purged after PURGE_INACTIVE_AFTER_SECONDS",
+    )
+    parser.set_defaults(command=import_users)
+
+
+@dataclass(slots=True)
+class ImportReport:
+    rows: int = 0
+    imported: int = 0
+    skipped: int = 0
+    rejected: int = 0
+    # Rows imported by previous runs, before the checkpoint
+    resumed: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rate of this run, the resumed rows were not read"""
+        if not self.elapsed_seconds:
+            return 0.0
+        return (self.rows - self.resumed) / self.elapsed_seconds
+
+
+def _hash_passwords(plain_passwords: list[str]) -> list[str | None]:
+    """Hash passwords, None for an invalid one. Runs in a worker process."""
+    hashes: list[str | None] = []
+    for plain_password in plain_passwords:
+        try:
+            hashes.append(Password.create(plain_password).hashed_value)
+        except InvalidPasswordError:
+            hashes.append(None)
+    return hashes
+
+
+def _check_hash(hashed_password: str) -> None:
+    """Reject a hash that bcrypt could not verify, rather than every login."""
+    if (
+        not hashed_password.startswith(BCRYPT_PREFIXES)
+        or len(hashed_password) != BCRYPT_HASH_LENGTH
+    ):
+        msg = "Hashed password is not a bcrypt hash"
+        raise InvalidPasswordError(msg)
+
+
+def read_rows(path: Path, skip: int = 0) -> Iterator[tuple[int, dict[str, str]]]:
+    """Data rows of the CSV file with their line number, after `skip` rows."""
+    with path.open(newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+        for index, row in enumerate(reader):
+            if index >= skip:
+                yield reader.line_num, row
+
+
+def read_checkpoint(path: Path) -> int:
+    try:
+        return int(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path: Path, rows: int) -> None:
+    # Replaced atomically, a crash leaves the previous checkpoint
+    temporary = path.with_suffix(f"{path.suffix}.tmp")
+    temporary.write_text(str(rows), encoding="utf-8")
+    temporary.replace(path)
+
+
+async def _to_users(
+    rows: list[tuple[int, dict[str, str]]],
+    executor: Executor,
+    workers: int,
+    *,
+    default_active: bool,
+) -> tuple[list[User], int]:
+    """Validated users of rows, and the number of rows rejected."""
+    # Only the rows without a hash need one, split over the workers
+    plain = [
+        index for index, (_, row) in enumerate(rows) if not row.get("hashed_password")
+    ]
+    loop = asyncio.get_running_loop()
+    size = -(-len(plain) // workers) or 1
+    slices = [plain[start : start + size] for start in range(0, len(plain), size)]
+    hashed = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                executor,
+                _hash_passwords,
+                [rows[index][1].get("password") or "" for index in indexes],
+            )
+            for indexes in slices
+        )
+    )
+    hashes = dict(
+        zip(
+            (index for indexes in slices for index in indexes),
+            (value for values in hashed for value in values),
+            strict=True,
+        )
+    )
+
+    users = []
+    rejected = 0
+    for index, (line, row) in enumerate(rows):
+        try:
+            if hashed_password := row.get("hashed_password"):
+                _check_hash(hashed_password)
+            else:
+                hashed_password = hashes[index]
+            if hashed_password is None:
+                msg = "Invalid password"
+                raise InvalidPasswordError(msg)
+            is_active = row.get("is_active")
+            created_at = row.get("created_at")
+            users.append(
+                User(
+                    id=UserId.generate(),
+                    email=Email(row.get("email") or ""),
+                    password=Password.from_hash(hashed_password),
+                    is_active=(
+                        is_active.strip().lower() in TRUE_VALUES
+                        if is_active
+                        else default_active
+                    ),
+                    created_at=(
+                        datetime.fromisoformat(created_at).astimezone(UTC)
+                        if created_at
+                        else datetime.now(UTC)
+                    ),
+                )
+            )
+        except (DomainError, ValueError) as exc:
+            rejected += 1
+            logger.warning("Line %d rejected: %s", line, exc)
+    return users, rejected
+
+
+async def run_import(
+    path: Path,
+    uow_factory: UnitOfWorkFactory,
+    executor: Executor,
+    *,
+    workers: int,
+    chunk_size: int,
+    checkpoint: Path,
+    default_active: bool = False,
+    prepare: Callable[[list[User]], Awaitable[object]] | None = None,
+) -> ImportReport:
+    """
+    Import the users of the CSV file at `path`, one chunk per transaction.
+
+    The checkpoint is written after each commit. A run that stopped between
+    the two imports its last chunk again on resume, its users are skipped
+    as already registered.
+    """
+    resumed = read_checkpoint(checkpoint)
+    report = ImportReport(rows=resumed, resumed=resumed)
+    if report.rows:
+        logger.info("Resuming after %d rows", report.rows)
+    start = time.perf_counter()
+
+    rows = read_rows(path, skip=report.rows)
+    while chunk := [row for _, row in zip(range(chunk_size), rows, strict=False)]:
+        users, rejected = await _to_users(
+            chunk, executor, workers, default_active=default_active
+        )
+        if users and prepare is not None:
+            await prepare(users)
+        async with uow_factory() as uow:
+            added = await uow.user_repository.add_many(users)
+
+        report.rows += len(chunk)
+        report.imported += len(added)
+        report.skipped += len(users) - len(added)
+        report.rejected += rejected
+        write_checkpoint(checkpoint, report.rows)
+
+        report.elapsed_seconds = time.perf_counter() - start
+        logger.info(
+            "%d rows, %d imported, %d skipped, %d rejected, %.0f rows/s",
+            report.rows,
+            report.imported,
+            report.skipped,
+            report.rejected,
+            report.rows_per_second,
+        )
+    return report
+
+
+async def import_users(args: argparse.Namespace) -> None:
+    urls = [settings.database_url, *settings.database_shard_urls]
+    pools = [await asyncpg.create_pool(dsn=url, min_size=1, max_size=2) for url in urls]
+    shards: list[UnitOfWorkFactory] = [
+        partial(PostgresUnitOfWork, pool) for pool in pools
+    ]
+    uow_factory: UnitOfWorkFactory = shards[0]
+    if len(shards) > 1:
+        shard_map = ShardMap(
+            len(shards),
+            bucket_count=settings.database_shard_buckets,
+            ranges=settings.database_shard_ranges,
+        )
+
+        def uow_factory() -> UnitOfWork:
+            return ShardedUnitOfWork(shards, shard_map)
+
+    maintainers = [
+        PostgresPartitionMaintainer(
+            pool, months_ahead=settings.database_partition_months_ahead
+        )
+        for pool in pools
+    ]
+    oldest = datetime.max.replace(tzinfo=UTC)
+
+    async def prepare(users: list[User]) -> None:
+        # Rows may be older than the existing partitions
+        nonlocal oldest
+        chunk_oldest = min(user.created_at for user in users)
+        if chunk_oldest < oldest:
+            oldest = chunk_oldest
+            for maintainer in maintainers:
+                await maintainer.ensure_partitions_since(oldest)
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            report = await run_import(
+                args.path,
+                uow_factory,
+                executor,
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                checkpoint=args.checkpoint or args.path.with_suffix(".checkpoint"),
+                default_active=args.active,
+                prepare=prepare,
+            )
+    finally:
+        for pool in pools:
+            await pool.close()
+    print(
+        f"{report.rows} rows in {report.elapsed_seconds:.0f}s: "
+        f"{report.imported} imported, {report.skipped} skipped, "
+        f"{report.rejected} rejected, {report.rows_per_second:.0f} rows/s"
+    )
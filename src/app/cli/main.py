@@ -0,0 +1,25 @@
+"""Command line entry point."""
+
+import argparse
+import asyncio
+import logging
+from collections.abc import Sequence
+
+from app.cli import export_users, import_users, migrate, reissue_codes
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="dm-user-registration")
+    subparsers = parser.add_subparsers(required=True)
+    migrate.add_parser(subparsers)
+    import_users.add_parser(subparsers)
+    export_users.add_parser(subparsers)
+    reissue_codes.add_parser(subparsers)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(args.command(args))
+
+
+if __name__ == "__main__":
+    main()
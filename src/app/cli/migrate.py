@@ -0,0 +1,39 @@
+"""`migrate` command: applies pending schema migrations"""
+
+import argparse
+
+import asyncpg
+
+from app.config import settings
+from app.infrastructure.database.migrator import PostgresMigrator
+
+
+def add_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser(
+        "migrate",
+        help="apply pending schema migrations to the database and its shards",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="list pending migrations only"
+    )
+    parser.set_defaults(command=migrate)
+
+
+async def migrate(args: argparse.Namespace) -> None:
+    for url in [settings.database_url, *settings.database_shard_urls]:
+        pool = await asyncpg.create_pool(dsn=url, min_size=1, max_size=1)
+        try:
+            migrator = PostgresMigrator(
+                pool,
+                lock_timeout_seconds=settings.database_migration_lock_timeout_seconds,
+            )
+            migrations = (
+                await migrator.pending() if args.dry_run else await migrator.migrate()
+            )
+        finally:
+            await pool.close()
+        database = url.rpartition("@")[2]
+        verb = "pending" if args.dry_run else "applied"
+        print(f"{database}: {len(migrations)} migrations {verb}")
+        for migration in migrations:
+            print(f"  {migration.version:04d}_{migration.name}")
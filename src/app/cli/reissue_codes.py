@@ -0,0 +1,103 @@
+"""`reissue-codes` command: sends new verification codes to inactive users"""
+
+import argparse
+from datetime import UTC, datetime, timedelta
+
+import asyncpg
+import redis.asyncio as redis
+
+from app.config import settings
+from app.infrastructure.code_store.redis_code_store import RedisCodeStore
+from app.infrastructure.database.code_reissuer import PostgresCodeReissuer
+from app.infrastructure.event_publisher.rabbitmq_event_publisher import (
+    RabbitMQEventPublisher,
+)
+
+
+def add_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser(
+        "reissue-codes",
+        help="send a new verification code to every inactive user",
+        description=(
+            "Generate a verification code for every user still inactive, "
+            "registered since --since, and publish their "
+            "UserNewVerificationCodeCreated events, typically after an outage "
+            "of the mailer or RabbitMQ. Users pending in the pending "
+            "registration store are not in the database, they are not walked."
+        ),
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="oldest registration (ISO 8601), default: the oldest not purged "
+        "yet, PURGE_INACTIVE_AFTER_SECONDS ago",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.reissue_batch_size,
+        help="users per query, code store round trip and publish",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=settings.reissue_rate_per_second,
+        help="events published per second at most",
+    )
+    parser.add_argument(
+        "--include-unexpired",
+        action="store_true",
+        help="also replace the codes that have not expired yet",
+    )
+    parser.set_defaults(command=reissue_codes)
+
+
+async def reissue_codes(args: argparse.Namespace) -> None:
+    since = args.since or datetime.now(UTC) - timedelta(
+        seconds=settings.purge_inactive_after_seconds
+    )
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+
+    redis_client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+    code_store = RedisCodeStore(
+        redis_client,
+        ttl_seconds=settings.verification_code_ttl_seconds,
+        cooldown_seconds=settings.resend_code_cooldown_seconds,
+    )
+    publisher = RabbitMQEventPublisher(
+        settings.rabbitmq_url,
+        settings.rabbitmq_exchange_name,
+        settings.rabbitmq_queue_name,
+        settings.rabbitmq_routing_key,
+        settings.rabbitmq_retry_seconds,
+        code_store,
+    )
+    await publisher.connect()
+    try:
+        # One database after the other, so that --rate bounds them all
+        for url in [settings.database_url, *settings.database_shard_urls]:
+            pool = await asyncpg.create_pool(dsn=url, min_size=1, max_size=1)
+            try:
+                report = await PostgresCodeReissuer(
+                    pool,
+                    code_store,
+                    publisher,
+                    batch_size=args.batch_size,
+                    rate_per_second=args.rate,
+                    skip_unexpired=not args.include_unexpired,
+                ).reissue(since)
+            finally:
+                await pool.close()
+            database = url.rpartition("@")[2]
+            if report.skipped:
+                print(f"{database}: skipped, another reissue holds the lock")
+                continue
+            print(
+                f"{database}: {report.reissued} codes reissued in "
+                f"{report.elapsed_seconds:.0f}s, "
+                f"{report.skipped_unexpired} unexpired skipped"
+            )
+    finally:
+        await publisher.close()
+        await redis_client.aclose()
@@ -1,8 +1,9 @@
 """Application settings"""
 
 from functools import cached_property
+from typing import Literal
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 from pydantic.fields import computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,6 +12,40 @@ import app
 DEFAULT_APP_ENV = "dev"
 
 
+class RateLimitRule(BaseModel):
+    """Token bucket: `capacity` burst, refilled at `refill_per_second`."""
+
+    capacity: int = Field(gt=0)
+    refill_per_second: float = Field(gt=0)
+
+
+class RouteRateLimit(BaseModel):
+    """Rate limits of one route, per client IP and per request email."""
+
+    ip: RateLimitRule | None = None
+    email: RateLimitRule | None = None
+
+
+DEFAULT_RATE_LIMITS = {
+    "/api/v1/users/register": RouteRateLimit(
+        ip=RateLimitRule(capacity=10, refill_per_second=10 / 60),
+        email=RateLimitRule(capacity=3, refill_per_second=1 / 60),
+    ),
+    # Per client IP only, the emails are in the batch
+    "/api/v1/users/register:batch": RouteRateLimit(
+        ip=RateLimitRule(capacity=2, refill_per_second=2 / 60),
+    ),
+    "/api/v1/users/activate": RouteRateLimit(
+        ip=RateLimitRule(capacity=20, refill_per_second=20 / 60),
+        email=RateLimitRule(capacity=5, refill_per_second=5 / 60),
+    ),
+    "/api/v1/users/resend-code": RouteRateLimit(
+        ip=RateLimitRule(capacity=10, refill_per_second=10 / 60),
+        email=RateLimitRule(capacity=3, refill_per_second=1 / 60),
+    ),
+}
+
+
 class Settings(BaseSettings):
     """Application settings"""
 
@@ -42,6 +77,26 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = Field(default=...)
+    # Batch concurrent user lookups into one query
+    database_batch_reads: bool = True
+    database_max_batch_size: int = 500
+    # Read replicas for user lookups, skipped while lagging or unreachable
+    database_replica_urls: list[str] = Field(default_factory=list)
+    database_replica_max_lag_seconds: float = 1.0
+    database_replica_retry_seconds: float = 5.0
+    database_replica_check_seconds: float = 2.0
+    # Extra shards, DATABASE_URL being shard 0. Users are spread over virtual
+    # buckets, owned by shards in ranges: first bucket of each range -> shard
+    database_shard_urls: list[str] = Field(default_factory=list)
+    database_shard_buckets: int = 1024
+    database_shard_ranges: dict[int, int] = Field(default_factory=dict)
+    # Apply pending schema migrations on startup. Off by default: some
+    # migrations are not online-safe and belong to `dm-user-registration migrate`
+    database_migrate_on_startup: bool = False
+    database_migration_lock_timeout_seconds: float = 5.0
+    # Monthly users partitions created ahead of time
+    database_partition_months_ahead: int = 3
+    database_partition_check_seconds: float = 3600.0
 
     # Redis
     redis_url: str = Field(default=...)
@@ -55,6 +110,66 @@ class Settings(BaseSettings):
 
     # Verification code
     verification_code_ttl_seconds: int = 60
+    resend_code_cooldown_seconds: int = 30
+
+    # Bearer token of the /admin routes, which are disabled without one
+    admin_token: str | None = None
+    # Rows per server-side cursor fetch of the user export
+    export_batch_size: int = 10_000
+
+    # Batch registration: items per request, users per transaction
+    register_batch_max_items: int = 10_000
+    register_batch_chunk_size: int = 1000
+    # Passwords hashed at the same time by all batches, each takes a thread
+    register_batch_hash_concurrency: int = 4
+
+    # Purge of users still inactive after purge_inactive_after_seconds, opt-in
+    purge_inactive_users: bool = False
+    purge_inactive_after_seconds: int = 7 * 86_400
+    purge_interval_seconds: float = 3600.0
+    purge_batch_size: int = 1000
+    purge_pause_seconds: float = 0.1
+
+    # Bulk re-issue of verification codes: users per batch, events per second
+    reissue_batch_size: int = 1000
+    reissue_rate_per_second: float = 200.0
+
+    # Pending registrations: redis keeps unactivated users out of Postgres
+    # until activation, none saves them on registration
+    pending_registration_backend: Literal["none", "redis"] = "none"
+    pending_registration_ttl_seconds: int = 86_400
+
+    # Registered email Bloom filter: memory, redis or none
+    email_filter_backend: Literal["memory", "redis", "none"] = "memory"
+    email_filter_capacity: int = 10_000_000
+    email_filter_false_positive_rate: float = 0.01
+
+    # User cache by email: memory (invalidated over pub/sub), redis or none
+    user_cache_backend: Literal["memory", "redis", "none"] = "memory"
+    user_cache_ttl_seconds: int = 60
+    user_cache_max_entries: int = 100_000
+
+    # Rate limiting, keyed by route path: redis shares the buckets between
+    # instances, memory keeps them per process
+    rate_limit_backend: Literal["redis", "memory"] = "redis"
+    rate_limits: dict[str, RouteRateLimit] = Field(
+        default_factory=lambda: dict(DEFAULT_RATE_LIMITS)
+    )
+    rate_limit_local_fraction: float = 0.2
+    rate_limit_local_seconds: float = 1.0
+
+    # Idempotency-Key support, by route path
+    idempotency_paths: list[str] = Field(
+        default_factory=lambda: ["/api/v1/users/register"]
+    )
+    idempotency_ttl_seconds: int = 86_400
+    idempotency_in_flight_seconds: int = 30
+    idempotency_wait_seconds: float = 10.0
+
+    # Single-flight of activate / resend-code, optionally across instances
+    single_flight_lock_enabled: bool = False
+    single_flight_lock_ttl_seconds: float = 10.0
+    single_flight_lock_wait_seconds: float = 10.0
 
 
 settings = Settings()
@@ -1,18 +1,79 @@
 """Dependency injection container."""
 
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING
+from uuid import UUID
 
 import asyncpg
 import redis.asyncio as redis
 
+from app.application.dto.user_dto import (
+    ActivateUserRequest,
+    ActivateUserResponse,
+    ResendCodeRequest,
+    ResendCodeResponse,
+)
 from app.application.ports.code_store import CodeStore
+from app.application.ports.distributed_lock import DistributedLock
 from app.application.ports.event_publisher import EventPublisher
+from app.application.ports.idempotency_store import IdempotencyStore
+from app.application.ports.rate_limiter import RateLimiter
+from app.application.ports.unit_of_work import UnitOfWork, UnitOfWorkFactory
+from app.application.ports.user_lister import FIRST_PAGE
+from app.application.use_cases.activate_user import ActivateUserUseCase
+from app.application.use_cases.register_user import RegisterUserUseCase
+from app.application.use_cases.register_users import RegisterUsersUseCase
+from app.application.use_cases.resend_code import ResendCodeUseCase
+from app.application.use_cases.single_flight import SingleFlight
 from app.config import settings
+from app.domain import User
 from app.infrastructure.code_store.redis_code_store import RedisCodeStore
+from app.infrastructure.database.migrator import PostgresMigrator
+from app.infrastructure.database.partition_maintainer import (
+    PostgresPartitionMaintainer,
+)
 from app.infrastructure.database.postgres_unit_of_work import PostgresUnitOfWork
+from app.infrastructure.database.replica_set import ReplicaSet
+from app.infrastructure.database.shard_map import ShardMap
+from app.infrastructure.database.sharded_unit_of_work import ShardedUnitOfWork
+from app.infrastructure.database.user_export import export_users
+from app.infrastructure.database.user_listing import list_users
+from app.infrastructure.database.user_loader import PostgresUserLoader
+from app.infrastructure.database.user_purger import PostgresUserPurger
+from app.infrastructure.distributed_lock.redis_distributed_lock import (
+    RedisDistributedLock,
+)
+from app.infrastructure.email_filter.memory_email_filter import MemoryEmailFilter
+from app.infrastructure.email_filter.populate import (
+    PopulatableEmailFilter,
+    populate_email_filter,
+)
+from app.infrastructure.email_filter.redis_email_filter import RedisEmailFilter
 from app.infrastructure.event_publisher.rabbitmq_event_publisher import (
     RabbitMQEventPublisher,
 )
+from app.infrastructure.idempotency_store.redis_idempotency_store import (
+    RedisIdempotencyStore,
+)
+from app.infrastructure.pending_registration_store.redis_pending_registration_store import (
+    RedisPendingRegistrationStore,
+)
+from app.infrastructure.rate_limiter.memory_rate_limiter import MemoryRateLimiter
+from app.infrastructure.rate_limiter.redis_rate_limiter import RedisRateLimiter
+from app.infrastructure.user_cache.cached_user_repository import CachingUnitOfWork
+from app.infrastructure.user_cache.memory_user_cache import MemoryUserCache
+from app.infrastructure.user_cache.pubsub_user_cache import PubSubUserCache
+from app.infrastructure.user_cache.redis_user_cache import RedisUserCache
+
+if TYPE_CHECKING:
+    from app.application.ports.pending_registration_store import (
+        PendingRegistrationStore,
+    )
+    from app.application.ports.user_cache import UserCache
 
 CONTAINER_NOT_INIT_ERROR_MSG = "Container not initialized. Call init() first."
 
@@ -21,15 +82,37 @@ class Container:
     """dependency injection container"""
 
     def __init__(self) -> None:
+        # Replica monitor, partitions, email filter, purge, cache invalidation
+        self._background_tasks: list[asyncio.Task[None]] = []
         self._db_pool: asyncpg.Pool | None = None
+        self._replica_pools: list[asyncpg.Pool] = []
+        self._replicas: ReplicaSet | None = None
+        self._user_loader: PostgresUserLoader | None = None
+        self._shard_pools: list[asyncpg.Pool] = []
+        self._shards: list[UnitOfWorkFactory] = []
+        self._shard_map: ShardMap | None = None
+        self._user_purgers: list[PostgresUserPurger] = []
         self._redis_pool: redis.ConnectionPool | None = None
         self._redis: redis.Redis | None = None
         self._rabbitmq_publisher: RabbitMQEventPublisher | None = None
         self._code_store: CodeStore | None = None
         self._event_publisher: EventPublisher | None = None
+        self._rate_limiter: RateLimiter | None = None
+        self._idempotency_store: IdempotencyStore | None = None
+        self._pending_registrations: PendingRegistrationStore | None = None
+        self._email_filter: PopulatableEmailFilter | None = None
+        self._user_cache: UserCache | None = None
+        self._register_user_use_case: RegisterUserUseCase | None = None
+        self._register_users_use_case: RegisterUsersUseCase | None = None
+        self._activate_user_use_case: (
+            SingleFlight[ActivateUserRequest, ActivateUserResponse] | None
+        ) = None
+        self._resend_code_use_case: (
+            SingleFlight[ResendCodeRequest, ResendCodeResponse] | None
+        ) = None
 
     async def init(self) -> None:
-        self._db_pool = await asyncpg.create_pool(dsn=settings.database_url)
+        await self._init_database()
         self._redis_pool = redis.ConnectionPool.from_url(
             settings.redis_url,
             decode_responses=True,
@@ -37,7 +120,9 @@ class Container:
         self._redis = redis.Redis.from_pool(self._redis_pool)
 
         self._code_store = RedisCodeStore(
-            self._redis, ttl_seconds=settings.verification_code_ttl_seconds
+            self._redis,
+            ttl_seconds=settings.verification_code_ttl_seconds,
+            cooldown_seconds=settings.resend_code_cooldown_seconds,
         )
         self._rabbitmq_publisher = RabbitMQEventPublisher(
             settings.rabbitmq_url,
@@ -50,10 +135,178 @@ class Container:
         await self._rabbitmq_publisher.connect()
         self._event_publisher = self._rabbitmq_publisher
 
+        if settings.rate_limit_backend == "redis":
+            self._rate_limiter = RedisRateLimiter(
+                self._redis,
+                local_fraction=settings.rate_limit_local_fraction,
+                local_seconds=settings.rate_limit_local_seconds,
+            )
+        else:
+            self._rate_limiter = MemoryRateLimiter()
+        self._idempotency_store = RedisIdempotencyStore(
+            self._redis,
+            ttl_seconds=settings.idempotency_ttl_seconds,
+            in_flight_seconds=settings.idempotency_in_flight_seconds,
+        )
+
+        self._email_filter = self._create_email_filter(self._redis)
+        if self._email_filter is not None:
+            # Populated in the background, it answers "might exist" until then
+            self._background_tasks.append(
+                asyncio.create_task(
+                    populate_email_filter(
+                        self._email_filter, [self._db_pool, *self._shard_pools]
+                    )
+                )
+            )
+
+        self._background_tasks.extend(
+            asyncio.create_task(
+                PostgresPartitionMaintainer(
+                    pool, months_ahead=settings.database_partition_months_ahead
+                ).run(settings.database_partition_check_seconds)
+            )
+            for pool in [self._db_pool, *self._shard_pools]
+        )
+
+        if settings.user_cache_backend == "redis":
+            self._user_cache = RedisUserCache(
+                self._redis, ttl_seconds=settings.user_cache_ttl_seconds
+            )
+        elif settings.user_cache_backend == "memory":
+            pubsub_cache = PubSubUserCache(
+                MemoryUserCache(
+                    ttl_seconds=settings.user_cache_ttl_seconds,
+                    max_entries=settings.user_cache_max_entries,
+                ),
+                self._redis,
+            )
+            self._background_tasks.append(asyncio.create_task(pubsub_cache.listen()))
+            self._user_cache = pubsub_cache
+
+        if settings.purge_inactive_users:
+            self._user_purgers = [
+                PostgresUserPurger(
+                    pool,
+                    max_age_seconds=settings.purge_inactive_after_seconds,
+                    batch_size=settings.purge_batch_size,
+                    pause_seconds=settings.purge_pause_seconds,
+                    user_cache=self._user_cache,
+                )
+                for pool in [self._db_pool, *self._shard_pools]
+            ]
+            self._background_tasks.extend(
+                asyncio.create_task(purger.run(settings.purge_interval_seconds))
+                for purger in self._user_purgers
+            )
+
+        if settings.pending_registration_backend == "redis":
+            self._pending_registrations = RedisPendingRegistrationStore(
+                self._redis, ttl_seconds=settings.pending_registration_ttl_seconds
+            )
+
+        # Use cases are stateless, only the unit of work is per call
+        self._register_user_use_case = RegisterUserUseCase(
+            uow_factory=self.uow,
+            code_store=self._code_store,
+            event_publisher=self._event_publisher,
+            email_filter=self._email_filter,
+            pending_registrations=self._pending_registrations,
+        )
+        self._register_users_use_case = RegisterUsersUseCase(
+            uow_factory=self.uow,
+            code_store=self._code_store,
+            event_publisher=self._event_publisher,
+            email_filter=self._email_filter,
+            pending_registrations=self._pending_registrations,
+            chunk_size=settings.register_batch_chunk_size,
+            hash_concurrency=settings.register_batch_hash_concurrency,
+        )
+
+        # Coalesce concurrent retries of the same activate / resend request
+        lock = self._single_flight_lock(self._redis)
+        self._activate_user_use_case = SingleFlight(
+            "activate_user",
+            ActivateUserUseCase(
+                uow_factory=self.uow,
+                code_store=self._code_store,
+                event_publisher=self._event_publisher,
+                pending_registrations=self._pending_registrations,
+            ),
+            lock=lock,
+            lock_key=lambda request: request.email.value,
+        )
+        self._resend_code_use_case = SingleFlight(
+            "resend_code",
+            ResendCodeUseCase(
+                uow_factory=self.uow,
+                code_store=self._code_store,
+                event_publisher=self._event_publisher,
+                pending_registrations=self._pending_registrations,
+            ),
+            lock=lock,
+            lock_key=lambda request: request.email.value,
+        )
+
+    def export_users(
+        self, *, with_password_hash: bool = False
+    ) -> AsyncIterator[list[asyncpg.Record]]:
+        if self._db_pool is None:
+            raise RuntimeError(CONTAINER_NOT_INIT_ERROR_MSG)
+        return export_users(
+            [self._db_pool, *self._shard_pools],
+            batch_size=settings.export_batch_size,
+            with_password_hash=with_password_hash,
+            replicas=self._replicas,
+        )
+
+    async def list_users(
+        self,
+        limit: int,
+        after: tuple[datetime, UUID] = FIRST_PAGE,
+        *,
+        is_active: bool | None = None,
+        email_prefix: str | None = None,
+    ) -> list[User]:
+        if self._db_pool is None:
+            raise RuntimeError(CONTAINER_NOT_INIT_ERROR_MSG)
+        return await list_users(
+            [self._db_pool, *self._shard_pools],
+            limit,
+            after,
+            is_active=is_active,
+            email_prefix=email_prefix,
+            replicas=self._replicas,
+        )
+
+    async def migrate(self) -> None:
+        for pool in [self._db_pool, *self._shard_pools]:
+            await PostgresMigrator(
+                pool,
+                lock_timeout_seconds=settings.database_migration_lock_timeout_seconds,
+            ).migrate()
+
     async def close(self) -> None:
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._background_tasks = []
+        self._email_filter = None
+        self._user_cache = None
+        self._user_purgers = []
+        for replica_pool in self._replica_pools:
+            await replica_pool.close()
+        self._replica_pools = []
+        self._replicas = None
+        for shard_pool in self._shard_pools:
+            await shard_pool.close()
+        self._shard_pools = []
+        self._shards = []
+        self._shard_map = None
         if self._db_pool is not None:
             await self._db_pool.close()
             self._db_pool = None
+            self._user_loader = None
         if self._redis is not None:
             await self._redis.aclose()
             self._redis = None
@@ -65,6 +318,13 @@ class Container:
             self._rabbitmq_publisher = None
         self._code_store = None
         self._event_publisher = None
+        self._rate_limiter = None
+        self._idempotency_store = None
+        self._pending_registrations = None
+        self._register_user_use_case = None
+        self._register_users_use_case = None
+        self._activate_user_use_case = None
+        self._resend_code_use_case = None
 
     @property
     def db_pool(self) -> asyncpg.Pool:
@@ -84,10 +344,155 @@ class Container:
             raise RuntimeError(CONTAINER_NOT_INIT_ERROR_MSG)
         return self._event_publisher
 
-    async def uow(self) -> AsyncGenerator[PostgresUnitOfWork]:
-        if self._db_pool is None:
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        if self._rate_limiter is None:
+            raise RuntimeError(CONTAINER_NOT_INIT_ERROR_MSG)
+        return self._rate_limiter
+
+    @property
+    def idempotency_store(self) -> IdempotencyStore:
+        if self._idempotency_store is None:
+            raise RuntimeError(CONTAINER_NOT_INIT_ERROR_MSG)
+        return self._idempotency_store
+
+    @property
+    def register_user_use_case(self) -> RegisterUserUseCase:
+        if self._register_user_use_case is None:
+            raise RuntimeError(CONTAINER_NOT_INIT_ERROR_MSG)
+        return self._register_user_use_case
+
+    @property
+    def register_users_use_case(self) -> RegisterUsersUseCase:
+        if self._register_users_use_case is None:
+            raise RuntimeError(CONTAINER_NOT_INIT_ERROR_MSG)
+        return self._register_users_use_case
+
+    @property
+    def activate_user_use_case(
+        self,
+    ) -> SingleFlight[ActivateUserRequest, ActivateUserResponse]:
+        if self._activate_user_use_case is None:
+            raise RuntimeError(CONTAINER_NOT_INIT_ERROR_MSG)
+        return self._activate_user_use_case
+
+    @property
+    def resend_code_use_case(
+        self,
+    ) -> SingleFlight[ResendCodeRequest, ResendCodeResponse]:
+        if self._resend_code_use_case is None:
+            raise RuntimeError(CONTAINER_NOT_INIT_ERROR_MSG)
+        return self._resend_code_use_case
+
+    async def _init_database(self) -> None:
+        self._db_pool = await asyncpg.create_pool(dsn=settings.database_url)
+        if settings.database_replica_urls:
+            self._replica_pools = [
+                await asyncpg.create_pool(dsn=url)
+                for url in settings.database_replica_urls
+            ]
+            self._replicas = ReplicaSet(
+                self._db_pool,
+                self._replica_pools,
+                max_lag_seconds=settings.database_replica_max_lag_seconds,
+                retry_seconds=settings.database_replica_retry_seconds,
+            )
+            self._background_tasks.append(
+                asyncio.create_task(
+                    self._replicas.monitor(settings.database_replica_check_seconds)
+                )
+            )
+        if settings.database_batch_reads:
+            self._user_loader = PostgresUserLoader(
+                self._replicas or self._db_pool,
+                max_batch_size=settings.database_max_batch_size,
+            )
+        self._shards = [
+            partial(
+                PostgresUnitOfWork, self._db_pool, self._user_loader, self._replicas
+            )
+        ]
+        if settings.database_shard_urls:
+            await self._init_shards()
+        if settings.database_migrate_on_startup:
+            await self.migrate()
+
+    async def _init_shards(self) -> None:
+        self._shard_pools = [
+            await asyncpg.create_pool(dsn=url) for url in settings.database_shard_urls
+        ]
+        for pool in self._shard_pools:
+            loader = None
+            if settings.database_batch_reads:
+                loader = PostgresUserLoader(
+                    pool, max_batch_size=settings.database_max_batch_size
+                )
+            self._shards.append(partial(PostgresUnitOfWork, pool, loader))
+        self._shard_map = ShardMap(
+            len(self._shards),
+            bucket_count=settings.database_shard_buckets,
+            ranges=settings.database_shard_ranges,
+        )
+
+    @staticmethod
+    def _create_email_filter(client: redis.Redis) -> PopulatableEmailFilter | None:
+        if settings.email_filter_backend == "redis":
+            return RedisEmailFilter(
+                client,
+                capacity=settings.email_filter_capacity,
+                false_positive_rate=settings.email_filter_false_positive_rate,
+            )
+        if settings.email_filter_backend == "memory":
+            return MemoryEmailFilter(
+                capacity=settings.email_filter_capacity,
+                false_positive_rate=settings.email_filter_false_positive_rate,
+            )
+        return None
+
+    @staticmethod
+    def _single_flight_lock(client: redis.Redis) -> DistributedLock | None:
+        if not settings.single_flight_lock_enabled:
+            return None
+        return RedisDistributedLock(
+            client,
+            ttl_seconds=settings.single_flight_lock_ttl_seconds,
+            wait_seconds=settings.single_flight_lock_wait_seconds,
+        )
+
+    def user_cache_metrics(self) -> dict[str, float]:
+        if self._user_cache is None:
+            return {}
+        hits, misses = self._user_cache.hits, self._user_cache.misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def user_purge_metrics(self) -> dict[str, object]:
+        return {
+            f"shard_{index}": asdict(purger.last_report) if purger.last_report else None
+            for index, purger in enumerate(self._user_purgers)
+        }
+
+    def single_flight_metrics(self) -> dict[str, dict[str, int]]:
+        single_flights = [self.activate_user_use_case, self.resend_code_use_case]
+        return {
+            single_flight.name: single_flight.metrics()
+            for single_flight in single_flights
+        }
+
+    def uow(self) -> UnitOfWork:
+        if not self._shards:
             raise RuntimeError(CONTAINER_NOT_INIT_ERROR_MSG)
-        yield PostgresUnitOfWork(self._db_pool)
+        uow: UnitOfWork
+        if self._shard_map is not None:
+            uow = ShardedUnitOfWork(self._shards, self._shard_map)
+        else:
+            uow = self._shards[0]()
+        if self._user_cache is None:
+            return uow
+        return CachingUnitOfWork(uow, self._user_cache)
 
 
 container = Container()
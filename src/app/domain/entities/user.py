@@ -22,6 +22,9 @@ class User:
     User Aggregate Root.
 
     Represents a user account with email verification.
+
+    `version` counts the saves of the user, 0 until it is first saved.
+    Changed fields are tracked so that only they are written back.
     """
 
     id: UserId
@@ -29,7 +32,9 @@ class User:
     password: Password
     is_active: bool = False
     created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    version: int = 0
     _events: list[DomainEvent] = field(default_factory=list, repr=False)
+    _changes: set[str] = field(default_factory=set, repr=False, compare=False)
 
     @classmethod
     def create(cls, email: Email, password: Password) -> User:
@@ -51,12 +56,23 @@ class User:
             raise UserAlreadyActiveError(msg)
 
         self.is_active = True
+        self._changes.add("is_active")
         self._record_event(UserActivated(user_id=self.id, email=self.email))
 
     def verify_password(self, plain_password: str) -> bool:
         """Verify if the provided password matches."""
         return self.password.verify(plain_password)
 
+    @property
+    def changes(self) -> frozenset[str]:
+        """Fields changed since the user was loaded or last saved."""
+        return frozenset(self._changes)
+
+    def mark_saved(self) -> None:
+        """Record a save: one version more, no changes left."""
+        self.version += 1
+        self._changes.clear()
+
     def _record_event(self, event: DomainEvent) -> None:
         """Record a domain event."""
         self._events.append(event)
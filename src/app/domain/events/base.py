@@ -2,12 +2,14 @@
 
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from app.domain.uuid7 import uuid7
 
 
 @dataclass(frozen=True, slots=True, kw_only=True)
 class DomainEvent:
     """Base class for all domain events."""
 
-    event_id: UUID = field(default_factory=uuid4)
+    event_id: UUID = field(default_factory=uuid7)
     occurred_at: datetime = field(default_factory=lambda: datetime.now(UTC))
@@ -3,9 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from uuid import UUID, uuid4
+from typing import TYPE_CHECKING
+from uuid import UUID
 
 from app.domain.exceptions import InvalidUserIdError
+from app.domain.uuid7 import uuid7, uuid7_timestamp
+
+if TYPE_CHECKING:
+    from datetime import datetime
 
 
 @dataclass(frozen=True, slots=True)
@@ -16,8 +21,8 @@ class UserId:
 
     @classmethod
     def generate(cls) -> UserId:
-        """Generate a new UserId."""
-        return cls(uuid4())
+        """Generate a new time-ordered UserId."""
+        return cls(uuid7())
 
     @classmethod
     def from_string(cls, value: str) -> UserId:
@@ -29,3 +34,11 @@ class UserId:
             raise InvalidUserIdError(msg) from e
         else:
             return cls(user_id)
+
+    @property
+    def timestamp(self) -> datetime | None:
+        """Creation time of a time-ordered id, None for older random ids."""
+        try:
+            return uuid7_timestamp(self.value)
+        except ValueError:
+            return None
@@ -1,6 +1,7 @@
 """In-memory implementation of CodeStore port."""
 
 import time
+from collections.abc import Mapping, Sequence
 
 from app.domain import Email, VerificationCode
 
@@ -8,16 +9,26 @@ from app.domain import Email, VerificationCode
 class MemoryCodeStore:
     """
     In-memory implementation of CodeStore port.
+
+    Cooldowns all last `cooldown_seconds` and are inserted as they start, so
+    the dict is ordered by expiry: the expired ones are evicted from its
+    head whenever a cooldown starts.
     """
 
-    def __init__(self, ttl_seconds: int = 60) -> None:
+    def __init__(self, ttl_seconds: int = 60, cooldown_seconds: int = 30) -> None:
         self._store: dict[str, tuple[VerificationCode, float]] = {}
+        self._cooldowns: dict[str, float] = {}
         self._ttl = ttl_seconds
+        self._cooldown = cooldown_seconds
 
     async def save(self, email: Email, code: VerificationCode) -> None:
         expires_at = time.time() + self._ttl
         self._store[email.value] = (code, expires_at)
 
+    async def save_many(self, codes: Mapping[Email, VerificationCode]) -> None:
+        for email, code in codes.items():
+            await self.save(email, code)
+
     async def get(self, email: Email) -> VerificationCode | None:
         entry = self._store.get(email.value)
         if entry is None:
@@ -30,5 +41,29 @@ class MemoryCodeStore:
 
         return code
 
+    async def get_many(self, emails: Sequence[Email]) -> list[VerificationCode | None]:
+        return [await self.get(email) for email in emails]
+
     async def delete(self, email: Email) -> None:
         self._store.pop(email.value, None)
+
+    async def cooldown_remaining(self, email: Email) -> float:
+        expires_at = self._cooldowns.get(email.value, 0.0)
+        return max(expires_at - time.time(), 0.0)
+
+    async def start_cooldown(self, email: Email) -> float:
+        now = time.time()
+        self._evict_cooldowns(now)
+        expires_at = self._cooldowns.get(email.value, 0.0)
+        if expires_at > now:
+            return expires_at - now
+
+        self._cooldowns[email.value] = now + self._cooldown
+        return 0.0
+
+    def _evict_cooldowns(self, now: float) -> None:
+        while self._cooldowns:
+            email, expires_at = next(iter(self._cooldowns.items()))
+            if expires_at > now:
+                return
+            del self._cooldowns[email]
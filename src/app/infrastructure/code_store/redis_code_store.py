@@ -1,18 +1,36 @@
 """Redis implementation of CodeStore port"""
 
+from collections.abc import Mapping, Sequence
+
 import redis.asyncio as redis
 
 from app.domain import Email, VerificationCode
 
 _KEY_PREFIX = "verification_code:"
+_COOLDOWN_KEY_PREFIX = "resend_cooldown:"
+
+# Start the cooldown, or report what is left of it, in one round trip
+_START_COOLDOWN_SCRIPT = """
+if redis.call('SET', KEYS[1], 1, 'NX', 'PX', ARGV[1]) then
+    return 0
+end
+return redis.call('PTTL', KEYS[1])
+"""
 
 
 class RedisCodeStore:
     """Redis implementation of CodeStore port"""
 
-    def __init__(self, client: redis.Redis, ttl_seconds: int = 60) -> None:
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl_seconds: int = 60,
+        cooldown_seconds: int = 30,
+    ) -> None:
         self._client = client
         self._ttl = ttl_seconds
+        self._cooldown_ms = cooldown_seconds * 1000
+        self._start_cooldown = client.register_script(_START_COOLDOWN_SCRIPT)
 
     def _key(self, email: Email) -> str:
         return f"{_KEY_PREFIX}{email}"
@@ -20,11 +38,41 @@ class RedisCodeStore:
     async def save(self, email: Email, code: VerificationCode) -> None:
         await self._client.set(self._key(email), code.value, ex=self._ttl)
 
+    async def save_many(self, codes: Mapping[Email, VerificationCode]) -> None:
+        pipeline = self._client.pipeline(transaction=False)
+        for email, code in codes.items():
+            pipeline.set(self._key(email), code.value, ex=self._ttl)
+        await pipeline.execute()
+
     async def get(self, email: Email) -> VerificationCode | None:
         value = await self._client.get(self._key(email))
         if value is None:
             return None
         return VerificationCode(str(value))
 
+    async def get_many(self, emails: Sequence[Email]) -> list[VerificationCode | None]:
+        if not emails:
+            return []
+        values = await self._client.mget([self._key(email) for email in emails])
+        return [
+            None if value is None else VerificationCode(str(value)) for value in values
+        ]
+
     async def delete(self, email: Email) -> None:
         await self._client.delete(self._key(email))
+
+    async def cooldown_remaining(self, email: Email) -> float:
+        if self._cooldown_ms <= 0:
+            return 0.0
+        # PTTL is -2 without the key
+        remaining_ms = await self._client.pttl(f"{_COOLDOWN_KEY_PREFIX}{email}")
+        return max(int(remaining_ms), 0) / 1000
+
+    async def start_cooldown(self, email: Email) -> float:
+        if self._cooldown_ms <= 0:
+            return 0.0
+        remaining_ms = await self._start_cooldown(
+            keys=[f"{_COOLDOWN_KEY_PREFIX}{email}"], args=[self._cooldown_ms]
+        )
+        # PTTL is negative if the key expired between SET and PTTL
+        return max(int(remaining_ms), 0) / 1000
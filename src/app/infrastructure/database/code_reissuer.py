@@ -0,0 +1,168 @@
+"""Bulk re-issue of verification codes to inactive users"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+import asyncpg
+
+from app.application.ports.code_store import CodeStore
+from app.application.ports.event_publisher import EventPublisher
+from app.domain import (
+    DomainEvent,
+    Email,
+    UserId,
+    UserNewVerificationCodeCreated,
+    VerificationCode,
+)
+
+logger = logging.getLogger(__name__)
+
+# Any constant shared by all instances, it names the lock
+REISSUE_LOCK_KEY = 0x7265_6973_7375_6573
+
+# Walks idx_users_inactive_created_at, the partial index on inactive users
+_SELECT_BATCH_QUERY = """
+SELECT id, email, created_at FROM users
+WHERE NOT is_active AND created_at >= $1 AND (created_at, id) > ($2, $3)
+ORDER BY created_at, id
+LIMIT $4
+"""
+
+
+@dataclass(slots=True)
+class ReissueReport:
+    reissued: int = 0
+    skipped_unexpired: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+    paused_seconds: float = 0.0
+    skipped: bool = False
+
+
+class PostgresCodeReissuer:
+    """
+    Sends a new verification code to every user still inactive who
+    registered since a given time, typically after the mailer or RabbitMQ was down long
+    enough for their codes to expire.
+
+    Users are read in batches of `batch_size`, paginated on (created_at, id).
+    The codes of a batch are saved in one code store round trip, then its
+    UserNewVerificationCodeCreated events are published together. Batches
+    are paced to at most `rate_per_second` events, so that the consumer is
+    not swamped. Users whose code has not expired yet are skipped, unless
+    `skip_unexpired` is False. One instance at a time walks a database: a
+    run is skipped unless it takes a Postgres advisory lock.
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        code_store: CodeStore,
+        event_publisher: EventPublisher,
+        *,
+        batch_size: int = 1000,
+        rate_per_second: float = 200.0,
+        skip_unexpired: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._pool = pool
+        self._code_store = code_store
+        self._event_publisher = event_publisher
+        self._batch_size = batch_size
+        self._rate_per_second = rate_per_second
+        self._skip_unexpired = skip_unexpired
+        self._clock = clock
+        self._sleep = sleep
+
+    async def reissue(self, since: datetime) -> ReissueReport:
+        report = ReissueReport()
+        start = self._clock()
+        async with self._pool.acquire() as connection:
+            # Session lock, released by the finally below or the connection end
+            if not await connection.fetchval(
+                "SELECT pg_try_advisory_lock($1)", REISSUE_LOCK_KEY
+            ):
+                report.skipped = True
+                return report
+            try:
+                await self._reissue_batches(connection, since, report, start)
+            finally:
+                await connection.execute(
+                    "SELECT pg_advisory_unlock($1)", REISSUE_LOCK_KEY
+                )
+
+        report.elapsed_seconds = self._clock() - start
+        logger.info(
+            "Reissued %d verification codes in %d batches, %.1fs, %d unexpired skipped",
+            report.reissued,
+            report.batches,
+            report.elapsed_seconds,
+            report.skipped_unexpired,
+        )
+        return report
+
+    async def _reissue_batches(
+        self,
+        connection: asyncpg.Connection,
+        since: datetime,
+        report: ReissueReport,
+        start: float,
+    ) -> None:
+        after: tuple[datetime, uuid.UUID] = (
+            datetime.min.replace(tzinfo=UTC),
+            uuid.UUID(int=0),
+        )
+        while True:
+            rows = await connection.fetch(
+                _SELECT_BATCH_QUERY, since, *after, self._batch_size
+            )
+            if not rows:
+                return
+
+            await self._reissue_batch(rows, report)
+            report.batches += 1
+            logger.info(
+                "Reissue batch %d: %d users, %d codes so far",
+                report.batches,
+                len(rows),
+                report.reissued,
+            )
+
+            if len(rows) < self._batch_size:
+                return
+            after = (rows[-1]["created_at"], rows[-1]["id"])
+            # Sent so far at rate_per_second would end at `due`
+            due = start + report.reissued / self._rate_per_second
+            pause = due - self._clock()
+            if pause > 0:
+                report.paused_seconds += pause
+                await self._sleep(pause)
+
+    async def _reissue_batch(
+        self, rows: list[asyncpg.Record], report: ReissueReport
+    ) -> None:
+        users = [(UserId(row["id"]), Email(row["email"])) for row in rows]
+        if self._skip_unexpired:
+            codes = await self._code_store.get_many([email for _, email in users])
+            report.skipped_unexpired += sum(code is not None for code in codes)
+            users = [
+                user for user, code in zip(users, codes, strict=True) if code is None
+            ]
+        if not users:
+            return
+
+        await self._code_store.save_many(
+            {email: VerificationCode.generate() for _, email in users}
+        )
+        events: list[DomainEvent] = [
+            UserNewVerificationCodeCreated(user_id=user_id, email=email)
+            for user_id, email in users
+        ]
+        await self._event_publisher.publish_all(events)
+        report.reissued += len(events)
@@ -3,6 +3,12 @@
 from app.domain import Email, Password, User, UserId
 from app.infrastructure.database.models.user_model import UserModel
 
+# Column of each User field whose changes are tracked
+FIELD_COLUMNS = {
+    "password": "hashed_password",
+    "is_active": "is_active",
+}
+
 
 class UserMapper:
     """Maps between User domain entity and UserModel database model."""
@@ -16,6 +22,7 @@ class UserMapper:
             password=Password.from_hash(model.hashed_password),
             is_active=model.is_active,
             created_at=model.created_at,
+            version=model.version,
         )
 
     @staticmethod
@@ -27,4 +34,14 @@ class UserMapper:
             hashed_password=entity.password.hashed_value,
             is_active=entity.is_active,
             created_at=entity.created_at,
+            version=entity.version,
         )
+
+    @staticmethod
+    def to_changed_columns(entity: User) -> dict[str, object]:
+        """Convert the changed fields of domain entity to column values."""
+        model = UserMapper.to_model(entity).model_dump()
+        return {
+            FIELD_COLUMNS[name]: model[FIELD_COLUMNS[name]]
+            for name in sorted(entity.changes)
+        }
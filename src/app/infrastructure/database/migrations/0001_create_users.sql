@@ -1,7 +1,5 @@
--- DROP TABLE IF EXISTS users CASCADE;
-DROP SCHEMA public CASCADE;
-CREATE SCHEMA public;
-
+-- Baseline: the users table as scripts/init_db.sql first created it, less
+-- the redundant email index dropped by 0002
 CREATE TABLE IF NOT EXISTS users (
     id UUID PRIMARY KEY,
     email VARCHAR(255) NOT NULL UNIQUE,
@@ -9,5 +7,3 @@ CREATE TABLE IF NOT EXISTS users (
     is_active BOOLEAN NOT NULL DEFAULT FALSE,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
-
-CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
@@ -0,0 +1,4 @@
+-- migrate: no-transaction
+-- users_email_key, behind the UNIQUE constraint, already indexes email:
+-- idx_users_email only doubled the index writes of every insert
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_email;
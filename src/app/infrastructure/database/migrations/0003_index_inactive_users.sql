@@ -0,0 +1,6 @@
+-- migrate: no-transaction
+-- Inactive users by age, walked by the purge job. A failed concurrent build
+-- leaves an invalid index behind, dropped first when retried.
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_inactive_created_at;
+CREATE INDEX CONCURRENTLY idx_users_inactive_created_at
+    ON users (created_at, id) WHERE NOT is_active;
@@ -0,0 +1,82 @@
+-- Monthly partitions of users, and user_emails to keep emails unique across
+-- them. Not online: users stays locked while user_emails is backfilled.
+ALTER TABLE users RENAME TO users_legacy;
+ALTER INDEX users_pkey RENAME TO users_legacy_pkey;
+ALTER INDEX idx_users_inactive_created_at
+    RENAME TO idx_users_legacy_inactive_created_at;
+
+-- A primary key on a partitioned table must include the partition key, so
+-- it cannot make email unique
+CREATE TABLE users (
+    id UUID NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    hashed_password VARCHAR(255) NOT NULL,
+    is_active BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE INDEX idx_users_inactive_created_at
+    ON users (created_at, id) WHERE NOT is_active;
+
+-- One row per user, unpartitioned: enforces email uniqueness across all
+-- partitions and leads a lookup by email to the partition of its user
+CREATE TABLE user_emails (
+    email VARCHAR(255) PRIMARY KEY,
+    user_id UUID NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL
+);
+
+INSERT INTO user_emails (email, user_id, created_at)
+SELECT email, id, created_at FROM users_legacy;
+
+-- Create the monthly partitions from months_back months ago to
+-- months_ahead months ahead that do not exist yet, skipping the months
+-- users_legacy covers. Safe to call concurrently, run periodically by the
+-- application.
+CREATE OR REPLACE FUNCTION ensure_users_partitions(
+    months_ahead INTEGER,
+    months_back INTEGER DEFAULT 0
+) RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE;
+    created INTEGER := 0;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_users_partitions'));
+    FOR offset_months IN -months_back..months_ahead LOOP
+        month_start := date_trunc('month', now())::DATE
+            + make_interval(months => offset_months);
+        IF to_regclass(format('users_p%s', to_char(month_start, 'YYYY_MM'))) IS NULL THEN
+            BEGIN
+                EXECUTE format(
+                    'CREATE TABLE users_p%s PARTITION OF users FOR VALUES FROM (%L) TO (%L)',
+                    to_char(month_start, 'YYYY_MM'),
+                    month_start,
+                    month_start + INTERVAL '1 month'
+                );
+                created := created + 1;
+            EXCEPTION WHEN invalid_object_definition THEN
+                -- Overlaps users_legacy
+                NULL;
+            END;
+        END IF;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Existing rows stay where they are, as the partition of everything up to
+-- the end of this month
+DO $$
+BEGIN
+    IF EXISTS (SELECT FROM users_legacy) THEN
+        EXECUTE format(
+            'ALTER TABLE users ATTACH PARTITION users_legacy FOR VALUES FROM (MINVALUE) TO (%L)',
+            date_trunc('month', now()) + INTERVAL '1 month'
+        );
+    ELSE
+        DROP TABLE users_legacy;
+    END IF;
+END $$;
+
+SELECT ensure_users_partitions(3);
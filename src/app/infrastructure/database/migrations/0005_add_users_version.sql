@@ -0,0 +1,3 @@
+-- Version of each user row, compared and incremented by every update. A
+-- constant default is only recorded in the catalog, no row is rewritten.
+ALTER TABLE users ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
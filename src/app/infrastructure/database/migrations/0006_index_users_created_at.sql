@@ -0,0 +1,25 @@
+-- migrate: no-transaction
+-- migrate: for-each-partition users
+-- Every user by age, the keyset order of the admin listing. Built online:
+-- the index of users is created ON ONLY the parent, invalid and empty, then
+-- the index of each partition concurrently and attached to it, which makes
+-- it valid once every partition has one. Partitions created meanwhile or
+-- later get theirs with the table, under the same default name. A failed
+-- concurrent build leaves an invalid index behind, dropped first when
+-- retried, the attached ones are valid and kept.
+CREATE INDEX IF NOT EXISTS idx_users_created_at ON ONLY users (created_at, id);
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT FROM pg_index
+        WHERE indexrelid = to_regclass('{partition}_created_at_id_idx')
+            AND NOT indisvalid
+    ) THEN
+        DROP INDEX {partition}_created_at_id_idx;
+    END IF;
+END
+$$;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition}_created_at_id_idx
+    ON {partition} (created_at, id);
+ALTER INDEX idx_users_created_at
+    ATTACH PARTITION {partition}_created_at_id_idx;
@@ -0,0 +1,8 @@
+-- migrate: no-transaction
+-- Email prefix search of the admin listing: LIKE 'prefix%' only uses a
+-- btree index of pattern ops, unless the database collation is C. A failed
+-- concurrent build leaves an invalid index behind, dropped first when
+-- retried.
+DROP INDEX CONCURRENTLY IF EXISTS idx_user_emails_email_pattern;
+CREATE INDEX CONCURRENTLY idx_user_emails_email_pattern
+    ON user_emails (email text_pattern_ops);
@@ -0,0 +1,190 @@
+"""Versioned schema migrations"""
+
+import logging
+import re
+from dataclasses import dataclass
+from importlib import resources
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PACKAGE = "app.infrastructure.database.migrations"
+
+# Any constant shared by all instances, it names the lock
+MIGRATION_LOCK_KEY = 0x6D69_6772_6174_6573
+
+# First line of a migration that must run outside a transaction, such as
+# CREATE INDEX CONCURRENTLY
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+
+# Line of a no-transaction migration whose statements holding {partition}
+# run once per partition of the table, as found when it is applied: an
+# index of a partitioned table is only built online one partition at a time
+_FOR_EACH_PARTITION_MARKER = re.compile(
+    r"^-- migrate: for-each-partition (\w+)$", re.MULTILINE
+)
+PARTITION_PLACEHOLDER = "{partition}"
+
+_PARTITIONS_QUERY = """
+SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = $1::regclass
+ORDER BY c.relname
+"""
+
+_MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+_CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+)
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+    @property
+    def transactional(self) -> bool:
+        return not self.sql.startswith(NO_TRANSACTION_MARKER)
+
+    @property
+    def partitioned_table(self) -> str | None:
+        match = _FOR_EACH_PARTITION_MARKER.search(self.sql)
+        return match.group(1) if match else None
+
+    def statements(self) -> list[str]:
+        """
+        Statements of the migration, comments left out, split on `;` outside
+        of $$-quoted bodies.
+
+        Postgres runs the statements of one query string in a single implicit
+        transaction, so a non-transactional migration sends them one by one.
+        """
+        # Comments may hold a `;` too
+        sql = "\n".join(
+            line for line in self.sql.splitlines() if not line.lstrip().startswith("--")
+        )
+        statements = [""]
+        for index, part in enumerate(sql.split("$$")):
+            if index % 2:
+                statements[-1] += f"$${part}$$"
+                continue
+            first, *others = part.split(";")
+            statements[-1] += first
+            statements.extend(others)
+        return [statement.strip() for statement in statements if statement.strip()]
+
+
+def load_migrations(package: str = MIGRATIONS_PACKAGE) -> list[Migration]:
+    migrations = []
+    for resource in resources.files(package).iterdir():
+        match = _MIGRATION_FILE.match(resource.name)
+        if match is None:
+            continue
+        migrations.append(
+            Migration(
+                version=int(match.group(1)),
+                name=match.group(2),
+                sql=resource.read_text(encoding="utf-8"),
+            )
+        )
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        msg = f"Duplicate migration versions in {package}"
+        raise ValueError(msg)
+    return migrations
+
+
+class PostgresMigrator:
+    """
+    Applies the migrations not yet recorded in `schema_migrations`.
+
+    Migrations run in version order, each recorded once it succeeded. A
+    transactional migration runs with its record in one transaction, the
+    others statement by statement, so they must be safe to run again after
+    a failure halfway. Every statement waits at most `lock_timeout_seconds`
+    for its locks rather than queueing the application's queries behind it.
+
+    One instance at a time migrates a database: the others wait on a
+    Postgres advisory lock, then find nothing left to apply.
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        migrations: list[Migration] | None = None,
+        *,
+        lock_timeout_seconds: float = 5.0,
+    ) -> None:
+        self._pool = pool
+        self._migrations = load_migrations() if migrations is None else migrations
+        self._lock_timeout_ms = int(lock_timeout_seconds * 1000)
+
+    async def pending(self) -> list[Migration]:
+        async with self._pool.acquire() as connection:
+            await connection.execute(_CREATE_TABLE_QUERY)
+            return await self._pending(connection)
+
+    async def migrate(self) -> list[Migration]:
+        async with self._pool.acquire() as connection:
+            # Session lock, released by the finally below or the connection end
+            await connection.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_KEY)
+            try:
+                await connection.execute(_CREATE_TABLE_QUERY)
+                pending = await self._pending(connection)
+                await connection.execute(f"SET lock_timeout = {self._lock_timeout_ms}")
+                for migration in pending:
+                    logger.info(
+                        "Applying migration %04d_%s", migration.version, migration.name
+                    )
+                    await self._apply(connection, migration)
+            finally:
+                await connection.execute("RESET lock_timeout")
+                await connection.execute(
+                    "SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY
+                )
+        return pending
+
+    async def _pending(self, connection: asyncpg.Connection) -> list[Migration]:
+        rows = await connection.fetch("SELECT version FROM schema_migrations")
+        applied = {row["version"] for row in rows}
+        return [
+            migration
+            for migration in self._migrations
+            if migration.version not in applied
+        ]
+
+    @staticmethod
+    async def _apply(connection: asyncpg.Connection, migration: Migration) -> None:
+        record = (
+            "INSERT INTO schema_migrations (version, name) VALUES ($1, $2)",
+            migration.version,
+            migration.name,
+        )
+        if migration.transactional:
+            async with connection.transaction():
+                await connection.execute(migration.sql)
+                await connection.execute(*record)
+            return
+        partitions = []
+        if migration.partitioned_table is not None:
+            rows = await connection.fetch(
+                _PARTITIONS_QUERY, migration.partitioned_table
+            )
+            partitions = [row["relname"] for row in rows]
+        for statement in migration.statements():
+            if PARTITION_PLACEHOLDER not in statement:
+                await connection.execute(statement)
+                continue
+            for partition in partitions:
+                await connection.execute(
+                    statement.replace(PARTITION_PLACEHOLDER, partition)
+                )
+        await connection.execute(*record)
@@ -12,3 +12,4 @@ class UserModel(BaseModel):
     hashed_password: str
     is_active: bool
     created_at: datetime
+    version: int = 0
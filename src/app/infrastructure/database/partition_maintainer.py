@@ -0,0 +1,54 @@
+"""Creation of upcoming users table partitions"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresPartitionMaintainer:
+    """
+    Keeps `months_ahead` monthly partitions of users ready in advance.
+
+    Calls ensure_users_partitions() of migration 0004, which serializes
+    concurrent callers on an advisory lock and only creates the missing
+    partitions, so every instance may run it.
+    """
+
+    def __init__(self, pool: asyncpg.Pool, months_ahead: int = 3) -> None:
+        self._pool = pool
+        self._months_ahead = months_ahead
+
+    async def ensure_partitions(self) -> int:
+        created = await self._pool.fetchval(
+            "SELECT ensure_users_partitions($1)", self._months_ahead
+        )
+        if created:
+            logger.info("Created %d users partitions", created)
+        return created
+
+    async def ensure_partitions_since(self, oldest: datetime) -> int:
+        """Also create the partitions back to the month of `oldest`."""
+        now = datetime.now(UTC)
+        oldest = oldest.astimezone(UTC)
+        # One spare month, the server may not be in UTC
+        months_back = (
+            max((now.year - oldest.year) * 12 + now.month - oldest.month, 0) + 1
+        )
+        created = await self._pool.fetchval(
+            "SELECT ensure_users_partitions($1, $2)", self._months_ahead, months_back
+        )
+        if created:
+            logger.info("Created %d users partitions", created)
+        return created
+
+    async def run(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.ensure_partitions()
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                logger.exception("Users partition maintenance failed")
+            await asyncio.sleep(interval_seconds)
@@ -6,19 +6,35 @@ from typing import TYPE_CHECKING, Self
 from asyncpg import Connection, Pool
 
 from app.application.ports.unit_of_work import UnitOfWork
+from app.infrastructure.database.replica_set import ReplicaSet
 from app.infrastructure.database.repositories.postgres_user_repository import (
     PostgresUserRepository,
 )
+from app.infrastructure.database.user_loader import PostgresUserLoader
 
 if TYPE_CHECKING:
     from asyncpg.transaction import Transaction
 
 
 class PostgresUnitOfWork(UnitOfWork):
-    """Postgres UnitOfWork implementation"""
+    """
+    Postgres UnitOfWork implementation
 
-    def __init__(self, pool: Pool) -> None:
+    The connection is acquired and the transaction started on the first
+    query that needs them, so a unit of work that only reads through the
+    loader or the replicas, or fails before writing, never takes a pooled
+    primary connection.
+    """
+
+    def __init__(
+        self,
+        pool: Pool,
+        loader: PostgresUserLoader | None = None,
+        replicas: ReplicaSet | None = None,
+    ) -> None:
         self._pool = pool
+        self._loader = loader
+        self._replicas = replicas
         self._connection: Connection | None = None
         self._transaction: Transaction | None = None
         self._user_repository: PostgresUserRepository | None = None
@@ -31,12 +47,24 @@ class PostgresUnitOfWork(UnitOfWork):
         return self._user_repository
 
     async def __aenter__(self) -> Self:
-        self._connection = await self._pool.acquire()
-        self._transaction = self._connection.transaction()
-        await self._transaction.start()
-        self._user_repository = PostgresUserRepository(self._connection)
+        self._user_repository = PostgresUserRepository(
+            self._get_connection, self._loader, self._replicas
+        )
         return self
 
+    async def _get_connection(self) -> Connection:
+        if self._connection is None:
+            connection = await self._pool.acquire()
+            try:
+                transaction = connection.transaction()
+                await transaction.start()
+            except BaseException:
+                await self._pool.release(connection)
+                raise
+            self._connection = connection
+            self._transaction = transaction
+        return self._connection
+
     async def commit(self) -> None:
         if self._transaction is not None:
             await self._transaction.commit()
@@ -59,6 +87,6 @@ class PostgresUnitOfWork(UnitOfWork):
         finally:
             if self._connection is not None:
                 await self._pool.release(self._connection)
-                self._connection = None
-                self._transaction = None
-                self._user_repository = None
+            self._connection = None
+            self._transaction = None
+            self._user_repository = None
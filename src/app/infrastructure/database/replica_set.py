@@ -0,0 +1,139 @@
+"""Read routing over Postgres streaming replicas"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind its primary, 0 when it has replayed all it
+# received. NULL on a server that is not in recovery, counted as no lag.
+_LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+_CONNECTION_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.CannotConnectNowError,
+    asyncpg.InterfaceError,
+)
+
+
+@dataclass(slots=True)
+class _Replica:
+    pool: asyncpg.Pool
+    in_flight: int = 0
+    lag_seconds: float = 0.0
+    down_until: float = 0.0
+
+
+class ReplicaSet:
+    """
+    Pool-like router sending read-only queries to replicas.
+
+    `acquire()` hands out a connection from the healthy replica with the
+    fewest queries in flight, taking turns between equally loaded ones. A
+    replica is skipped for `retry_seconds` after a connection error, and
+    while `monitor()` measures its replay lag above `max_lag_seconds`. With
+    no usable replica, reads go to the primary.
+
+    Replicas may not have replayed a row written moments ago, callers that
+    need to see it fall back to the primary when a replica returns nothing.
+    """
+
+    def __init__(
+        self,
+        primary: asyncpg.Pool,
+        replicas: Sequence[asyncpg.Pool],
+        *,
+        max_lag_seconds: float = 1.0,
+        retry_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._primary = primary
+        self._replicas = [_Replica(pool) for pool in replicas]
+        self._max_lag_seconds = max_lag_seconds
+        self._retry_seconds = retry_seconds
+        self._clock = clock
+        self._turn = 0
+        self.primary_reads = 0
+        self.replica_reads = 0
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        async with contextlib.AsyncExitStack() as stack:
+            replica = self._pick()
+            connection = None
+            if replica is not None:
+                try:
+                    connection = await stack.enter_async_context(replica.pool.acquire())
+                except _CONNECTION_ERRORS:
+                    logger.warning("Replica unavailable, reading from primary")
+                    self._mark_down(replica)
+                    replica = None
+            if replica is None or connection is None:
+                self.primary_reads += 1
+                yield await stack.enter_async_context(self._primary.acquire())
+                return
+
+            self.replica_reads += 1
+            replica.in_flight += 1
+            try:
+                yield connection
+            except _CONNECTION_ERRORS:
+                self._mark_down(replica)
+                raise
+            finally:
+                replica.in_flight -= 1
+
+    async def fetchrow(self, query: str, *args: Any) -> asyncpg.Record | None:
+        async with self.acquire() as connection:
+            return await connection.fetchrow(query, *args)
+
+    async def check_lag(self) -> None:
+        for replica in self._replicas:
+            try:
+                async with replica.pool.acquire() as connection:
+                    replica.lag_seconds = float(await connection.fetchval(_LAG_QUERY))
+            except _CONNECTION_ERRORS:
+                self._mark_down(replica)
+
+    async def monitor(self, interval_seconds: float) -> None:
+        while True:
+            # Any error is only logged: a dead monitor would freeze the lags
+            try:
+                await self.check_lag()
+            except Exception:
+                logger.exception("Replica lag check failed")
+            await asyncio.sleep(interval_seconds)
+
+    def _pick(self) -> _Replica | None:
+        now = self._clock()
+        healthy = [
+            replica
+            for replica in self._replicas
+            if replica.down_until <= now
+            and replica.lag_seconds <= self._max_lag_seconds
+        ]
+        if not healthy:
+            return None
+        # Rotate the starting point so that ties do not all go to the first
+        start = self._turn % len(healthy)
+        self._turn += 1
+        healthy = healthy[start:] + healthy[:start]
+        return min(healthy, key=lambda replica: replica.in_flight)
+
+    def _mark_down(self, replica: _Replica) -> None:
+        replica.down_until = self._clock() + self._retry_seconds
@@ -1,48 +1,267 @@
 """postgres user repository implementation"""
 
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from datetime import datetime
+from uuid import UUID
+
 import asyncpg
 
+from app.application.exceptions import ConcurrentUpdateError, UserAlreadyExistsError
+from app.application.ports.user_exporter import export_columns
+from app.application.ports.user_lister import FIRST_PAGE
 from app.domain import Email, User, UserId
 from app.infrastructure.database.mappers.user_mapper import UserMapper
 from app.infrastructure.database.models.user_model import UserModel
+from app.infrastructure.database.replica_set import ReplicaSet
+from app.infrastructure.database.user_loader import PostgresUserLoader
+
+type ConnectionProvider = Callable[[], Awaitable[asyncpg.Connection]]
+
+_IMPORT_COLUMNS = ("id", "email", "hashed_password", "is_active", "created_at")
+
+# Users of the import table whose email is claimed, the others are skipped.
+# ON CONFLICT DO NOTHING also skips the repeats of an email in the import.
+_ADD_IMPORTED_QUERY = """
+WITH claimed AS (
+    INSERT INTO user_emails (email, user_id, created_at)
+    SELECT email, id, created_at FROM users_import
+    ON CONFLICT (email) DO NOTHING
+    RETURNING user_id
+)
+INSERT INTO users (id, email, hashed_password, is_active, created_at, version)
+SELECT id, email, hashed_password, is_active, created_at, 1
+FROM users_import
+WHERE id IN (SELECT user_id FROM claimed)
+RETURNING id
+"""
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 class PostgresUserRepository:
-    """postgres user repository implementation"""
+    """
+    postgres user repository implementation
+
+    The unit of work connection is only asked for when a query needs it.
+    With a `loader`, lookups are batched with those of concurrent requests
+    and do not need that connection at all. With `replicas`, lookups go to a
+    replica, and back to the primary when the replica has no such row yet.
+    Once this repository has saved a user, lookups stay on the transaction
+    connection so that they see that write.
+
+    users is partitioned by created_at, so emails are kept unique by the
+    unpartitioned user_emails table, which also gives the partition key of
+    the user to look up. Lookups by id probe every partition.
 
-    def __init__(self, connection: asyncpg.Connection) -> None:
-        self._conn: asyncpg.Connection = connection
+    A saved user is only updated in the columns it changed, and only if its
+    version is still the one it was read with.
+    """
+
+    def __init__(
+        self,
+        connection: ConnectionProvider,
+        loader: PostgresUserLoader | None = None,
+        replicas: ReplicaSet | None = None,
+    ) -> None:
+        self._connection = connection
+        self._loader = loader
+        self._replicas = replicas
+        self._saved = False
 
     async def get_by_id(self, user_id: UserId) -> User | None:
-        if row := await self._conn.fetchrow(
+        row = await self._fetch_row(
             """
             SELECT * FROM users WHERE id = $1
             """,
             user_id.value,
-        ):
+            self._loader.load_by_id if self._loader is not None else None,
+        )
+        if row:
             return self._row_to_entity(row)
         return None
 
     async def get_by_email(self, email: Email) -> User | None:
-        if row := await self._conn.fetchrow(
+        row = await self._fetch_row(
             """
-            SELECT * FROM users WHERE email = $1
+            SELECT users.* FROM user_emails
+            JOIN users ON users.id = user_emails.user_id
+                AND users.created_at = user_emails.created_at
+            WHERE user_emails.email = $1
             """,
             email.value,
-        ):
+            self._loader.load_by_email if self._loader is not None else None,
+        )
+        if row:
             return self._row_to_entity(row)
         return None
 
     async def save(self, user: User) -> None:
+        if user.version == 0:
+            await self._insert(user)
+        elif user.changes:
+            await self._update(user)
+        else:
+            return
+        user.mark_saved()
+
+    async def add_many(self, users: Sequence[User]) -> list[User]:
+        if not users:
+            return []
+        conn = await self._connection()
+        self._saved = True
+        # COPY cannot skip conflicting rows, so it fills a temporary table,
+        # written without WAL, that a single INSERT ... SELECT then moves
+        await conn.execute(
+            """
+            CREATE TEMPORARY TABLE users_import (
+                id UUID NOT NULL,
+                email VARCHAR(255) NOT NULL,
+                hashed_password VARCHAR(255) NOT NULL,
+                is_active BOOLEAN NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+        await conn.copy_records_to_table(
+            "users_import",
+            records=[
+                (
+                    user.id.value,
+                    user.email.value,
+                    user.password.hashed_value,
+                    user.is_active,
+                    user.created_at,
+                )
+                for user in users
+            ],
+            columns=_IMPORT_COLUMNS,
+        )
+        rows = await conn.fetch(_ADD_IMPORTED_QUERY)
+        await conn.execute("DROP TABLE users_import")
+
+        added_ids = {row["id"] for row in rows}
+        added = [user for user in users if user.id.value in added_ids]
+        for user in added:
+            user.mark_saved()
+        return added
+
+    async def list_page(
+        self,
+        limit: int,
+        after: tuple[datetime, UUID] = FIRST_PAGE,
+        *,
+        is_active: bool | None = None,
+        email_prefix: str | None = None,
+    ) -> list[User]:
+        """
+        The first `limit` users after `after`, in (created_at, id) order.
+
+        Each page seeks straight to its cursor on idx_users_created_at, or
+        idx_users_inactive_created_at for inactive users, so a deep page
+        costs what the first does. With `email_prefix`, matching emails are
+        found on idx_user_emails_email_pattern first, then sorted: the cost of
+        a page grows with the number of matches, not with its depth.
+        """
+        args: list[object] = [*after]
+        if email_prefix is None:
+            table = "users"
+            conditions = ["(users.created_at, users.id) > ($1, $2)"]
+        else:
+            table = """user_emails
+            JOIN users ON users.id = user_emails.user_id
+                AND users.created_at = user_emails.created_at"""
+            # Seek and filter on user_emails, before the join
+            conditions = [
+                "(user_emails.created_at, user_emails.user_id) > ($1, $2)",
+                "user_emails.email LIKE $3",
+            ]
+            args.append(escape_like(email_prefix.lower()) + "%")
+        # Spelled out, so that NOT is_active matches the partial index
+        if is_active is not None:
+            conditions.append("users.is_active" if is_active else "NOT users.is_active")
+        args.append(limit)
+        query = f"""
+            SELECT users.* FROM {table}
+            WHERE {" AND ".join(conditions)}
+            ORDER BY users.created_at, users.id
+            LIMIT ${len(args)}
+            """  # noqa: S608 fixed conditions, values are parameters
+        if self._replicas is not None and not self._saved:
+            async with self._replicas.acquire() as conn:
+                rows = await conn.fetch(query, *args)
+        else:
+            conn = await self._connection()
+            rows = await conn.fetch(query, *args)
+        return [self._row_to_entity(row) for row in rows]
+
+    async def export(
+        self, batch_size: int = 10_000, *, with_password_hash: bool = False
+    ) -> AsyncIterator[list[asyncpg.Record]]:
+        """
+        Stream every user, `batch_size` rows at a time.
+
+        Rows come from a server-side cursor, so only one batch is held in
+        memory. With `replicas`, they are read from a replica in one read
+        only snapshot, off the primary.
+        """
+        columns = export_columns(with_password_hash=with_password_hash)
+        query = f"SELECT {', '.join(columns)} FROM users"  # noqa: S608 fixed columns
+        if self._replicas is None:
+            conn = await self._connection()
+            async for rows in self._fetch_batches(conn, query, batch_size):
+                yield rows
+            return
+
+        async with (
+            self._replicas.acquire() as conn,
+            conn.transaction(isolation="repeatable_read", readonly=True),
+        ):
+            async for rows in self._fetch_batches(conn, query, batch_size):
+                yield rows
+
+    @staticmethod
+    async def _fetch_batches(
+        conn: asyncpg.Connection, query: str, batch_size: int
+    ) -> AsyncIterator[list[asyncpg.Record]]:
+        # A cursor needs a transaction, the unit of work one or the replica's
+        cursor = await conn.cursor(query)
+        while rows := await cursor.fetch(batch_size):
+            yield rows
+
+    async def _insert(self, user: User) -> None:
         model = UserMapper.to_model(user)
-        await self._conn.execute(
+        conn = await self._connection()
+        self._saved = True
+        # Claim the email, or read who owns it. No row when a concurrent
+        # transaction claimed it since this statement started.
+        owner = await conn.fetchval(
             """
-            INSERT INTO users (id, email, hashed_password, is_active, created_at)
-            VALUES ($1, $2, $3, $4, $5)
-            ON CONFLICT (id) DO UPDATE SET
-                email = EXCLUDED.email,
-                hashed_password = EXCLUDED.hashed_password,
-                is_active = EXCLUDED.is_active
+            WITH claimed AS (
+                INSERT INTO user_emails (email, user_id, created_at)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (email) DO NOTHING
+                RETURNING user_id
+            )
+            SELECT user_id FROM claimed
+            UNION ALL
+            SELECT user_id FROM user_emails WHERE email = $1
+            LIMIT 1
+            """,
+            model.email,
+            model.id,
+            model.created_at,
+        )
+        if owner != model.id:
+            raise UserAlreadyExistsError(model.email)
+
+        await conn.execute(
+            """
+            INSERT INTO users (
+                id, email, hashed_password, is_active, created_at, version
+            )
+            VALUES ($1, $2, $3, $4, $5, 1)
             """,
             model.id,
             model.email,
@@ -51,5 +270,47 @@ class PostgresUserRepository:
             model.created_at,
         )
 
+    async def _update(self, user: User) -> None:
+        # Only the changed columns: an UPDATE of is_active alone leaves the
+        # other columns' indexes untouched and writes less WAL
+        columns = UserMapper.to_changed_columns(user)
+        assignments = "".join(
+            f"{column} = ${index}, " for index, column in enumerate(columns, 4)
+        )
+        conn = await self._connection()
+        self._saved = True
+        status = await conn.execute(
+            f"""
+            UPDATE users SET {assignments}version = version + 1
+            WHERE id = $1 AND created_at = $2 AND version = $3
+            """,  # noqa: S608 columns come from UserMapper
+            user.id.value,
+            user.created_at,
+            user.version,
+            *columns.values(),
+        )
+        if status == "UPDATE 0":
+            raise ConcurrentUpdateError(user.email.value)
+
+    async def _fetch_row[KeyT: (str, UUID)](
+        self,
+        query: str,
+        key: KeyT,
+        load: Callable[[KeyT], Awaitable[asyncpg.Record | None]] | None,
+    ) -> asyncpg.Record | None:
+        if not self._saved:
+            if load is not None:
+                row = await load(key)
+            elif self._replicas is not None:
+                row = await self._replicas.fetchrow(query, key)
+            else:
+                row = None
+            # A replica may not have replayed a row saved moments ago, such
+            # as a registration followed by its activation
+            if row is not None or (load is not None and self._replicas is None):
+                return row
+        conn = await self._connection()
+        return await conn.fetchrow(query, key)
+
     def _row_to_entity(self, row: asyncpg.Record) -> User:
         return UserMapper.to_entity(UserModel.model_validate(dict(row)))
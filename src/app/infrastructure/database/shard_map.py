@@ -0,0 +1,55 @@
+"""Email to shard mapping through virtual buckets"""
+
+import bisect
+import hashlib
+from collections.abc import Mapping
+
+
+class ShardMap:
+    """
+    Maps a normalized email to one of `shard_count` shards.
+
+    The email hash picks one of `bucket_count` virtual buckets, a stable
+    choice that never depends on the number of shards. Buckets are owned by
+    shards in contiguous ranges, given as `ranges`: the first bucket of
+    each range mapped to its shard, e.g. `{0: 0, 512: 1}`. Without ranges,
+    buckets are split evenly.
+
+    Adding a shard is then a matter of splitting a range and moving the
+    rows of the buckets that changed owner, the rest stay where they are.
+    """
+
+    def __init__(
+        self,
+        shard_count: int,
+        *,
+        bucket_count: int = 1024,
+        ranges: Mapping[int, int] | None = None,
+    ) -> None:
+        if shard_count < 1 or bucket_count < shard_count:
+            msg = "Need at least one shard and one bucket per shard"
+            raise ValueError(msg)
+        if not ranges:
+            ranges = {
+                shard * bucket_count // shard_count: shard
+                for shard in range(shard_count)
+            }
+        if min(ranges) != 0 or max(ranges) >= bucket_count:
+            msg = f"Bucket ranges must start at 0 and stay below {bucket_count}"
+            raise ValueError(msg)
+        if not all(0 <= shard < shard_count for shard in ranges.values()):
+            msg = f"Bucket ranges must map to shards below {shard_count}"
+            raise ValueError(msg)
+
+        self.shard_count = shard_count
+        self.bucket_count = bucket_count
+        self._starts = sorted(ranges)
+        self._shards = [ranges[start] for start in self._starts]
+
+    def bucket(self, email: str) -> int:
+        digest = hashlib.blake2b(email.encode(), digest_size=8).digest()
+        return int.from_bytes(digest) % self.bucket_count
+
+    def shard(self, email: str) -> int:
+        index = bisect.bisect_right(self._starts, self.bucket(email)) - 1
+        return self._shards[index]
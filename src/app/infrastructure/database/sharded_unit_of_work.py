@@ -0,0 +1,175 @@
+"""UnitOfWork over users sharded by email"""
+
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from types import TracebackType
+from typing import Self
+
+from app.application.exceptions import PartialCommitError
+from app.application.ports.unit_of_work import UnitOfWork, UnitOfWorkFactory
+from app.domain import Email, User, UserId
+from app.infrastructure.database.shard_map import ShardMap
+
+logger = logging.getLogger(__name__)
+
+
+class ShardedUserRepository:
+    """
+    UserRepository routing each call to the shard owning the email.
+
+    Email uniqueness is enforced by the owning shard's constraint. Lookups by
+    id cannot be routed and scan the shards one after the other.
+    """
+
+    def __init__(
+        self,
+        shard: Callable[[int], Awaitable[UnitOfWork]],
+        shard_map: ShardMap,
+    ) -> None:
+        self._shard = shard
+        self._shard_map = shard_map
+        # Users added per shard, to report those of a partial commit
+        self.added: dict[int, list[User]] = {}
+
+    async def get_by_id(self, user_id: UserId) -> User | None:
+        for index in range(self._shard_map.shard_count):
+            uow = await self._shard(index)
+            if user := await uow.user_repository.get_by_id(user_id):
+                return user
+        return None
+
+    async def get_by_email(self, email: Email) -> User | None:
+        uow = await self._shard(self._shard_map.shard(email.value))
+        return await uow.user_repository.get_by_email(email)
+
+    async def save(self, user: User) -> None:
+        uow = await self._shard(self._shard_map.shard(user.email.value))
+        await uow.user_repository.save(user)
+
+    async def add_many(self, users: Sequence[User]) -> list[User]:
+        by_shard: dict[int, list[User]] = {}
+        for user in users:
+            by_shard.setdefault(self._shard_map.shard(user.email.value), []).append(
+                user
+            )
+        added = []
+        for index, shard_users in by_shard.items():
+            uow = await self._shard(index)
+            shard_added = await uow.user_repository.add_many(shard_users)
+            self.added.setdefault(index, []).extend(shard_added)
+            added.extend(shard_added)
+        return added
+
+
+class ShardedUnitOfWork:
+    """
+    UnitOfWork spreading users over one database per shard.
+
+    A unit of work is opened on a shard the first time a call is routed to
+    it, and all of them are committed or rolled back on exit. Each use case
+    handles a single email, so in practice only one shard is involved and
+    no cross-shard transaction is needed.
+
+    Batches (add_many) may span shards, which are committed one after the
+    other, without two-phase commit. If a commit fails, the shards not
+    committed yet are rolled back and PartialCommitError names those
+    already committed, unless none was, with the users added there. Those
+    users are saved, a retry of the batch skips them as already registered.
+    """
+
+    def __init__(
+        self, shards: Sequence[UnitOfWorkFactory], shard_map: ShardMap
+    ) -> None:
+        if len(shards) != shard_map.shard_count:
+            msg = f"Expected {shard_map.shard_count} shards, got {len(shards)}"
+            raise ValueError(msg)
+        self._shards = shards
+        self._shard_map = shard_map
+        self._entered: dict[int, UnitOfWork] = {}
+        self._user_repository: ShardedUserRepository | None = None
+
+    @property
+    def user_repository(self) -> ShardedUserRepository:
+        if self._user_repository is None:
+            msg = "UnitOfWork not entered. Use 'async with' context manager."
+            raise RuntimeError(msg)
+        return self._user_repository
+
+    async def __aenter__(self) -> Self:
+        self._user_repository = ShardedUserRepository(self._shard, self._shard_map)
+        return self
+
+    async def _shard(self, index: int) -> UnitOfWork:
+        if index not in self._entered:
+            if self._user_repository is None:
+                msg = "UnitOfWork not entered. Use 'async with' context manager."
+                raise RuntimeError(msg)
+            uow = self._shards[index]()
+            self._entered[index] = await uow.__aenter__()
+        return self._entered[index]
+
+    async def commit(self) -> None:
+        for uow in self._entered.values():
+            await uow.commit()
+
+    async def rollback(self) -> None:
+        for uow in self._entered.values():
+            await uow.rollback()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        try:
+            if exc_type is None:
+                await self._commit_shards()
+            else:
+                await self._rollback_shards(list(self._entered.values()), exc_val)
+        finally:
+            self._entered = {}
+            self._user_repository = None
+
+    async def _commit_shards(self) -> None:
+        """Commit the shards in turn, rolling back the rest if one fails."""
+        shards = list(self._entered.items())
+        committed: list[int] = []
+        for position, (index, uow) in enumerate(shards):
+            try:
+                await uow.__aexit__(None, None, None)
+            except Exception as exc:
+                await self._rollback_shards(
+                    [rest for _, rest in shards[position + 1 :]], exc
+                )
+                if not committed:
+                    raise
+                logger.exception(
+                    "Partial commit: shards %s committed, shard %d failed",
+                    committed,
+                    index,
+                )
+                raise PartialCommitError(
+                    committed, index, self._added_on(committed)
+                ) from exc
+            committed.append(index)
+
+    def _added_on(self, shards: list[int]) -> list[UserId]:
+        if self._user_repository is None:
+            return []
+        added = self._user_repository.added
+        return [user.id for index in shards for user in added.get(index, [])]
+
+    @staticmethod
+    async def _rollback_shards(
+        shards: list[UnitOfWork], exc: BaseException | None
+    ) -> None:
+        exc_type = type(exc) if exc is not None else None
+        tb = exc.__traceback__ if exc is not None else None
+        for uow in shards:
+            # The first error is the one raised, a shard failing to roll
+            # back is logged and its transaction ends with its connection
+            try:
+                await uow.__aexit__(exc_type, exc, tb)
+            except Exception:
+                logger.exception("Shard rollback failed")
@@ -0,0 +1,30 @@
+"""Export of the users of every shard"""
+
+from collections.abc import AsyncIterator, Sequence
+
+import asyncpg
+
+from app.infrastructure.database.postgres_unit_of_work import PostgresUnitOfWork
+from app.infrastructure.database.replica_set import ReplicaSet
+
+
+async def export_users(
+    pools: Sequence[asyncpg.Pool],
+    *,
+    batch_size: int = 10_000,
+    with_password_hash: bool = False,
+    replicas: ReplicaSet | None = None,
+) -> AsyncIterator[list[asyncpg.Record]]:
+    """
+    Stream the users of every shard in `pools`, one shard after the other.
+
+    `replicas` are those of the first pool, DATABASE_URL.
+    """
+    for index, pool in enumerate(pools):
+        async with PostgresUnitOfWork(
+            pool, replicas=replicas if index == 0 else None
+        ) as uow:
+            async for rows in uow.user_repository.export(
+                batch_size, with_password_hash=with_password_hash
+            ):
+                yield rows
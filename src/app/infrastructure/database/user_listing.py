@@ -0,0 +1,50 @@
+"""Keyset-paginated listing of the users of every shard"""
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import Sequence
+from datetime import datetime
+from uuid import UUID
+
+import asyncpg
+
+from app.application.ports.user_lister import FIRST_PAGE
+from app.domain import User
+from app.infrastructure.database.postgres_unit_of_work import PostgresUnitOfWork
+from app.infrastructure.database.replica_set import ReplicaSet
+
+
+async def list_users(
+    pools: Sequence[asyncpg.Pool],
+    limit: int,
+    after: tuple[datetime, UUID] = FIRST_PAGE,
+    *,
+    is_active: bool | None = None,
+    email_prefix: str | None = None,
+    replicas: ReplicaSet | None = None,
+) -> list[User]:
+    """
+    The first `limit` users of all shards in `pools` after `after`, in
+    (created_at, id) order.
+
+    Each shard, queried concurrently, returns its own first `limit`, merged
+    into one page. `replicas` are those of the first pool, DATABASE_URL.
+    """
+
+    async def list_page(
+        pool: asyncpg.Pool, shard_replicas: ReplicaSet | None
+    ) -> list[User]:
+        async with PostgresUnitOfWork(pool, replicas=shard_replicas) as uow:
+            return await uow.user_repository.list_page(
+                limit, after, is_active=is_active, email_prefix=email_prefix
+            )
+
+    pages = await asyncio.gather(
+        *(
+            list_page(pool, replicas if index == 0 else None)
+            for index, pool in enumerate(pools)
+        )
+    )
+    merged = heapq.merge(*pages, key=lambda user: (user.created_at, user.id.value))
+    return list(itertools.islice(merged, limit))
@@ -0,0 +1,115 @@
+"""Batched user row loader"""
+
+import asyncio
+from collections.abc import Hashable
+from uuid import UUID
+
+import asyncpg
+
+from app.infrastructure.database.replica_set import ReplicaSet
+
+
+class _Batcher[KeyT: Hashable]:
+    """Collect the keys asked for in one event loop tick, fetch them at once."""
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool | ReplicaSet,
+        query: str,
+        column: str,
+        max_batch_size: int,
+    ) -> None:
+        self._pool = pool
+        self._query = query
+        self._column = column
+        self._max_batch_size = max_batch_size
+        self._waiters: dict[KeyT, list[asyncio.Future[asyncpg.Record | None]]] = {}
+        self._dispatch_scheduled = False
+        self.queries = 0
+
+    async def load(self, key: KeyT) -> asyncpg.Record | None:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[asyncpg.Record | None] = loop.create_future()
+        self._waiters.setdefault(key, []).append(future)
+        if len(self._waiters) >= self._max_batch_size:
+            self._dispatch()
+        elif not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            loop.call_soon(self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        self._dispatch_scheduled = False
+        if not self._waiters:
+            return
+        waiters, self._waiters = self._waiters, {}
+        task = asyncio.create_task(self._fetch(waiters))
+        # Keep a reference until done, the event loop only holds weak ones
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def _fetch(
+        self, waiters: dict[KeyT, list[asyncio.Future[asyncpg.Record | None]]]
+    ) -> None:
+        try:
+            self.queries += 1
+            async with self._pool.acquire() as connection:
+                rows = await connection.fetch(self._query, list(waiters))
+        except Exception as exc:  # noqa: BLE001 handed over to every caller
+            for futures in waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        rows_by_key = {row[self._column]: row for row in rows}
+        for key, futures in waiters.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(rows_by_key.get(key))
+
+
+_background_tasks: set[asyncio.Task[None]] = set()
+
+
+class PostgresUserLoader:
+    """
+    Dataloader for user rows.
+
+    Lookups issued by concurrent requests in the same event loop tick are
+    gathered into one `= ANY($1)` query on one pooled connection, instead of
+    one query and one connection each. Batches are capped at
+    `max_batch_size` keys. Reads run outside of any unit of work transaction,
+    so they see committed rows only.
+    """
+
+    def __init__(
+        self, pool: asyncpg.Pool | ReplicaSet, max_batch_size: int = 500
+    ) -> None:
+        self._by_email = _Batcher[str](
+            pool,
+            """
+            SELECT users.* FROM user_emails
+            JOIN users ON users.id = user_emails.user_id
+                AND users.created_at = user_emails.created_at
+            WHERE user_emails.email = ANY($1::varchar[])
+            """,
+            "email",
+            max_batch_size,
+        )
+        self._by_id = _Batcher[UUID](
+            pool,
+            "SELECT * FROM users WHERE id = ANY($1::uuid[])",
+            "id",
+            max_batch_size,
+        )
+
+    @property
+    def queries(self) -> int:
+        return self._by_email.queries + self._by_id.queries
+
+    async def load_by_email(self, email: str) -> asyncpg.Record | None:
+        return await self._by_email.load(email)
+
+    async def load_by_id(self, user_id: UUID) -> asyncpg.Record | None:
+        return await self._by_id.load(user_id)
@@ -0,0 +1,174 @@
+"""Background purge of users never activated"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import asyncpg
+
+from app.application.ports.user_cache import UserCache
+from app.domain import Email
+
+logger = logging.getLogger(__name__)
+
+# Any constant shared by all instances, it names the lock
+PURGE_LOCK_KEY = 0x7573_6572_7075_7267
+
+# Walks idx_users_inactive_created_at, the partial index on inactive users
+_SELECT_BATCH_QUERY = """
+SELECT id, created_at FROM users
+WHERE NOT is_active AND created_at < $1 AND (created_at, id) > ($2, $3)
+ORDER BY created_at, id
+LIMIT $4
+"""
+
+# Rechecked: a user activated since the select is kept. The cutoff spares
+# the newer partitions a lookup.
+_DELETE_BATCH_QUERY = """
+WITH deleted AS (
+    DELETE FROM users
+    WHERE id = ANY($1::uuid[]) AND created_at < $2 AND NOT is_active
+    RETURNING email
+)
+DELETE FROM user_emails WHERE email IN (SELECT email FROM deleted)
+RETURNING email
+"""
+
+
+@dataclass(slots=True)
+class PurgeReport:
+    deleted: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+    lock_seconds: float = 0.0
+    max_lock_seconds: float = 0.0
+    skipped: bool = False
+
+
+class PostgresUserPurger:
+    """
+    Deletes users still inactive `max_age_seconds` after they registered.
+
+    Rows are deleted in batches of `batch_size`, each in its own short
+    transaction, paginated on (created_at, id) so that no batch rescans the
+    rows before it, with `pause_seconds` between batches to leave room to
+    the application's writes. One instance at a time purges a database: a
+    run is skipped unless it takes a Postgres advisory lock.
+
+    The emails of each batch are invalidated in `user_cache`, so that no
+    instance keeps serving a deleted user until its entry expires.
+
+    Progress is logged per batch. The report of the last run records how
+    long the delete transactions held their row locks.
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        *,
+        max_age_seconds: float,
+        batch_size: int = 1000,
+        pause_seconds: float = 0.1,
+        user_cache: UserCache | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._pool = pool
+        self._user_cache = user_cache
+        self._max_age = timedelta(seconds=max_age_seconds)
+        self._batch_size = batch_size
+        self._pause_seconds = pause_seconds
+        self._clock = clock
+        self.last_report: PurgeReport | None = None
+
+    async def purge(self) -> PurgeReport:
+        report = PurgeReport()
+        start = self._clock()
+        async with self._pool.acquire() as connection:
+            # Session lock, released by the finally below or the connection end
+            if not await connection.fetchval(
+                "SELECT pg_try_advisory_lock($1)", PURGE_LOCK_KEY
+            ):
+                report.skipped = True
+                self.last_report = report
+                return report
+            try:
+                await self._purge_batches(connection, report)
+            finally:
+                await connection.execute(
+                    "SELECT pg_advisory_unlock($1)", PURGE_LOCK_KEY
+                )
+
+        report.elapsed_seconds = self._clock() - start
+        logger.info(
+            "Purged %d inactive users in %d batches, %.1fs, locks held %.3fs "
+            "(max %.3fs per batch)",
+            report.deleted,
+            report.batches,
+            report.elapsed_seconds,
+            report.lock_seconds,
+            report.max_lock_seconds,
+        )
+        self.last_report = report
+        return report
+
+    async def run(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.purge()
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                logger.exception("Inactive user purge failed")
+            await asyncio.sleep(interval_seconds)
+
+    async def _purge_batches(
+        self, connection: asyncpg.Connection, report: PurgeReport
+    ) -> None:
+        cutoff = datetime.now(UTC) - self._max_age
+        after: tuple[datetime, uuid.UUID] = (
+            datetime.min.replace(tzinfo=UTC),
+            uuid.UUID(int=0),
+        )
+        while True:
+            rows = await connection.fetch(
+                _SELECT_BATCH_QUERY, cutoff, *after, self._batch_size
+            )
+            if not rows:
+                return
+
+            lock_start = self._clock()
+            emails = await connection.fetch(
+                _DELETE_BATCH_QUERY, [row["id"] for row in rows], cutoff
+            )
+            lock_seconds = self._clock() - lock_start
+            await self._invalidate([row["email"] for row in emails])
+
+            deleted = len(emails)
+            report.deleted += deleted
+            report.batches += 1
+            report.lock_seconds += lock_seconds
+            report.max_lock_seconds = max(report.max_lock_seconds, lock_seconds)
+            logger.info(
+                "Purge batch %d: %d users deleted in %.3fs, %d so far",
+                report.batches,
+                deleted,
+                lock_seconds,
+                report.deleted,
+            )
+
+            if len(rows) < self._batch_size:
+                return
+            after = (rows[-1]["created_at"], rows[-1]["id"])
+            await asyncio.sleep(self._pause_seconds)
+
+    async def _invalidate(self, emails: list[str]) -> None:
+        if self._user_cache is None:
+            return
+        try:
+            for email in emails:
+                await self._user_cache.invalidate(Email(email))
+        except Exception:
+            # The entries left expire with the cache TTL
+            logger.exception("User cache invalidation of purged users failed")
@@ -0,0 +1,45 @@
+"""Redis implementation of DistributedLock port."""
+
+import contextlib
+from collections.abc import AsyncIterator
+
+import redis.asyncio as redis
+from redis.exceptions import LockError
+
+from app.application.exceptions import OperationInProgressError
+
+_KEY_PREFIX = "lock:"
+
+
+class RedisDistributedLock:
+    """
+    Redis implementation of DistributedLock port.
+
+    Uses the redis-py lock: SET NX PX with a random token, released by a Lua
+    compare-and-delete. The lock expires after `ttl_seconds` if its holder
+    dies, so `ttl_seconds` must exceed the longest guarded operation.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl_seconds: float = 10.0,
+        wait_seconds: float = 10.0,
+    ) -> None:
+        self._client = client
+        self._ttl = ttl_seconds
+        self._wait = wait_seconds
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        lock = self._client.lock(
+            f"{_KEY_PREFIX}{key}", timeout=self._ttl, blocking_timeout=self._wait
+        )
+        if not await lock.acquire():
+            raise OperationInProgressError(key)
+        try:
+            yield
+        finally:
+            # Expired and maybe taken over: nothing left to release
+            with contextlib.suppress(LockError):
+                await lock.release()
@@ -0,0 +1,15 @@
+"""Console implementation of EmailSender port."""
+
+from email.message import EmailMessage
+
+
+class ConsoleEmailSender:
+    """
+    Console implementation of EmailSender port.
+    """
+
+    async def send(self, message: EmailMessage) -> None:
+        print(f"Sending to email {message['To']}: {message['Subject']}")
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,141 @@
+"""SMTP implementation of EmailSender port."""
+
+import asyncio
+import smtplib
+from collections import defaultdict
+from email.message import EmailMessage
+
+
+class SmtpEmailSender:
+    """
+    SMTP implementation of EmailSender port.
+
+    `pool_size` workers each keep one SMTP session open and send queued
+    messages through it, up to `batch_size` per hand-off to the worker
+    thread, instead of paying connect + EHLO (+ STARTTLS + AUTH) per mail.
+    Concurrent sends to one recipient domain are capped by `per_domain_limit`
+    so that a slow or throttling provider cannot take the whole pool.
+    """
+
+    def __init__(  # noqa: PLR0913 too-many-arguments
+        self,
+        host: str,
+        port: int = 25,
+        *,
+        pool_size: int = 4,
+        batch_size: int = 50,
+        per_domain_limit: int = 2,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = False,
+        timeout: float = 10.0,
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._pool_size = pool_size
+        self._batch_size = batch_size
+        self._username = username
+        self._password = password
+        self._starttls = starttls
+        self._timeout = timeout
+        self._domain_limits: defaultdict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(per_domain_limit)
+        )
+        self._queue: asyncio.Queue[tuple[EmailMessage, asyncio.Future[None]]] | None = (
+            None
+        )
+        self._workers: list[asyncio.Task[None]] = []
+        self.connections_opened = 0
+
+    async def send(self, message: EmailMessage) -> None:
+        domain = str(message["To"]).rpartition("@")[2].lower()
+        async with self._domain_limits[domain]:
+            future = asyncio.get_running_loop().create_future()
+            self._get_queue().put_nowait((message, future))
+            await future
+
+    async def close(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def _get_queue(self) -> asyncio.Queue[tuple[EmailMessage, asyncio.Future[None]]]:
+        # Workers are started lazily so that they run on the caller's loop
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._workers = [
+                asyncio.create_task(self._worker(self._queue))
+                for _ in range(self._pool_size)
+            ]
+        return self._queue
+
+    async def _worker(
+        self, queue: asyncio.Queue[tuple[EmailMessage, asyncio.Future[None]]]
+    ) -> None:
+        connection: smtplib.SMTP | None = None
+        try:
+            while True:
+                batch = [await queue.get()]
+                while len(batch) < self._batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                connection, errors = await asyncio.to_thread(
+                    self._send_batch, connection, [message for message, _ in batch]
+                )
+                for (_, future), error in zip(batch, errors, strict=True):
+                    if future.done():
+                        continue
+                    if error is None:
+                        future.set_result(None)
+                    else:
+                        future.set_exception(error)
+        finally:
+            if connection is not None:
+                await asyncio.to_thread(self._quit, connection)
+
+    def _send_batch(
+        self, connection: smtplib.SMTP | None, messages: list[EmailMessage]
+    ) -> tuple[smtplib.SMTP | None, list[Exception | None]]:
+        errors: list[Exception | None] = []
+        for message in messages:
+            try:
+                if connection is None:
+                    connection = self._connect()
+                try:
+                    connection.send_message(message)
+                except smtplib.SMTPServerDisconnected:
+                    # Idle session closed by the server, reconnect once
+                    connection = self._connect()
+                    connection.send_message(message)
+            except (
+                smtplib.SMTPResponseException,
+                smtplib.SMTPRecipientsRefused,
+            ) as exc:
+                # Refused by the server, the session itself is still usable
+                errors.append(exc)
+            except OSError as exc:
+                connection = None
+                errors.append(exc)
+            else:
+                errors.append(None)
+        return connection, errors
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self._host, self._port, timeout=self._timeout)
+        connection.ehlo()
+        if self._starttls:
+            connection.starttls()
+            connection.ehlo()
+        if self._username and self._password:
+            connection.login(self._username, self._password)
+        self.connections_opened += 1
+        return connection
+
+    @staticmethod
+    def _quit(connection: smtplib.SMTP) -> None:
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
@@ -0,0 +1,52 @@
+"""Email templates rendered from consumed event messages."""
+
+from dataclasses import dataclass
+from email.message import EmailMessage
+from string import Template
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class EmailTemplate:
+    """Subject and body templates, compiled once."""
+
+    subject: Template
+    body: Template
+
+    def render(
+        self, sender: str, recipient: str, fields: dict[str, Any]
+    ) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = sender
+        message["To"] = recipient
+        message["Subject"] = self.subject.substitute(fields)
+        message.set_content(self.body.substitute(fields))
+        return message
+
+
+EMAIL_TEMPLATES: dict[str, EmailTemplate] = {
+    "UserRegistered": EmailTemplate(
+        subject=Template("Your verification code: $code"),
+        body=Template(
+            "Welcome!\n\n"
+            "Your verification code is $code.\n"
+            "Use it within one minute to activate your account.\n"
+        ),
+    ),
+    "UserNewVerificationCodeCreated": EmailTemplate(
+        subject=Template("Your new verification code: $code"),
+        body=Template(
+            "Your new verification code is $code.\n"
+            "Use it within one minute to activate your account.\n"
+        ),
+    ),
+}
+
+
+def render_event_email(message: dict[str, Any], sender: str) -> EmailMessage | None:
+    """Render the email for a consumed event message, None if it sends no email."""
+    template = EMAIL_TEMPLATES.get(message.get("event_type", ""))
+    if template is None:
+        return None
+    payload = message["payload"]
+    return template.render(sender, payload["email"], payload)
@@ -0,0 +1,57 @@
+"""Bloom filter sizing and hashing"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class BloomParameters:
+    """Bit count and hash count of a Bloom filter."""
+
+    bits: int
+    hashes: int
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float) -> BloomParameters:
+        """Optimal parameters for `capacity` items at `false_positive_rate`."""
+        bits = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return cls(bits, hashes)
+
+    def false_positive_rate(self, items: int) -> float:
+        """Expected false positive rate once `items` were added."""
+        return (1 - math.exp(-self.hashes * items / self.bits)) ** self.hashes
+
+    def positions(self, value: str) -> list[int]:
+        """Bit positions of value, by double hashing one 128-bit digest."""
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.bits for index in range(self.hashes)]
+
+
+class BloomFilter:
+    """Bloom filter over a bytearray."""
+
+    def __init__(self, parameters: BloomParameters) -> None:
+        self.parameters = parameters
+        self._bits = bytearray((parameters.bits + 7) // 8)
+
+    def __contains__(self, value: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self.parameters.positions(value)
+        )
+
+    def add(self, value: str) -> None:
+        bits = self._bits
+        for position in self.parameters.positions(value):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
@@ -0,0 +1,39 @@
+"""In-memory implementation of EmailFilter port."""
+
+from collections.abc import Iterable
+
+from app.domain import Email
+from app.infrastructure.email_filter.bloom_filter import BloomFilter, BloomParameters
+
+
+class MemoryEmailFilter:
+    """
+    In-memory implementation of EmailFilter port.
+
+    Per process Bloom filter. Until it is populated from the users table,
+    every email might be registered, so callers keep doing their lookup.
+    """
+
+    def __init__(
+        self, capacity: int = 10_000_000, false_positive_rate: float = 0.01
+    ) -> None:
+        self._filter = BloomFilter(
+            BloomParameters.for_capacity(capacity, false_positive_rate)
+        )
+        self._populated = False
+
+    async def might_contain(self, email: Email) -> bool:
+        return not self._populated or email.value in self._filter
+
+    async def add(self, email: Email) -> None:
+        self._filter.add(email.value)
+
+    async def add_many(self, emails: Iterable[str]) -> None:
+        for email in emails:
+            self._filter.add(email)
+
+    async def is_populated(self) -> bool:
+        return self._populated
+
+    async def mark_populated(self) -> None:
+        self._populated = True
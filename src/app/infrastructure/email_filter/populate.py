@@ -0,0 +1,37 @@
+"""Populate an email filter from the users table"""
+
+from collections.abc import Sequence
+from typing import Protocol
+
+import asyncpg
+
+from app.application.ports.email_filter import EmailFilter
+
+
+class PopulatableEmailFilter(EmailFilter, Protocol):
+    async def is_populated(self) -> bool: ...
+
+    async def mark_populated(self) -> None: ...
+
+
+async def populate_email_filter(
+    email_filter: PopulatableEmailFilter,
+    pools: Sequence[asyncpg.Pool],
+    batch_size: int = 10_000,
+) -> None:
+    """
+    Add every registered email to the filter, then mark it populated.
+
+    Emails are streamed with a server side cursor, from every shard in
+    `pools`. Inserts made meanwhile are added by the register use case, so
+    none is missed.
+    """
+    if await email_filter.is_populated():
+        return
+
+    for pool in pools:
+        async with pool.acquire() as connection, connection.transaction():
+            cursor = await connection.cursor("SELECT email FROM user_emails")
+            while rows := await cursor.fetch(batch_size):
+                await email_filter.add_many(row["email"] for row in rows)
+    await email_filter.mark_populated()
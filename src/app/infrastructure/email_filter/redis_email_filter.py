@@ -0,0 +1,55 @@
+"""Redis implementation of EmailFilter port."""
+
+from collections.abc import Iterable
+
+import redis.asyncio as redis
+
+from app.domain import Email
+from app.infrastructure.email_filter.bloom_filter import BloomParameters
+
+_KEY = "email_filter"
+_POPULATED_KEY = "email_filter:populated"
+
+
+class RedisEmailFilter:
+    """
+    Redis implementation of EmailFilter port.
+
+    Bloom filter in a Redis bitmap shared by all instances, so it is
+    populated once and sees every instance's inserts. A check is one
+    pipelined round trip of GETBITs, which also reads the populated flag.
+    A Redis string holds at most 2^32 bits: 100M emails at 1%.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        capacity: int = 10_000_000,
+        false_positive_rate: float = 0.01,
+    ) -> None:
+        self._client = client
+        self._parameters = BloomParameters.for_capacity(capacity, false_positive_rate)
+
+    async def might_contain(self, email: Email) -> bool:
+        pipeline = self._client.pipeline(transaction=False)
+        pipeline.exists(_POPULATED_KEY)
+        for position in self._parameters.positions(email.value):
+            pipeline.getbit(_KEY, position)
+        populated, *bits = await pipeline.execute()
+        return not populated or all(bits)
+
+    async def add(self, email: Email) -> None:
+        await self.add_many([email.value])
+
+    async def add_many(self, emails: Iterable[str]) -> None:
+        pipeline = self._client.pipeline(transaction=False)
+        for email in emails:
+            for position in self._parameters.positions(email):
+                pipeline.setbit(_KEY, position, 1)
+        await pipeline.execute()
+
+    async def is_populated(self) -> bool:
+        return bool(await self._client.exists(_POPULATED_KEY))
+
+    async def mark_populated(self) -> None:
+        await self._client.set(_POPULATED_KEY, 1)
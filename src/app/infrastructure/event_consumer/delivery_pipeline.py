@@ -0,0 +1,77 @@
+"""Bounded pipeline of consumer deliveries processed on an event loop"""
+
+import asyncio
+import logging
+import queue
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future
+from enum import Enum
+from functools import partial
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class Outcome(Enum):
+    ACCEPT = "accept"
+    DISCARD = "discard"
+    REQUEUE = "requeue"
+
+
+class DeliveryPipeline[D]:
+    """
+    Processes deliveries on an asyncio loop, `max_in_flight` at a time, for
+    a consumer whose deliveries arrive on a thread of its own.
+
+    `submit` schedules the processing of a delivery and returns at once,
+    unless `max_in_flight` deliveries are still being processed: it then
+    blocks until some finish. Outcomes are handed back to the consumer
+    thread, which settles them with `settle` from `submit` or
+    `settle_ready`, as the client links are not thread-safe.
+
+    Deliveries still in flight when the consumer stops are left unsettled,
+    the broker redelivers them.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        settle: Callable[[D, Outcome], None],
+        *,
+        max_in_flight: int,
+    ) -> None:
+        self._loop = loop
+        self._settle = settle
+        self._max_in_flight = max_in_flight
+        self._finished: queue.SimpleQueue[tuple[D, Outcome]] = queue.SimpleQueue()
+        self.in_flight = 0
+
+    def submit(self, delivery: D, processing: Coroutine[Any, Any, Outcome]) -> None:
+        future = asyncio.run_coroutine_threadsafe(processing, self._loop)
+        self.in_flight += 1
+        future.add_done_callback(partial(self._finish, delivery))
+        self.settle_ready()
+        while self.in_flight >= self._max_in_flight:
+            self._settle_one(*self._finished.get())
+
+    def settle_ready(self) -> None:
+        """Settle the deliveries finished so far, without blocking."""
+        while True:
+            try:
+                finished = self._finished.get_nowait()
+            except queue.Empty:
+                return
+            self._settle_one(*finished)
+
+    def _settle_one(self, delivery: D, outcome: Outcome) -> None:
+        self.in_flight -= 1
+        self._settle(delivery, outcome)
+
+    def _finish(self, delivery: D, future: Future[Outcome]) -> None:
+        # On the loop thread, only queues the outcome
+        try:
+            outcome = future.result()
+        except Exception:
+            logger.exception("Delivery processing failed, requeueing")
+            outcome = Outcome.REQUEUE
+        self._finished.put((delivery, outcome))
@@ -0,0 +1,51 @@
+"""In-memory implementation of EventDeduplicator port."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+
+class MemoryEventDeduplicator:
+    """
+    In-memory implementation of EventDeduplicator port.
+
+    Time-windowed LRU: ids are kept in insertion order, so expired ids are
+    always at the head and are evicted in O(1) on each claim. `max_entries`
+    bounds memory if the event rate exceeds what the window was sized for.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int = 600,
+        max_entries: int = 500_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._seen: OrderedDict[str, float] = OrderedDict()
+        self._window = window_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+
+    async def claim(self, event_id: str) -> bool:
+        now = self._clock()
+        self._evict_expired(now)
+
+        if event_id in self._seen:
+            return False
+
+        self._seen[event_id] = now + self._window
+        if len(self._seen) > self._max_entries:
+            self._seen.popitem(last=False)
+        return True
+
+    async def release(self, event_id: str) -> None:
+        self._seen.pop(event_id, None)
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def _evict_expired(self, now: float) -> None:
+        while self._seen:
+            oldest_id, expires_at = next(iter(self._seen.items()))
+            if expires_at > now:
+                return
+            del self._seen[oldest_id]
@@ -0,0 +1,29 @@
+"""Redis implementation of EventDeduplicator port"""
+
+import redis.asyncio as redis
+
+_KEY_PREFIX = "event_seen:"
+
+
+class RedisEventDeduplicator:
+    """
+    Redis implementation of EventDeduplicator port
+
+    Shares the dedup window between consumer processes: one `SET NX EX`
+    round trip per event, expired ids are dropped by Redis itself.
+    """
+
+    def __init__(self, client: redis.Redis, window_seconds: int = 600) -> None:
+        self._client = client
+        self._window = window_seconds
+
+    def _key(self, event_id: str) -> str:
+        return f"{_KEY_PREFIX}{event_id}"
+
+    async def claim(self, event_id: str) -> bool:
+        return bool(
+            await self._client.set(self._key(event_id), 1, nx=True, ex=self._window)
+        )
+
+    async def release(self, event_id: str) -> None:
+        await self._client.delete(self._key(event_id))
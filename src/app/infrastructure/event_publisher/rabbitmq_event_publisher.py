@@ -12,21 +12,20 @@ from rabbitmq_amqp_python_client import (
     AsyncPublisher,
     ConnectionClosed,
     Converter,
-    ExchangeSpecification,
-    ExchangeToQueueBindingSpecification,
-    ExchangeType,
     Message,
-    QuorumQueueSpecification,
 )
 
 from app.application.exceptions import VerificationCodeExpiredError
 from app.application.ports.code_store import CodeStore
 from app.domain import (
     DomainEvent,
+    Email,
     UserActivated,
     UserNewVerificationCodeCreated,
     UserRegistered,
+    VerificationCode,
 )
+from app.infrastructure.event_publisher.topology import declare_topology
 
 
 class RabbitMQEventPublisher:
@@ -61,20 +60,11 @@ class RabbitMQEventPublisher:
         self._connection = await self._environment.connection()
         await self._connection.dial()
         self._management = await self._connection.management()
-        await self._management.declare_exchange(
-            ExchangeSpecification(
-                name=self._exchange_name, exchange_type=ExchangeType.topic
-            )
-        )
-        await self._management.declare_queue(
-            QuorumQueueSpecification(name=self._queue_name)
-        )
-        self.bind_name = await self._management.bind(
-            ExchangeToQueueBindingSpecification(
-                source_exchange=self._exchange_name,
-                destination_queue=self._queue_name,
-                binding_key=self._routing_key,
-            )
+        self.bind_name = await declare_topology(
+            self._management,
+            exchange_name=self._exchange_name,
+            queue_name=self._queue_name,
+            routing_key=self._routing_key,
         )
         self.addr = AddressHelper.exchange_address(
             self._exchange_name, self._routing_key
@@ -89,7 +79,26 @@ class RabbitMQEventPublisher:
         await self._environment.close()
 
     async def publish(self, event: DomainEvent) -> None:
-        message_str = await self._serialize_event(event)
+        await self.publish_all([event])
+
+    async def publish_all(self, events: list[DomainEvent]) -> None:
+        # The codes of the whole batch are read in one round trip
+        code_events = [
+            event
+            for event in events
+            if isinstance(event, (UserRegistered, UserNewVerificationCodeCreated))
+        ]
+        codes = dict(
+            zip(
+                (event.email for event in code_events),
+                await self._code_store.get_many([event.email for event in code_events]),
+                strict=True,
+            )
+        )
+        for event in events:
+            await self._publish_message(self._serialize_event(event, codes))
+
+    async def _publish_message(self, message_str: str) -> None:
         # print("Publishing message:", message_str)
         try:
             await self._publisher.publish(
@@ -106,11 +115,10 @@ class RabbitMQEventPublisher:
                 )
             )
 
-    async def publish_all(self, events: list[DomainEvent]) -> None:
-        for event in events:
-            await self.publish(event)
-
-    async def _serialize_event(self, event: DomainEvent) -> str:
+    @staticmethod
+    def _serialize_event(
+        event: DomainEvent, codes: dict[Email, VerificationCode | None]
+    ) -> str:
         data: dict[str, Any] = {
             "event_type": type(event).__name__,
             "event_id": str(event.event_id),
@@ -123,7 +131,7 @@ class RabbitMQEventPublisher:
                 UserRegistered(user_id=uid, email=email)
                 | UserNewVerificationCodeCreated(user_id=uid, email=email)
             ):
-                code = await self._code_store.get(email)
+                code = codes[email]
                 if code is None:
                     raise VerificationCodeExpiredError(email.value)
                 data["payload"] = {
@@ -0,0 +1,127 @@
+"""
+RabbitMQ topology shared by the event publisher and the consumer.
+
+    exchange --routing_key--> queue --(rejected)--> <exchange>.dlx --> <queue>.dlq
+                                ^
+    <queue>.retry.<n>s ---------+  (message TTL expired, via default exchange)
+
+The publisher and the consumer must declare the main queue with the same
+arguments, otherwise RabbitMQ refuses the second declaration.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+from rabbitmq_amqp_python_client import (
+    ExchangeSpecification,
+    ExchangeToQueueBindingSpecification,
+    ExchangeType,
+    QuorumQueueSpecification,
+)
+from rabbitmq_amqp_python_client.asyncio import AsyncManagement
+
+ATTEMPT_PROPERTY = "attempt"
+_DEFAULT_EXCHANGE = ""
+
+
+def dead_letter_exchange_name(exchange_name: str) -> str:
+    return f"{exchange_name}.dlx"
+
+
+def dead_letter_queue_name(queue_name: str) -> str:
+    return f"{queue_name}.dlq"
+
+
+def retry_queue_name(queue_name: str, delay_seconds: int) -> str:
+    return f"{queue_name}.retry.{delay_seconds}s"
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """
+    Delayed retry policy.
+
+    Attempt n (1-based count of failed deliveries) is retried after
+    `delays_seconds[n - 1]` (the last delay is reused), until `max_attempts`
+    is reached and the message is dead-lettered.
+    """
+
+    delays_seconds: tuple[int, ...]
+    max_attempts: int
+
+    def __post_init__(self) -> None:
+        if not self.delays_seconds:
+            msg = "At least one retry delay is required"
+            raise ValueError(msg)
+
+    def next_delay(self, attempt: int) -> int | None:
+        """Delay before the next attempt, None if the message must be dead-lettered."""
+        if attempt >= self.max_attempts:
+            return None
+        return self.delays_seconds[min(attempt, len(self.delays_seconds)) - 1]
+
+
+def main_queue_specification(
+    exchange_name: str, queue_name: str
+) -> QuorumQueueSpecification:
+    return QuorumQueueSpecification(
+        name=queue_name,
+        dead_letter_exchange=dead_letter_exchange_name(exchange_name),
+    )
+
+
+def retry_queue_specification(
+    queue_name: str, delay_seconds: int
+) -> QuorumQueueSpecification:
+    # Expired messages go back to the main queue only, not to every binding
+    return QuorumQueueSpecification(
+        name=retry_queue_name(queue_name, delay_seconds),
+        message_ttl=timedelta(seconds=delay_seconds),
+        dead_letter_exchange=_DEFAULT_EXCHANGE,
+        dead_letter_routing_key=queue_name,
+    )
+
+
+async def declare_topology(
+    management: AsyncManagement,
+    *,
+    exchange_name: str,
+    queue_name: str,
+    routing_key: str,
+) -> str:
+    """Declare exchange, main queue and its dead-letter queue. Return the bind name."""
+    await management.declare_exchange(
+        ExchangeSpecification(name=exchange_name, exchange_type=ExchangeType.topic)
+    )
+    await management.declare_exchange(
+        ExchangeSpecification(
+            name=dead_letter_exchange_name(exchange_name),
+            exchange_type=ExchangeType.fanout,
+        )
+    )
+    await management.declare_queue(
+        QuorumQueueSpecification(name=dead_letter_queue_name(queue_name))
+    )
+    await management.bind(
+        ExchangeToQueueBindingSpecification(
+            source_exchange=dead_letter_exchange_name(exchange_name),
+            destination_queue=dead_letter_queue_name(queue_name),
+        )
+    )
+    await management.declare_queue(main_queue_specification(exchange_name, queue_name))
+    return await management.bind(
+        ExchangeToQueueBindingSpecification(
+            source_exchange=exchange_name,
+            destination_queue=queue_name,
+            binding_key=routing_key,
+        )
+    )
+
+
+async def declare_retry_queues(
+    management: AsyncManagement, *, queue_name: str, retry_policy: RetryPolicy
+) -> None:
+    for delay_seconds in sorted(set(retry_policy.delays_seconds)):
+        await management.declare_queue(
+            retry_queue_specification(queue_name, delay_seconds)
+        )
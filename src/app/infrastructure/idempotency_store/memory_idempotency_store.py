@@ -0,0 +1,49 @@
+"""In-memory implementation of IdempotencyStore port."""
+
+import time
+from collections.abc import Callable
+
+from app.application.ports.idempotency_store import IdempotencyRecord
+
+
+class MemoryIdempotencyStore:
+    """
+    In-memory implementation of IdempotencyStore port.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 86_400,
+        in_flight_seconds: int = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._records: dict[str, tuple[IdempotencyRecord, float]] = {}
+        self._ttl = ttl_seconds
+        self._in_flight = in_flight_seconds
+        self._clock = clock
+
+    async def claim(self, key: str, fingerprint: str) -> IdempotencyRecord | None:
+        record = await self.get(key)
+        if record is not None:
+            return record
+
+        marker = IdempotencyRecord(fingerprint)
+        self._records[key] = (marker, self._clock() + self._in_flight)
+        return None
+
+    async def get(self, key: str) -> IdempotencyRecord | None:
+        entry = self._records.get(key)
+        if entry is None:
+            return None
+
+        record, expires_at = entry
+        if self._clock() >= expires_at:
+            del self._records[key]
+            return None
+        return record
+
+    async def complete(self, key: str, record: IdempotencyRecord) -> None:
+        self._records[key] = (record, self._clock() + self._ttl)
+
+    async def release(self, key: str) -> None:
+        self._records.pop(key, None)
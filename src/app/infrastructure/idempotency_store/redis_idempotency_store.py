@@ -0,0 +1,82 @@
+"""Redis implementation of IdempotencyStore port."""
+
+import base64
+
+import orjson
+import redis.asyncio as redis
+
+from app.application.ports.idempotency_store import IdempotencyRecord
+
+_KEY_PREFIX = "idempotency:"
+
+# Set the in-flight marker, or return the existing record, in one round trip
+_CLAIM_SCRIPT = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    return false
+end
+return redis.call('GET', KEYS[1])
+"""
+
+
+class RedisIdempotencyStore:
+    """
+    Redis implementation of IdempotencyStore port.
+
+    The in-flight marker expires after `in_flight_seconds`, so that a key
+    claimed by a crashed instance does not block retries for the whole
+    `ttl_seconds` a completed response is kept.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl_seconds: int = 86_400,
+        in_flight_seconds: int = 30,
+    ) -> None:
+        self._client = client
+        self._ttl = ttl_seconds
+        self._in_flight = in_flight_seconds
+        self._claim = client.register_script(_CLAIM_SCRIPT)
+
+    def _key(self, key: str) -> str:
+        return f"{_KEY_PREFIX}{key}"
+
+    async def claim(self, key: str, fingerprint: str) -> IdempotencyRecord | None:
+        marker = _dumps(IdempotencyRecord(fingerprint))
+        value = await self._claim(keys=[self._key(key)], args=[marker, self._in_flight])
+        if value is None:
+            return None
+        return _loads(value)
+
+    async def get(self, key: str) -> IdempotencyRecord | None:
+        value = await self._client.get(self._key(key))
+        if value is None:
+            return None
+        return _loads(value)
+
+    async def complete(self, key: str, record: IdempotencyRecord) -> None:
+        await self._client.set(self._key(key), _dumps(record), ex=self._ttl)
+
+    async def release(self, key: str) -> None:
+        await self._client.delete(self._key(key))
+
+
+def _dumps(record: IdempotencyRecord) -> str:
+    return orjson.dumps(
+        {
+            "fingerprint": record.fingerprint,
+            "status_code": record.status_code,
+            "content_type": record.content_type,
+            "body": base64.b64encode(record.body).decode(),
+        }
+    ).decode()
+
+
+def _loads(value: str | bytes) -> IdempotencyRecord:
+    data = orjson.loads(value)
+    return IdempotencyRecord(
+        fingerprint=data["fingerprint"],
+        status_code=data["status_code"],
+        content_type=data["content_type"],
+        body=base64.b64decode(data["body"]),
+    )
@@ -0,0 +1,61 @@
+"""Redis implementation of PendingRegistrationStore port."""
+
+from collections.abc import Sequence
+
+import redis.asyncio as redis
+
+from app.domain import Email, User
+from app.infrastructure.database.mappers.user_mapper import UserMapper
+from app.infrastructure.database.models.user_model import UserModel
+
+_KEY_PREFIX = "pending_registration:"
+
+
+class RedisPendingRegistrationStore:
+    """
+    Redis implementation of PendingRegistrationStore port.
+
+    One key per email holding the user row as JSON, set with NX so that
+    two registrations of one email cannot both be pending.
+    """
+
+    def __init__(self, client: redis.Redis, ttl_seconds: int = 86_400) -> None:
+        self._client = client
+        self._ttl = ttl_seconds
+
+    def _key(self, email: Email) -> str:
+        return f"{_KEY_PREFIX}{email}"
+
+    async def add(self, user: User) -> bool:
+        model = UserMapper.to_model(user)
+        stored = await self._client.set(
+            self._key(user.email), model.model_dump_json(), nx=True, ex=self._ttl
+        )
+        return bool(stored)
+
+    async def add_many(self, users: Sequence[User]) -> list[bool]:
+        if not users:
+            return []
+        async with self._client.pipeline(transaction=False) as pipe:
+            for user in users:
+                pipe.set(
+                    self._key(user.email),
+                    UserMapper.to_model(user).model_dump_json(),
+                    nx=True,
+                    ex=self._ttl,
+                )
+            stored = await pipe.execute()
+        return [bool(value) for value in stored]
+
+    async def get(self, email: Email) -> User | None:
+        value = await self._client.get(self._key(email))
+        if value is None:
+            return None
+        return UserMapper.to_entity(UserModel.model_validate_json(value))
+
+    async def delete(self, email: Email) -> None:
+        await self._client.delete(self._key(email))
+
+    async def delete_many(self, emails: Sequence[Email]) -> None:
+        if emails:
+            await self._client.delete(*(self._key(email) for email in emails))
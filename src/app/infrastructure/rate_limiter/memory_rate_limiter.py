@@ -0,0 +1,39 @@
+"""In-memory implementation of RateLimiter port."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+
+class MemoryRateLimiter:
+    """
+    In-memory implementation of RateLimiter port.
+
+    Buckets are per process, so limits only hold for a single instance.
+    The least recently used buckets are dropped beyond `max_entries`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._max_entries = max_entries
+        self._clock = clock
+
+    async def acquire(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = self._clock()
+        tokens, updated_at = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self._max_entries:
+            self._buckets.popitem(last=False)
+        return retry_after
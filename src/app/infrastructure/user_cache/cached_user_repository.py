@@ -0,0 +1,93 @@
+"""Cache-aside UserRepository and the unit of work that provides it"""
+
+from collections.abc import Sequence
+from types import TracebackType
+from typing import Self
+
+from app.application.ports.unit_of_work import UnitOfWork
+from app.application.ports.user_cache import UserCache
+from app.application.ports.user_repository import UserRepository
+from app.domain import Email, User, UserId
+
+
+class CachedUserRepository:
+    """
+    Cache-aside UserRepository.
+
+    get_by_email is served from the cache, filled from the wrapped
+    repository on a miss. Saving a user invalidates its entry.
+    """
+
+    def __init__(self, repository: UserRepository, cache: UserCache) -> None:
+        self._repository = repository
+        self._cache = cache
+        self.saved_emails: list[Email] = []
+
+    async def get_by_id(self, user_id: UserId) -> User | None:
+        return await self._repository.get_by_id(user_id)
+
+    async def get_by_email(self, email: Email) -> User | None:
+        if user := await self._cache.get(email):
+            return user
+
+        user = await self._repository.get_by_email(email)
+        if user is not None:
+            await self._cache.set(user)
+        return user
+
+    async def save(self, user: User) -> None:
+        await self._repository.save(user)
+        await self._cache.invalidate(user.email)
+        self.saved_emails.append(user.email)
+
+    async def add_many(self, users: Sequence[User]) -> list[User]:
+        # New users have no cache entry to invalidate
+        return await self._repository.add_many(users)
+
+
+class CachingUnitOfWork:
+    """
+    UnitOfWork whose user repository goes through a UserCache.
+
+    Saved users are invalidated again once the transaction is over: a read
+    between the save and the commit could have cached the old row.
+    """
+
+    def __init__(self, uow: UnitOfWork, cache: UserCache) -> None:
+        self._uow = uow
+        self._cache = cache
+        self._user_repository: CachedUserRepository | None = None
+
+    @property
+    def user_repository(self) -> CachedUserRepository:
+        if self._user_repository is None:
+            msg = "UnitOfWork not entered. Use 'async with' context manager."
+            raise RuntimeError(msg)
+        return self._user_repository
+
+    async def __aenter__(self) -> Self:
+        await self._uow.__aenter__()
+        self._user_repository = CachedUserRepository(
+            self._uow.user_repository, self._cache
+        )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        try:
+            await self._uow.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            if self._user_repository is not None:
+                for email in self._user_repository.saved_emails:
+                    await self._cache.invalidate(email)
+            self._user_repository = None
+
+    async def commit(self) -> None:
+        await self._uow.commit()
+
+    async def rollback(self) -> None:
+        await self._uow.rollback()
@@ -0,0 +1,63 @@
+"""In-memory implementation of UserCache port."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from app.domain import Email, User
+from app.infrastructure.database.mappers.user_mapper import UserMapper
+
+if TYPE_CHECKING:
+    from app.infrastructure.database.models.user_model import UserModel
+
+
+class MemoryUserCache:
+    """
+    In-memory implementation of UserCache port.
+
+    LRU of database models: entities are rebuilt on each hit, so a use case
+    mutating its user never changes the cached one. `invalidate` is local,
+    see PubSubUserCache for invalidation across instances.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 60.0,
+        max_entries: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._entries: OrderedDict[str, tuple[UserModel, float]] = OrderedDict()
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, email: Email) -> User | None:
+        entry = self._entries.get(email.value)
+        if entry is None or entry[1] <= self._clock():
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(email.value)
+        return UserMapper.to_entity(entry[0])
+
+    async def set(self, user: User) -> None:
+        self._entries[user.email.value] = (
+            UserMapper.to_model(user),
+            self._clock() + self._ttl,
+        )
+        self._entries.move_to_end(user.email.value)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, email: Email) -> None:
+        self.evict(email.value)
+
+    def evict(self, email: str) -> None:
+        self._entries.pop(email, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
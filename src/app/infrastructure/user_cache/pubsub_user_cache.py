@@ -0,0 +1,84 @@
+"""In-memory UserCache invalidated across instances over Redis pub/sub."""
+
+import asyncio
+import contextlib
+import logging
+
+import redis.asyncio as redis
+
+from app.domain import Email, User
+from app.infrastructure.user_cache.memory_user_cache import MemoryUserCache
+
+INVALIDATION_CHANNEL = "user_cache:invalidate"
+
+logger = logging.getLogger(__name__)
+
+
+class PubSubUserCache:
+    """
+    In-memory UserCache invalidated across instances over Redis pub/sub.
+
+    Reads never leave the process. An invalidation evicts locally, then is
+    published so that every instance running `listen()` evicts too. A lost
+    message leaves an entry stale for at most the cache TTL.
+    """
+
+    def __init__(
+        self,
+        local: MemoryUserCache,
+        client: redis.Redis,
+        retry_seconds: float = 1.0,
+        max_retry_seconds: float = 30.0,
+    ) -> None:
+        self._local = local
+        self._client = client
+        self._retry_seconds = retry_seconds
+        self._max_retry_seconds = max_retry_seconds
+
+    @property
+    def hits(self) -> int:
+        return self._local.hits
+
+    @property
+    def misses(self) -> int:
+        return self._local.misses
+
+    async def get(self, email: Email) -> User | None:
+        return await self._local.get(email)
+
+    async def set(self, user: User) -> None:
+        await self._local.set(user)
+
+    async def invalidate(self, email: Email) -> None:
+        self._local.evict(email.value)
+        await self._client.publish(INVALIDATION_CHANNEL, email.value)
+
+    async def listen(self) -> None:
+        """
+        Evict the emails invalidated by any instance, until cancelled.
+
+        Resubscribes with exponential backoff when the connection fails. The
+        invalidations published meanwhile are lost, so the local cache is
+        cleared on each subscription.
+        """
+        delay = self._retry_seconds
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                self._local.clear()
+                delay = self._retry_seconds
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._local.evict(str(message["data"]))
+            except Exception:
+                logger.exception(
+                    "User cache invalidations interrupted, resubscribing in %.1fs",
+                    delay,
+                )
+            finally:
+                # The connection may be the one that failed
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_retry_seconds)
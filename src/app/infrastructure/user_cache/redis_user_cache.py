@@ -0,0 +1,45 @@
+"""Redis implementation of UserCache port."""
+
+import redis.asyncio as redis
+
+from app.domain import Email, User
+from app.infrastructure.database.mappers.user_mapper import UserMapper
+from app.infrastructure.database.models.user_model import UserModel
+
+_KEY_PREFIX = "user:"
+
+
+class RedisUserCache:
+    """
+    Redis implementation of UserCache port.
+
+    Shared by all instances, so deleting the key invalidates it everywhere.
+    Hit and miss counts are per instance.
+    """
+
+    def __init__(self, client: redis.Redis, ttl_seconds: int = 60) -> None:
+        self._client = client
+        self._ttl = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, email: Email) -> str:
+        return f"{_KEY_PREFIX}{email}"
+
+    async def get(self, email: Email) -> User | None:
+        value = await self._client.get(self._key(email))
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return UserMapper.to_entity(UserModel.model_validate_json(value))
+
+    async def set(self, user: User) -> None:
+        model = UserMapper.to_model(user)
+        await self._client.set(
+            self._key(user.email), model.model_dump_json(), ex=self._ttl
+        )
+
+    async def invalidate(self, email: Email) -> None:
+        await self._client.delete(self._key(email))
@@ -8,6 +8,8 @@ from fastapi import FastAPI
 from app.config import settings
 from app.container import container
 from app.presentation.exception_handlers import register_exception_handlers
+from app.presentation.idempotency import IdempotencyMiddleware
+from app.presentation.rate_limit import RateLimitMiddleware
 from app.presentation.routers.v1 import router as v1_routers
 
 
@@ -30,6 +32,18 @@ def create_app() -> FastAPI:
     )
 
     register_exception_handlers(app)
+    # Added last runs first: rate limiting also covers idempotent replays
+    app.add_middleware(
+        IdempotencyMiddleware,
+        store=lambda: container.idempotency_store,
+        paths=settings.idempotency_paths,
+        wait_seconds=settings.idempotency_wait_seconds,
+    )
+    app.add_middleware(
+        RateLimitMiddleware,
+        rate_limiter=lambda: container.rate_limiter,
+        rules=settings.rate_limits,
+    )
     app.include_router(v1_routers, prefix="/api")
 
     return app
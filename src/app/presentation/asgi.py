@@ -0,0 +1,34 @@
+"""Helpers for pure ASGI middlewares."""
+
+from starlette.types import Message, Receive
+
+
+async def read_body(receive: Receive) -> tuple[bytes | None, Receive]:
+    """
+    Read the whole request body.
+
+    Return it, or None if the client disconnected, with a receive that
+    replays what was read to the app.
+    """
+    body = bytearray()
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] != "http.request":
+            return None, _replay(message, receive)
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+    message = {"type": "http.request", "body": bytes(body), "more_body": False}
+    return bytes(body), _replay(message, receive)
+
+
+def _replay(message: Message, receive: Receive) -> Receive:
+    pending = [message]
+
+    async def replay_receive() -> Message:
+        if pending:
+            return pending.pop()
+        return await receive()
+
+    return replay_receive
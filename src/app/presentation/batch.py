@@ -0,0 +1,63 @@
+"""Batch request bodies: a JSON array, or NDJSON with one item per line"""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+import orjson
+from fastapi import HTTPException, Request, status
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def read_batch(request: Request, max_items: int) -> list[Any]:
+    """
+    Parse the items of a batch request body.
+
+    An NDJSON body is parsed line by line as it is received, so reading
+    stops as soon as it holds more than `max_items` items.
+    """
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        items = []
+        async for line in _lines(request.stream()):
+            if not line.strip():
+                continue
+            if len(items) == max_items:
+                raise _too_many_items(max_items)
+            items.append(_loads(line))
+        return items
+
+    items = _loads(await request.body())
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Request body must be a JSON array or NDJSON",
+        )
+    if len(items) > max_items:
+        raise _too_many_items(max_items)
+    return items
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    yield buffer
+
+
+def _loads(data: bytes) -> Any:
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid JSON: {exc}"
+        ) from exc
+
+
+def _too_many_items(max_items: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Batch holds more than {max_items} items",
+    )
@@ -1,46 +1,55 @@
 """API dependencies"""
 
-from collections.abc import AsyncGenerator
+import secrets
 from typing import Annotated
 
-from fastapi import Depends
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
-
-from app.application.ports.unit_of_work import UnitOfWork
-from app.application.use_cases.activate_user import ActivateUserUseCase
+from fastapi import Depends, HTTPException, status
+from fastapi.security import (
+    HTTPAuthorizationCredentials,
+    HTTPBasic,
+    HTTPBasicCredentials,
+    HTTPBearer,
+)
+
+from app.application.dto.user_dto import (
+    ActivateUserRequest,
+    ActivateUserResponse,
+    ResendCodeRequest,
+    ResendCodeResponse,
+)
+from app.application.ports.user_exporter import UserExporter
+from app.application.ports.user_lister import UserLister
 from app.application.use_cases.register_user import RegisterUserUseCase
-from app.application.use_cases.resend_code import ResendCodeUseCase
+from app.application.use_cases.register_users import RegisterUsersUseCase
+from app.application.use_cases.single_flight import UseCase
+from app.config import settings
 from app.container import container
 
 
-async def register_user_use_case(
-    uow: UnitOfWork = Depends(container.uow),
-) -> AsyncGenerator[RegisterUserUseCase]:
-    yield RegisterUserUseCase(
-        uow=uow,
-        code_store=container.code_store,
-        event_publisher=container.event_publisher,
-    )
+async def register_user_use_case() -> RegisterUserUseCase:
+    return container.register_user_use_case
 
 
-async def activate_user_use_case(
-    uow: UnitOfWork = Depends(container.uow),
-) -> AsyncGenerator[ActivateUserUseCase]:
-    yield ActivateUserUseCase(
-        uow=uow,
-        code_store=container.code_store,
-        event_publisher=container.event_publisher,
-    )
+async def register_users_use_case() -> RegisterUsersUseCase:
+    return container.register_users_use_case
 
 
-async def resend_code_use_case(
-    uow: UnitOfWork = Depends(container.uow),
-) -> AsyncGenerator[ResendCodeUseCase]:
-    yield ResendCodeUseCase(
-        uow=uow,
-        code_store=container.code_store,
-        event_publisher=container.event_publisher,
-    )
+async def activate_user_use_case() -> UseCase[
+    ActivateUserRequest, ActivateUserResponse
+]:
+    return container.activate_user_use_case
+
+
+async def resend_code_use_case() -> UseCase[ResendCodeRequest, ResendCodeResponse]:
+    return container.resend_code_use_case
+
+
+async def metrics() -> dict[str, dict[str, object]]:
+    return {
+        "single_flight": container.single_flight_metrics(),
+        "user_cache": container.user_cache_metrics(),
+        "user_purge": container.user_purge_metrics(),
+    }
 
 
 class HTTPEmailPasswordBasicCredentials:
@@ -62,9 +71,49 @@ async def email_password_basic(
     )
 
 
+admin_security = HTTPBearer(auto_error=False)
+
+
+async def require_admin(
+    credentials: Annotated[
+        HTTPAuthorizationCredentials | None, Depends(admin_security)
+    ],
+) -> None:
+    """Admin routes are not found without ADMIN_TOKEN, forbidden without it"""
+    if settings.admin_token is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def user_exporter() -> UserExporter:
+    return container.export_users
+
+
+async def user_lister() -> UserLister:
+    return container.list_users
+
+
 RegisterUserUseCaseDep = Annotated[RegisterUserUseCase, Depends(register_user_use_case)]
-ActivateUserUseCaseDep = Annotated[ActivateUserUseCase, Depends(activate_user_use_case)]
-ResendCodeUseCaseDep = Annotated[ResendCodeUseCase, Depends(resend_code_use_case)]
+RegisterUsersUseCaseDep = Annotated[
+    RegisterUsersUseCase, Depends(register_users_use_case)
+]
+ActivateUserUseCaseDep = Annotated[
+    UseCase[ActivateUserRequest, ActivateUserResponse],
+    Depends(activate_user_use_case),
+]
+ResendCodeUseCaseDep = Annotated[
+    UseCase[ResendCodeRequest, ResendCodeResponse],
+    Depends(resend_code_use_case),
+]
+MetricsDep = Annotated[dict[str, dict[str, object]], Depends(metrics)]
+UserExporterDep = Annotated[UserExporter, Depends(user_exporter)]
+UserListerDep = Annotated[UserLister, Depends(user_lister)]
 
 HTTPEmailPasswordBasicCredentialsDep = Annotated[
     HTTPEmailPasswordBasicCredentials, Depends(email_password_basic)
@@ -1,5 +1,6 @@
 """Exception handlers for FastAPI"""
 
+import math
 from typing import Any
 
 from fastapi import FastAPI, HTTPException, Request, status
@@ -7,7 +8,11 @@ from fastapi.exception_handlers import http_exception_handler
 from fastapi.responses import JSONResponse
 
 from app.application.exceptions import (
+    ConcurrentUpdateError,
     InvalidCredentialsError,
+    OperationInProgressError,
+    PartialCommitError,
+    ResendCooldownError,
     UserAlreadyExistsError,
     UserNotFoundError,
     VerificationCodeExpiredError,
@@ -21,16 +26,27 @@ from app.domain.exceptions import (
 
 EXCEPTION_AND_STATUS_CODE = [
     (UserAlreadyExistsError, status.HTTP_409_CONFLICT),
+    (ConcurrentUpdateError, status.HTTP_409_CONFLICT),
     (UserNotFoundError, status.HTTP_404_NOT_FOUND),
     (InvalidCredentialsError, status.HTTP_401_UNAUTHORIZED),
     (VerificationCodeInvalidError, status.HTTP_400_BAD_REQUEST),
     (VerificationCodeExpiredError, status.HTTP_410_GONE),
+    (OperationInProgressError, status.HTTP_409_CONFLICT),
+    # Retryable, a retry skips the users already saved as registered
+    (PartialCommitError, status.HTTP_503_SERVICE_UNAVAILABLE),
     (InvalidEmailError, status.HTTP_400_BAD_REQUEST),
     (InvalidPasswordError, status.HTTP_401_UNAUTHORIZED),
     (InvalidVerificationCodeError, status.HTTP_400_BAD_REQUEST),
 ]
 
 
+def exception_status_code(ex: Exception) -> int:
+    for exception, status_code in EXCEPTION_AND_STATUS_CODE:
+        if isinstance(ex, exception):
+            return status_code
+    return status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
 def register_exception_handler(app: FastAPI, exception: Any, status_code: int):
     @app.exception_handler(exception)
     async def exception_handler(
@@ -40,6 +56,19 @@ def register_exception_handler(app: FastAPI, exception: Any, status_code: int):
         return JSONResponse(status_code=status_code, content={"message": str(ex)})
 
 
+def register_resend_cooldown_exception(app: FastAPI):
+    @app.exception_handler(ResendCooldownError)
+    async def resend_cooldown_exception_handler(
+        _request: Request,
+        ex: ResendCooldownError,
+    ):
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"message": str(ex)},
+            headers={"Retry-After": str(math.ceil(ex.retry_after))},
+        )
+
+
 def register_unhandled_exception(app: FastAPI):
     @app.exception_handler(Exception)
     async def unhandled_exception_handler(
@@ -58,5 +87,6 @@ def register_unhandled_exception(app: FastAPI):
 
 def register_exception_handlers(app: FastAPI):
     register_unhandled_exception(app)
+    register_resend_cooldown_exception(app)
     for exception, status_code in EXCEPTION_AND_STATUS_CODE:
         register_exception_handler(app, exception, status_code)
@@ -0,0 +1,45 @@
+"""Incremental NDJSON and CSV encoders of exported rows"""
+
+import csv
+import io
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+import orjson
+
+from app.presentation.batch import NDJSON_MEDIA_TYPE
+
+CSV_MEDIA_TYPE = "text/csv"
+MEDIA_TYPES = {"ndjson": NDJSON_MEDIA_TYPE, "csv": CSV_MEDIA_TYPE}
+
+
+async def encode_ndjson(
+    batches: AsyncIterator[Sequence[Any]],
+) -> AsyncIterator[bytes]:
+    """One JSON object per row and line, one bytes chunk per batch."""
+    async for rows in batches:
+        yield b"".join(orjson.dumps(dict(row)) + b"\n" for row in rows)
+
+
+async def encode_csv(
+    batches: AsyncIterator[Sequence[Any]], columns: Sequence[str]
+) -> AsyncIterator[bytes]:
+    """A header row, then one CSV row per row, one bytes chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def encode(
+    batches: AsyncIterator[Sequence[Any]], export_format: str, columns: Sequence[str]
+) -> AsyncIterator[bytes]:
+    if export_format == "csv":
+        return encode_csv(batches, columns)
+    return encode_ndjson(batches)
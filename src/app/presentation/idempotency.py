@@ -0,0 +1,163 @@
+"""Idempotency-Key middleware."""
+
+import asyncio
+import hashlib
+from collections.abc import Callable, Collection
+
+from fastapi import Response, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.application.ports.idempotency_store import (
+    IdempotencyRecord,
+    IdempotencyStore,
+)
+from app.presentation.asgi import read_body
+from app.presentation.responses import JSONBytesResponse
+
+IDEMPOTENCY_KEY_HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL_SECONDS = 0.05
+
+
+class IdempotencyMiddleware:
+    """
+    Replay the stored response of a request retried with an Idempotency-Key.
+
+    The first request with a key runs and its response is stored, unless it
+    is a server error, in which case the key is released for a retry.
+    Duplicates arriving while it runs wait for its result: in process on a
+    shared future, across instances by polling the store, for at most
+    `wait_seconds`. Reusing a key with another body is rejected with 422.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: Callable[[], IdempotencyStore],
+        paths: Collection[str],
+        wait_seconds: float = 10.0,
+    ) -> None:
+        self._app = app
+        self._store = store
+        self._paths = frozenset(paths)
+        self._wait_seconds = wait_seconds
+        self._pending: dict[str, asyncio.Future[IdempotencyRecord | None]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        idempotency_key = None
+        if scope["type"] == "http" and scope["path"] in self._paths:
+            idempotency_key = _header(scope, IDEMPOTENCY_KEY_HEADER)
+        if idempotency_key is None:
+            await self._app(scope, receive, send)
+            return
+
+        if not 0 < len(idempotency_key) <= MAX_KEY_LENGTH:
+            response = _error(
+                status.HTTP_400_BAD_REQUEST,
+                f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters long.",
+            )
+            await response(scope, receive, send)
+            return
+
+        body, receive = await read_body(receive)
+        if body is None:
+            await self._app(scope, receive, send)
+            return
+
+        key = f"{scope['method']}:{scope['path']}:{idempotency_key}"
+        fingerprint = hashlib.sha256(body).hexdigest()
+        response = await self._stored_response(key, fingerprint)
+        if response is None:
+            await self._run(key, fingerprint, scope, receive, send)
+        else:
+            await response(scope, receive, send)
+
+    async def _stored_response(self, key: str, fingerprint: str) -> Response | None:
+        """Return the response to replay, or None once the key is claimed."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._wait_seconds
+        while True:
+            pending = self._pending.get(key)
+            if pending is not None:
+                try:
+                    record = await asyncio.wait_for(
+                        asyncio.shield(pending), deadline - loop.time()
+                    )
+                except TimeoutError:
+                    return _in_progress()
+                if record is None:
+                    # First attempt failed, try to claim the key again
+                    continue
+            else:
+                record = await self._store().claim(key, fingerprint)
+                if record is None:
+                    return None
+
+            if record.fingerprint != fingerprint:
+                return _error(
+                    status.HTTP_422_UNPROCESSABLE_CONTENT,
+                    "Idempotency-Key was already used with another request.",
+                )
+            if not record.in_flight:
+                return Response(
+                    record.body,
+                    status_code=record.status_code or status.HTTP_200_OK,
+                    media_type=record.content_type or None,
+                    headers={"Idempotent-Replayed": "true"},
+                )
+            # In flight on another instance
+            if loop.time() >= deadline:
+                return _in_progress()
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    async def _run(
+        self, key: str, fingerprint: str, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        pending = asyncio.get_running_loop().create_future()
+        self._pending[key] = pending
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        content_type = ""
+        chunks: list[bytes] = []
+
+        async def capture_send(message: Message) -> None:
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    if name == b"content-type":
+                        content_type = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        record = None
+        try:
+            await self._app(scope, receive, capture_send)
+            if status_code < status.HTTP_500_INTERNAL_SERVER_ERROR:
+                record = IdempotencyRecord(
+                    fingerprint, status_code, content_type, b"".join(chunks)
+                )
+                await self._store().complete(key, record)
+        finally:
+            if record is None:
+                await self._store().release(key)
+            del self._pending[key]
+            pending.set_result(record)
+
+
+def _header(scope: Scope, header: bytes) -> str | None:
+    for name, value in scope["headers"]:
+        if name == header:
+            return value.decode("latin-1")
+    return None
+
+
+def _error(status_code: int, message: str) -> JSONBytesResponse:
+    return JSONBytesResponse({"message": message}, status_code=status_code)
+
+
+def _in_progress() -> JSONBytesResponse:
+    return _error(
+        status.HTTP_409_CONFLICT,
+        "A request with this Idempotency-Key is still in progress.",
+    )
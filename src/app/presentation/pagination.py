@@ -0,0 +1,32 @@
+"""Opaque keyset pagination cursors"""
+
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(created_at: datetime, user_id: UUID) -> str:
+    """The (created_at, id) of the last user of a page, URL safe"""
+    raw = f"{created_at.isoformat()}|{user_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, user_id = raw.split("|")
+        after = datetime.fromisoformat(created_at), UUID(user_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise _invalid_cursor() from exc
+    if after[0].tzinfo is None:
+        raise _invalid_cursor()
+    return after
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+    )
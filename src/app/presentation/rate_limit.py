@@ -0,0 +1,129 @@
+"""Rate limiting middleware."""
+
+import base64
+import binascii
+import math
+from collections.abc import Callable, Mapping
+
+import orjson
+from fastapi import status
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.application.ports.rate_limiter import RateLimiter
+from app.config import RateLimitRule, RouteRateLimit
+from app.domain import Email
+from app.domain.exceptions import InvalidEmailError
+from app.presentation.asgi import read_body
+from app.presentation.responses import JSONBytesResponse
+
+RATE_LIMITED_MESSAGE = "Too many requests, please retry later."
+
+
+class RateLimitMiddleware:
+    """
+    Token bucket rate limiting per client IP and per request email.
+
+    Runs before routing and body validation, so a throttled request costs a
+    rate limiter call and nothing else. The email is read from the Basic
+    auth username, or from the JSON body `email` field, and normalized with
+    the Email value object. Requests without a usable email are only limited
+    per IP, their validation errors are left to the route.
+
+    Basic auth credentials are only verified by the route, so their email
+    bucket is per email and IP: requests with bad credentials cannot lock
+    the owner of the email out, they only exhaust their own IP's buckets.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate_limiter: Callable[[], RateLimiter],
+        rules: Mapping[str, RouteRateLimit],
+    ) -> None:
+        self._app = app
+        self._rate_limiter = rate_limiter
+        self._rules = rules
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        rule = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            rule = self._rules.get(scope["path"])
+        if rule is None:
+            await self._app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        client = scope.get("client")
+        host = client[0] if client is not None else None
+        if rule.ip is not None and host is not None:
+            retry_after = await self._acquire(f"ip:{path}:{host}", rule.ip)
+            if retry_after:
+                await _too_many_requests(retry_after)(scope, receive, send)
+                return
+
+        if rule.email is not None:
+            email, credentials, receive = await _request_email(scope, receive)
+            if email is not None:
+                key = f"email:{path}:{email}"
+                if credentials and host is not None:
+                    key = f"{key}:{host}"
+                retry_after = await self._acquire(key, rule.email)
+                if retry_after:
+                    await _too_many_requests(retry_after)(scope, receive, send)
+                    return
+
+        await self._app(scope, receive, send)
+
+    async def _acquire(self, key: str, rule: RateLimitRule) -> float:
+        return await self._rate_limiter().acquire(
+            key, rule.capacity, rule.refill_per_second
+        )
+
+
+def _too_many_requests(retry_after: float) -> JSONBytesResponse:
+    return JSONBytesResponse(
+        {"message": RATE_LIMITED_MESSAGE},
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": str(math.ceil(retry_after))},
+    )
+
+
+async def _request_email(
+    scope: Scope, receive: Receive
+) -> tuple[Email | None, bool, Receive]:
+    """
+    Return the request email, whether it comes from unverified credentials,
+    and a receive that replays any body read.
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return _basic_auth_email(value), True, receive
+
+    body, receive = await read_body(receive)
+    if body is None:
+        return None, False, receive
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None, False, receive
+    if not isinstance(payload, dict) or not isinstance(payload.get("email"), str):
+        return None, False, receive
+    return _email(payload["email"]), False, receive
+
+
+def _basic_auth_email(authorization: bytes) -> Email | None:
+    scheme, _, credentials = authorization.partition(b" ")
+    if scheme.lower() != b"basic":
+        return None
+    try:
+        decoded = base64.b64decode(credentials, validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+    return _email(decoded.partition(":")[0])
+
+
+def _email(value: str) -> Email | None:
+    try:
+        return Email(value)
+    except InvalidEmailError:
+        return None
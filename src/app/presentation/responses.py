@@ -0,0 +1,138 @@
+"""
+Lean JSON responses.
+
+Routes return these directly, so FastAPI skips the response model
+validation and serialization pass: use case results are turned into bytes
+once with orjson. Response schemas are still declared on the routes for
+the OpenAPI docs.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi import Response, status
+from pydantic import ValidationError
+
+from app.application.dto.user_dto import (
+    ActivateUserResponse,
+    RegisterUserResponse,
+    RegisterUsersResult,
+    ResendCodeResponse,
+)
+from app.domain import User
+from app.presentation.exception_handlers import exception_status_code
+from app.presentation.pagination import encode_cursor
+from app.presentation.schemas.users import (
+    ACTIVATE_USER_MESSAGE,
+    REGISTER_USER_MESSAGE,
+)
+
+
+class JSONBytesResponse(Response):
+    """JSON response rendered with orjson, bytes content is sent as is."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content)
+
+
+def register_user_response(result: RegisterUserResponse) -> JSONBytesResponse:
+    return JSONBytesResponse(
+        {
+            "user_id": result.user_id.value,
+            "email": result.email.value,
+            "message": result.message,
+        },
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+def register_users_response(results: list[dict[str, Any]]) -> JSONBytesResponse:
+    registered = sum(result["status"] == status.HTTP_201_CREATED for result in results)
+    return JSONBytesResponse(
+        {
+            "registered": registered,
+            "failed": len(results) - registered,
+            "results": results,
+        },
+        status_code=status.HTTP_200_OK,
+    )
+
+
+def register_users_result(result: RegisterUsersResult) -> dict[str, Any]:
+    if result.error is not None:
+        return {
+            "email": result.email.value,
+            "status": exception_status_code(result.error),
+            "user_id": None,
+            "message": str(result.error),
+        }
+    return {
+        "email": result.email.value,
+        "status": status.HTTP_201_CREATED,
+        "user_id": result.user_id.value if result.user_id else None,
+        "message": REGISTER_USER_MESSAGE,
+    }
+
+
+def invalid_item_result(item: Any, error: Exception) -> dict[str, Any]:
+    email = item.get("email") if isinstance(item, dict) else None
+    if isinstance(error, ValidationError):
+        status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+        message = "; ".join(
+            f"{'.'.join(map(str, detail['loc']))}: {detail['msg']}"
+            for detail in error.errors()
+        )
+    else:
+        status_code = exception_status_code(error)
+        message = str(error)
+    return {
+        "email": email if isinstance(email, str) else None,
+        "status": status_code,
+        "user_id": None,
+        "message": message,
+    }
+
+
+def activate_user_response(result: ActivateUserResponse) -> JSONBytesResponse:
+    return JSONBytesResponse(
+        {
+            "user_id": result.user_id.value,
+            "email": result.email.value,
+            "is_active": result.is_active,
+            "message": ACTIVATE_USER_MESSAGE,
+        },
+        status_code=status.HTTP_200_OK,
+    )
+
+
+def resend_code_response(result: ResendCodeResponse) -> JSONBytesResponse:
+    return JSONBytesResponse(
+        {"email": result.email.value, "message": result.message},
+        status_code=status.HTTP_200_OK,
+    )
+
+
+def list_users_response(users: list[User], limit: int) -> JSONBytesResponse:
+    # A full page may be followed by more users
+    last = users[-1] if len(users) == limit else None
+    return JSONBytesResponse(
+        {
+            "users": [
+                {
+                    "user_id": user.id.value,
+                    "email": user.email.value,
+                    "is_active": user.is_active,
+                    "created_at": user.created_at,
+                }
+                for user in users
+            ],
+            "next_cursor": (
+                encode_cursor(last.created_at, last.id.value) if last else None
+            ),
+        },
+        status_code=status.HTTP_200_OK,
+    )
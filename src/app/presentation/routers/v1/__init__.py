@@ -1,6 +1,10 @@
 from fastapi import APIRouter
 
+from app.presentation.routers.v1.admin import router as admin_router
+from app.presentation.routers.v1.metrics import router as metrics_router
 from app.presentation.routers.v1.users import router as users_router
 
 router = APIRouter()
 router.include_router(users_router, prefix="/v1")
+router.include_router(metrics_router, prefix="/v1")
+router.include_router(admin_router, prefix="/v1")
@@ -0,0 +1,45 @@
+"""Admin router"""
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
+
+from app.application.ports.user_exporter import export_columns
+from app.presentation.dependencies import UserExporterDep, require_admin
+from app.presentation.export_encoders import MEDIA_TYPES, encode
+
+router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)]
+)
+
+
+@router.get(
+    "/users/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export all users",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {media_type: {} for media_type in MEDIA_TYPES.values()}
+        }
+    },
+)
+async def export_users(
+    exporter: UserExporterDep,
+    export_format: Literal["ndjson", "csv"] = "ndjson",
+    with_password_hash: bool = False,  # noqa: FBT001 FBT002 query parameter
+) -> StreamingResponse:
+    """
+    Stream every user of every shard as NDJSON or CSV, in bounded chunks
+    read from a server-side cursor
+    """
+    batches = exporter(with_password_hash=with_password_hash)
+    columns = export_columns(with_password_hash=with_password_hash)
+    return StreamingResponse(
+        encode(batches, export_format, columns),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="users.{export_format}"'
+        },
+    )
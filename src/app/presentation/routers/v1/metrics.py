@@ -0,0 +1,19 @@
+"""Metrics router"""
+
+from fastapi import APIRouter, Depends, status
+
+from app.presentation.dependencies import MetricsDep, require_admin
+
+router = APIRouter(
+    prefix="/metrics", tags=["metrics"], dependencies=[Depends(require_admin)]
+)
+
+
+@router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    summary="Service metrics",
+)
+async def get_metrics(metrics: MetricsDep) -> dict[str, dict[str, object]]:
+    """Single-flight counts per use case, user cache hit rate, last user purges"""
+    return metrics
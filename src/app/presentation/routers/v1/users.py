@@ -1,46 +1,147 @@
 """Users router"""
 
-from fastapi import APIRouter, status
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Query, Request, status
+from pydantic import ValidationError
 
 from app.application.dto.user_dto import (
     ActivateUserRequest,
     RegisterUserRequest,
+    RegisterUsersItem,
     ResendCodeRequest,
 )
+from app.application.ports.user_lister import FIRST_PAGE
+from app.config import settings
 from app.domain import Email, Password, VerificationCode
+from app.domain.exceptions import DomainError
+from app.presentation.batch import NDJSON_MEDIA_TYPE, read_batch
 from app.presentation.dependencies import (
     ActivateUserUseCaseDep,
     HTTPEmailPasswordBasicCredentialsDep,
+    RegisterUsersUseCaseDep,
     RegisterUserUseCaseDep,
     ResendCodeUseCaseDep,
+    UserListerDep,
+    require_admin,
+)
+from app.presentation.pagination import decode_cursor
+from app.presentation.responses import (
+    JSONBytesResponse,
+    activate_user_response,
+    invalid_item_result,
+    list_users_response,
+    register_user_response,
+    register_users_response,
+    register_users_result,
+    resend_code_response,
 )
 from app.presentation.schemas.users import (
     ActivateRequestSchema,
     ActivateResponseSchema,
+    RegisterBatchResponseSchema,
     RegisterRequestSchema,
     RegisterResponseSchema,
     ResendCodeResponseSchema,
+    UserPageSchema,
 )
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
+@router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    summary="List users",
+    response_model=UserPageSchema,
+    response_class=JSONBytesResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def list_users(
+    lister: UserListerDep,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: str | None = None,
+    is_active: bool | None = None,  # noqa: FBT001 query parameter
+    email_prefix: Annotated[str | None, Query(min_length=1, max_length=255)] = None,
+) -> JSONBytesResponse:
+    """
+    Admin: users in registration order, a page at a time. The next page
+    starts after the `next_cursor` of the previous one, however deep.
+    """
+    users = await lister(
+        limit,
+        decode_cursor(cursor) if cursor else FIRST_PAGE,
+        is_active=is_active,
+        email_prefix=email_prefix,
+    )
+    return list_users_response(users, limit)
+
+
 @router.post(
     "/register",
     status_code=status.HTTP_201_CREATED,
     summary="Register a new user",
+    response_model=RegisterResponseSchema,
+    response_class=JSONBytesResponse,
 )
 async def register_user(
     request: RegisterRequestSchema, use_case: RegisterUserUseCaseDep
-) -> RegisterResponseSchema:
+) -> JSONBytesResponse:
     """Register a new user"""
     dto = RegisterUserRequest(Email(request.email), Password.create(request.password))
     result = await use_case.execute(dto)
 
-    return RegisterResponseSchema(
-        user_id=result.user_id.value,
-        email=result.email.value,
-        message=result.message,
+    return register_user_response(result)
+
+
+@router.post(
+    "/register:batch",
+    status_code=status.HTTP_200_OK,
+    summary="Register a batch of users",
+    response_model=RegisterBatchResponseSchema,
+    response_class=JSONBytesResponse,
+    dependencies=[Depends(require_admin)],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": RegisterRequestSchema.model_json_schema(),
+                    }
+                },
+                NDJSON_MEDIA_TYPE: {
+                    "schema": RegisterRequestSchema.model_json_schema()
+                },
+            },
+        }
+    },
+)
+async def register_users(
+    request: Request, use_case: RegisterUsersUseCaseDep
+) -> JSONBytesResponse:
+    """
+    Admin: register a batch of users, from a JSON array of register
+    requests or NDJSON with one per line. Each item gets its own result and
+    status.
+    """
+    items = await read_batch(request, settings.register_batch_max_items)
+
+    valid: list[RegisterUsersItem] = []
+    results: list[dict[str, Any] | None] = []
+    for item in items:
+        try:
+            schema = RegisterRequestSchema.model_validate(item)
+            valid.append(RegisterUsersItem(Email(schema.email), schema.password))
+        except (ValidationError, DomainError) as exc:
+            results.append(invalid_item_result(item, exc))
+        else:
+            results.append(None)
+
+    registered = iter(await use_case.execute(valid))
+    return register_users_response(
+        [result or register_users_result(next(registered)) for result in results]
     )
 
 
@@ -48,12 +149,14 @@ async def register_user(
     "/activate",
     status_code=status.HTTP_200_OK,
     summary="Activate user account",
+    response_model=ActivateResponseSchema,
+    response_class=JSONBytesResponse,
 )
 async def activate_user(
     request: ActivateRequestSchema,
     use_case: ActivateUserUseCaseDep,
     credentials: HTTPEmailPasswordBasicCredentialsDep,
-) -> ActivateResponseSchema:
+) -> JSONBytesResponse:
     """Activate user account"""
     dto = ActivateUserRequest(
         email=Email(credentials.email),
@@ -62,22 +165,20 @@ async def activate_user(
     )
     result = await use_case.execute(dto)
 
-    return ActivateResponseSchema(
-        user_id=result.user_id.value,
-        email=result.email.value,
-        is_active=result.is_active,
-    )
+    return activate_user_response(result)
 
 
 @router.post(
     "/resend-code",
     status_code=status.HTTP_200_OK,
     summary="Resend verification code",
+    response_model=ResendCodeResponseSchema,
+    response_class=JSONBytesResponse,
 )
 async def resend_code(
     use_case: ResendCodeUseCaseDep,
     credentials: HTTPEmailPasswordBasicCredentialsDep,
-) -> ResendCodeResponseSchema:
+) -> JSONBytesResponse:
     """Resend verification code"""
     dto = ResendCodeRequest(
         Email(credentials.email),
@@ -85,7 +186,4 @@ async def resend_code(
     )
     result = await use_case.execute(dto)
 
-    return ResendCodeResponseSchema(
-        email=result.email.value,
-        message=result.message,
-    )
+    return resend_code_response(result)
@@ -1,9 +1,16 @@
 """API request/response schemas."""
 
+from datetime import datetime
 from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field
 
+REGISTER_USER_MESSAGE = (
+    "User registered. "
+    "Please check your email for verification code to activate your account."
+)
+ACTIVATE_USER_MESSAGE = "Account activated successfully."
+
 
 class RegisterRequestSchema(BaseModel):
     email: EmailStr
@@ -13,10 +20,20 @@ class RegisterRequestSchema(BaseModel):
 class RegisterResponseSchema(BaseModel):
     user_id: UUID
     email: EmailStr
-    message: str = (
-        "User registered. "
-        "Please check your email for verification code to activate your account."
-    )
+    message: str = REGISTER_USER_MESSAGE
+
+
+class RegisterBatchResultSchema(BaseModel):
+    email: str | None
+    status: int
+    user_id: UUID | None = None
+    message: str
+
+
+class RegisterBatchResponseSchema(BaseModel):
+    registered: int
+    failed: int
+    results: list[RegisterBatchResultSchema]
 
 
 class ActivateRequestSchema(BaseModel):
@@ -27,9 +44,21 @@ class ActivateResponseSchema(BaseModel):
     user_id: UUID
     email: EmailStr
     is_active: bool = True
-    message: str = "Account activated successfully."
+    message: str = ACTIVATE_USER_MESSAGE
 
 
 class ResendCodeResponseSchema(BaseModel):
     email: EmailStr
     message: str = "New verification code has been sent"
+
+
+class UserSchema(BaseModel):
+    user_id: UUID
+    email: EmailStr
+    is_active: bool
+    created_at: datetime
+
+
+class UserPageSchema(BaseModel):
+    users: list[UserSchema]
+    next_cursor: str | None = None
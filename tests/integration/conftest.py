@@ -18,7 +18,9 @@ from app.main import app
 async def reset_postgres() -> None:
     conn = await asyncpg.connect(settings.database_url)
     try:
-        await conn.execute("TRUNCATE TABLE users RESTART IDENTITY CASCADE;")
+        await conn.execute(
+            "TRUNCATE TABLE users, user_emails RESTART IDENTITY CASCADE;"
+        )
     finally:
         await conn.close()
 
@@ -1,4 +1,5 @@
 from unittest.mock import Mock
+from uuid import uuid4
 
 from fastapi import status
 from httpx import AsyncClient, BasicAuth
@@ -45,6 +46,23 @@ async def test_resend_verification_code_success(
     assert "New verification code has been sent" in data["message"]
 
 
+async def test_resend_verification_code_inside_cooldown(
+    async_client: AsyncClient,
+) -> None:
+    # A user of its own, whatever the tests run before
+    email = f"cooldown-{uuid4().hex}@example.com"
+    auth = BasicAuth(email, TEST_PASSWORD)
+    payload = {"email": email, "password": TEST_PASSWORD}
+    response = await async_client.post("/v1/users/register", json=payload)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = await async_client.post("/v1/users/resend-code", auth=auth)
+    assert response.status_code == status.HTTP_200_OK
+    response = await async_client.post("/v1/users/resend-code", auth=auth)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) > 0
+
+
 async def test_activate_user_failed_with_old_code(
     async_client: AsyncClient,
 ) -> None:
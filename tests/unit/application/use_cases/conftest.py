@@ -8,6 +8,9 @@ from app.application.dto.user_dto import (
 from app.domain import Email, Password, VerificationCode
 from tests.unit.fakes.fake_code_store import FakeCodeStore
 from tests.unit.fakes.fake_event_publisher import FakeEventPublisher
+from tests.unit.fakes.fake_pending_registration_store import (
+    FakePendingRegistrationStore,
+)
 from tests.unit.fakes.fake_unit_of_work import FakeUnitOfWork
 from tests.unit.fakes.fake_user_repository import FakeUserRepository
 
@@ -27,6 +30,11 @@ def event_publisher() -> FakeEventPublisher:
     return FakeEventPublisher()
 
 
+@pytest.fixture
+def pending_registrations() -> FakePendingRegistrationStore:
+    return FakePendingRegistrationStore()
+
+
 @pytest.fixture
 def user_repository() -> FakeUserRepository:
     return FakeUserRepository()
@@ -4,6 +4,7 @@ import pytest
 
 from app.application.dto.user_dto import ActivateUserRequest
 from app.application.exceptions import (
+    ConcurrentUpdateError,
     InvalidCredentialsError,
     UserNotFoundError,
     VerificationCodeExpiredError,
@@ -13,6 +14,9 @@ from app.application.use_cases.activate_user import ActivateUserUseCase
 from app.domain import Email, Password, User, UserActivated, VerificationCode
 from tests.unit.fakes.fake_code_store import FakeCodeStore
 from tests.unit.fakes.fake_event_publisher import FakeEventPublisher
+from tests.unit.fakes.fake_pending_registration_store import (
+    FakePendingRegistrationStore,
+)
 from tests.unit.fakes.fake_unit_of_work import FakeUnitOfWork
 
 
@@ -27,7 +31,7 @@ class TestActivateUserUseCase:
         event_publisher: FakeEventPublisher,
     ) -> ActivateUserUseCase:
         return ActivateUserUseCase(
-            uow=uow,
+            uow_factory=lambda: uow,
             code_store=code_store,
             event_publisher=event_publisher,
         )
@@ -128,6 +132,21 @@ class TestActivateUserUseCase:
         with pytest.raises(InvalidCredentialsError):
             await use_case.execute(request)
 
+    async def test_concurrent_save_raises_error(
+        self,
+        use_case: ActivateUserUseCase,
+        activate_request: ActivateUserRequest,
+        uow: FakeUnitOfWork,
+        code_store: FakeCodeStore,
+        registered_user: User,
+    ) -> None:
+        uow.user_repository.save_elsewhere(registered_user.id)
+
+        with pytest.raises(ConcurrentUpdateError):
+            await use_case.execute(activate_request)
+
+        assert await code_store.get(activate_request.email) is not None
+
     async def test_expired_code_raises_error(
         self,
         use_case: ActivateUserUseCase,
@@ -154,3 +173,74 @@ class TestActivateUserUseCase:
 
         with pytest.raises(VerificationCodeInvalidError):
             await use_case.execute(request)
+
+
+class TestActivateUserUseCaseWithPendingRegistrations:
+    """Tests for ActivateUserUseCase activating pending registrations."""
+
+    @pytest.fixture
+    def use_case(
+        self,
+        uow: FakeUnitOfWork,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+        pending_registrations: FakePendingRegistrationStore,
+    ) -> ActivateUserUseCase:
+        return ActivateUserUseCase(
+            uow_factory=lambda: uow,
+            code_store=code_store,
+            event_publisher=event_publisher,
+            pending_registrations=pending_registrations,
+        )
+
+    @pytest.fixture
+    async def pending_user(
+        self,
+        code_store: FakeCodeStore,
+        pending_registrations: FakePendingRegistrationStore,
+        code: VerificationCode,
+    ) -> User:
+        user = User.create(
+            email=Email("user@example.com"),
+            password=Password.create("securepassword123"),
+        )
+        await code_store.save(user.email, code)
+        user.collect_events()  # Clear creation event
+        await pending_registrations.add(user)
+        return user
+
+    async def test_pending_user_is_saved_on_activation(
+        self,
+        use_case: ActivateUserUseCase,
+        activate_request: ActivateUserRequest,
+        uow: FakeUnitOfWork,
+        pending_registrations: FakePendingRegistrationStore,
+        pending_user: User,
+    ) -> None:
+        response = await use_case.execute(activate_request)
+
+        assert response.user_id == pending_user.id
+        saved = await uow.user_repository.get_by_email(pending_user.email)
+        assert saved is not None
+        assert saved.is_active is True
+        assert await pending_registrations.get(pending_user.email) is None
+
+    async def test_failed_activation_keeps_pending_user(
+        self,
+        use_case: ActivateUserUseCase,
+        activate_request: ActivateUserRequest,
+        uow: FakeUnitOfWork,
+        pending_registrations: FakePendingRegistrationStore,
+        pending_user: User,
+    ) -> None:
+        request = ActivateUserRequest(
+            email=activate_request.email,
+            password=activate_request.password,
+            code=VerificationCode.generate(),
+        )
+
+        with pytest.raises(VerificationCodeInvalidError):
+            await use_case.execute(request)
+
+        assert await uow.user_repository.get_by_email(pending_user.email) is None
+        assert await pending_registrations.get(pending_user.email) is not None
@@ -7,7 +7,11 @@ from app.application.exceptions import UserAlreadyExistsError
 from app.application.use_cases.register_user import RegisterUserUseCase
 from app.domain import Email, Password, User, UserRegistered, VerificationCode
 from tests.unit.fakes.fake_code_store import FakeCodeStore
+from tests.unit.fakes.fake_email_filter import FakeEmailFilter
 from tests.unit.fakes.fake_event_publisher import FakeEventPublisher
+from tests.unit.fakes.fake_pending_registration_store import (
+    FakePendingRegistrationStore,
+)
 from tests.unit.fakes.fake_unit_of_work import FakeUnitOfWork
 
 
@@ -22,7 +26,7 @@ class TestRegisterUserUseCase:
         event_publisher: FakeEventPublisher,
     ) -> RegisterUserUseCase:
         return RegisterUserUseCase(
-            uow=uow,
+            uow_factory=lambda: uow,
             code_store=code_store,
             event_publisher=event_publisher,
         )
@@ -107,3 +111,154 @@ class TestRegisterUserUseCase:
         assert user is not None
         assert user.password.hashed_value != "securepassword123"
         assert user.verify_password("securepassword123") is True
+
+    async def test_register_user_opens_unit_of_work_per_call(
+        self,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+        password: Password,
+    ) -> None:
+        uows: list[FakeUnitOfWork] = []
+
+        def uow_factory() -> FakeUnitOfWork:
+            uows.append(FakeUnitOfWork())
+            return uows[-1]
+
+        use_case = RegisterUserUseCase(
+            uow_factory=uow_factory,
+            code_store=code_store,
+            event_publisher=event_publisher,
+        )
+        await use_case.execute(RegisterUserRequest(Email("a@example.com"), password))
+        await use_case.execute(RegisterUserRequest(Email("b@example.com"), password))
+
+        first, second = uows
+        assert first is not second
+
+
+class TestRegisterUserUseCaseWithEmailFilter:
+    """Tests for RegisterUserUseCase with an email filter."""
+
+    @pytest.fixture
+    def email_filter(self) -> FakeEmailFilter:
+        return FakeEmailFilter()
+
+    @pytest.fixture
+    def use_case(
+        self,
+        uow: FakeUnitOfWork,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+        email_filter: FakeEmailFilter,
+    ) -> RegisterUserUseCase:
+        return RegisterUserUseCase(
+            uow_factory=lambda: uow,
+            code_store=code_store,
+            event_publisher=event_publisher,
+            email_filter=email_filter,
+        )
+
+    async def test_new_email_is_added_to_filter(
+        self,
+        use_case: RegisterUserUseCase,
+        register_request: RegisterUserRequest,
+        email_filter: FakeEmailFilter,
+        email: Email,
+    ) -> None:
+        await use_case.execute(register_request)
+
+        assert email_filter.checked == [email.value]
+        assert email_filter.emails == {email.value}
+
+    async def test_existing_email_in_filter_raises_error(
+        self,
+        use_case: RegisterUserUseCase,
+        uow: FakeUnitOfWork,
+        email_filter: FakeEmailFilter,
+        register_request: RegisterUserRequest,
+        email: Email,
+        password: Password,
+    ) -> None:
+        await uow.user_repository.save(User.create(email=email, password=password))
+        email_filter.emails.add(email.value)
+
+        with pytest.raises(UserAlreadyExistsError):
+            await use_case.execute(register_request)
+
+    async def test_unique_constraint_is_final_authority(
+        self,
+        use_case: RegisterUserUseCase,
+        uow: FakeUnitOfWork,
+        register_request: RegisterUserRequest,
+        email: Email,
+        password: Password,
+    ) -> None:
+        # Filter wrongly rules the email out: lookup skipped, save refuses it
+        await uow.user_repository.save(User.create(email=email, password=password))
+
+        with pytest.raises(UserAlreadyExistsError):
+            await use_case.execute(register_request)
+
+
+class TestRegisterUserUseCaseWithPendingRegistrations:
+    """Tests for RegisterUserUseCase keeping users pending until activation."""
+
+    @pytest.fixture
+    def use_case(
+        self,
+        uow: FakeUnitOfWork,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+        pending_registrations: FakePendingRegistrationStore,
+    ) -> RegisterUserUseCase:
+        return RegisterUserUseCase(
+            uow_factory=lambda: uow,
+            code_store=code_store,
+            event_publisher=event_publisher,
+            pending_registrations=pending_registrations,
+        )
+
+    async def test_user_is_pending_not_saved(
+        self,
+        use_case: RegisterUserUseCase,
+        uow: FakeUnitOfWork,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+        pending_registrations: FakePendingRegistrationStore,
+        register_request: RegisterUserRequest,
+        email: Email,
+    ) -> None:
+        response = await use_case.execute(register_request)
+
+        pending = await pending_registrations.get(email)
+        assert pending is not None
+        assert pending.id == response.user_id
+        assert await uow.user_repository.get_by_email(email) is None
+        assert await code_store.get(email) is not None
+        assert isinstance(event_publisher.published_events[0], UserRegistered)
+
+    async def test_pending_email_raises_error(
+        self,
+        use_case: RegisterUserUseCase,
+        register_request: RegisterUserRequest,
+    ) -> None:
+        await use_case.execute(register_request)
+
+        with pytest.raises(UserAlreadyExistsError):
+            await use_case.execute(register_request)
+
+    async def test_saved_email_raises_error_and_releases_claim(
+        self,
+        use_case: RegisterUserUseCase,
+        uow: FakeUnitOfWork,
+        pending_registrations: FakePendingRegistrationStore,
+        register_request: RegisterUserRequest,
+        email: Email,
+        password: Password,
+    ) -> None:
+        await uow.user_repository.save(User.create(email=email, password=password))
+
+        with pytest.raises(UserAlreadyExistsError):
+            await use_case.execute(register_request)
+
+        assert await pending_registrations.get(email) is None
@@ -0,0 +1,222 @@
+"""Unit tests for RegisterUsersUseCase"""
+
+import threading
+import time
+from types import TracebackType
+
+import pytest
+
+from app.application.dto.user_dto import RegisterUsersItem
+from app.application.exceptions import PartialCommitError, UserAlreadyExistsError
+from app.application.use_cases import register_users
+from app.application.use_cases.register_users import RegisterUsersUseCase
+from app.domain import Email, Password, User, UserRegistered
+from app.domain.exceptions import InvalidPasswordError
+from tests.unit.fakes.fake_code_store import FakeCodeStore
+from tests.unit.fakes.fake_email_filter import FakeEmailFilter
+from tests.unit.fakes.fake_event_publisher import FakeEventPublisher
+from tests.unit.fakes.fake_pending_registration_store import (
+    FakePendingRegistrationStore,
+)
+from tests.unit.fakes.fake_unit_of_work import FakeUnitOfWork
+
+
+def item(
+    email: str,
+    password: str = "securepassword123",  # noqa: S107 Possible hardcoded password
+) -> RegisterUsersItem:
+    return RegisterUsersItem(Email(email), password)
+
+
+class PartialCommitUnitOfWork(FakeUnitOfWork):
+    """Reports some users saved only, as sharded databases whose commit
+    failed after the first shard committed"""
+
+    def __init__(self, saved: list[Email]) -> None:
+        super().__init__()
+        self._saved = saved
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+        if exc_type is None:
+            saved = [
+                user.id
+                for email in self._saved
+                if (user := await self.user_repository.get_by_email(email))
+            ]
+            raise PartialCommitError([0], 1, saved)
+
+
+class TestRegisterUsersUseCase:
+    """Tests for RegisterUsersUseCase"""
+
+    @pytest.fixture
+    def email_filter(self) -> FakeEmailFilter:
+        return FakeEmailFilter()
+
+    @pytest.fixture
+    def use_case(
+        self,
+        uow: FakeUnitOfWork,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+        email_filter: FakeEmailFilter,
+    ) -> RegisterUsersUseCase:
+        return RegisterUsersUseCase(
+            uow_factory=lambda: uow,
+            code_store=code_store,
+            event_publisher=event_publisher,
+            email_filter=email_filter,
+            chunk_size=2,
+        )
+
+    async def test_registers_every_user(
+        self,
+        use_case: RegisterUsersUseCase,
+        uow: FakeUnitOfWork,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+        email_filter: FakeEmailFilter,
+    ) -> None:
+        emails = [f"user{index}@example.com" for index in range(5)]
+
+        results = await use_case.execute([item(email) for email in emails])
+
+        assert [result.email.value for result in results] == emails
+        assert all(result.error is None for result in results)
+        for result in results:
+            user = await uow.user_repository.get_by_email(result.email)
+            assert user is not None
+            assert user.id == result.user_id
+            assert await code_store.get(result.email) is not None
+        assert [event.email.value for event in event_publisher.published_events] == (
+            emails
+        )
+        assert all(
+            isinstance(event, UserRegistered)
+            for event in event_publisher.published_events
+        )
+        assert email_filter.emails == set(emails)
+
+    async def test_failed_items_do_not_fail_the_batch(
+        self,
+        use_case: RegisterUsersUseCase,
+        uow: FakeUnitOfWork,
+        event_publisher: FakeEventPublisher,
+    ) -> None:
+        await uow.user_repository.save(
+            User.create(Email("taken@example.com"), Password.from_hash("hash"))
+        )
+
+        results = await use_case.execute(
+            [
+                item("taken@example.com"),
+                item("new@example.com"),
+                item("short@example.com", "short"),
+                item("new@example.com"),
+            ]
+        )
+
+        errors = [type(result.error) for result in results]
+        assert errors == [
+            UserAlreadyExistsError,
+            type(None),
+            InvalidPasswordError,
+            UserAlreadyExistsError,
+        ]
+        assert results[1].user_id is not None
+        assert [event.email.value for event in event_publisher.published_events] == [
+            "new@example.com"
+        ]
+
+    async def test_partial_commit_reports_the_saved_users(
+        self, code_store: FakeCodeStore, event_publisher: FakeEventPublisher
+    ) -> None:
+        uow = PartialCommitUnitOfWork(saved=[Email("a@example.com")])
+        await uow.user_repository.save(
+            User.create(Email("taken@example.com"), Password.from_hash("hash"))
+        )
+        use_case = RegisterUsersUseCase(
+            uow_factory=lambda: uow,
+            code_store=code_store,
+            event_publisher=event_publisher,
+        )
+
+        results = await use_case.execute(
+            [item("a@example.com"), item("b@example.com"), item("taken@example.com")]
+        )
+
+        assert results[0].error is None
+        assert results[0].user_id is not None
+        assert isinstance(results[1].error, PartialCommitError)
+        assert isinstance(results[2].error, UserAlreadyExistsError)
+
+    async def test_empty_batch(self, use_case: RegisterUsersUseCase) -> None:
+        assert await use_case.execute([]) == []
+
+    async def test_pending_emails_are_not_saved(
+        self,
+        uow: FakeUnitOfWork,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+        pending_registrations: FakePendingRegistrationStore,
+    ) -> None:
+        pending = User.create(
+            email=Email("pending@example.com"), password=Password.from_hash("hash")
+        )
+        await pending_registrations.add(pending)
+        use_case = RegisterUsersUseCase(
+            uow_factory=lambda: uow,
+            code_store=code_store,
+            event_publisher=event_publisher,
+            pending_registrations=pending_registrations,
+        )
+
+        results = await use_case.execute(
+            [item("pending@example.com"), item("new@example.com")]
+        )
+
+        assert isinstance(results[0].error, UserAlreadyExistsError)
+        assert results[1].error is None
+        assert await uow.user_repository.get_by_email(pending.email) is None
+        assert await pending_registrations.get(pending.email) is pending
+        # The claim of the saved user is released
+        assert await pending_registrations.get(Email("new@example.com")) is None
+
+    async def test_hashes_run_at_most_hash_concurrency_at_a_time(
+        self,
+        uow: FakeUnitOfWork,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def hash_password(_plain_password: str) -> Password:
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return Password.from_hash("hash")
+
+        monkeypatch.setattr(register_users, "_hash_password", hash_password)
+        use_case = RegisterUsersUseCase(
+            uow_factory=lambda: uow,
+            code_store=code_store,
+            event_publisher=event_publisher,
+            hash_concurrency=2,
+        )
+
+        await use_case.execute([item(f"user{index}@example.com") for index in range(8)])
+
+        assert peak == 2  # noqa: PLR2004 Magic value used in comparison
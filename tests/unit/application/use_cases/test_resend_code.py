@@ -3,7 +3,11 @@
 import pytest
 
 from app.application.dto.user_dto import ResendCodeRequest
-from app.application.exceptions import InvalidCredentialsError, UserNotFoundError
+from app.application.exceptions import (
+    InvalidCredentialsError,
+    ResendCooldownError,
+    UserNotFoundError,
+)
 from app.application.use_cases.resend_code import ResendCodeUseCase
 from app.domain import (
     Email,
@@ -14,6 +18,9 @@ from app.domain import (
 )
 from tests.unit.fakes.fake_code_store import FakeCodeStore
 from tests.unit.fakes.fake_event_publisher import FakeEventPublisher
+from tests.unit.fakes.fake_pending_registration_store import (
+    FakePendingRegistrationStore,
+)
 from tests.unit.fakes.fake_unit_of_work import FakeUnitOfWork
 
 
@@ -28,7 +35,7 @@ class TestResendCodeUseCase:
         event_publisher: FakeEventPublisher,
     ) -> ResendCodeUseCase:
         return ResendCodeUseCase(
-            uow=uow,
+            uow_factory=lambda: uow,
             code_store=code_store,
             event_publisher=event_publisher,
         )
@@ -117,3 +124,92 @@ class TestResendCodeUseCase:
 
         with pytest.raises(InvalidCredentialsError):
             await use_case.execute(request)
+
+    async def test_inside_cooldown_raises_error_before_user_lookup(
+        self,
+        use_case: ResendCodeUseCase,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+    ) -> None:
+        request = ResendCodeRequest(
+            email=Email("nonexistent@example.com"),
+            password="wrongpassword",  # noqa: S106 Possible hardcoded password
+        )
+        code_store.cooldowns[request.email.value] = 12.5
+
+        with pytest.raises(ResendCooldownError) as exc_info:
+            await use_case.execute(request)
+
+        assert exc_info.value.retry_after == pytest.approx(12.5)
+        assert await code_store.get(request.email) is None
+        assert event_publisher.published_events == []
+
+    async def test_cooldown_starts_after_the_credentials_check(
+        self,
+        use_case: ResendCodeUseCase,
+        resend_code_request: ResendCodeRequest,
+        code_store: FakeCodeStore,
+        registered_user: User,  # noqa: ARG002 Unused method argument
+    ) -> None:
+        await use_case.execute(resend_code_request)
+
+        assert code_store.started_cooldowns == [resend_code_request.email.value]
+
+    async def test_wrong_password_does_not_start_the_cooldown(
+        self,
+        use_case: ResendCodeUseCase,
+        resend_code_request: ResendCodeRequest,
+        code_store: FakeCodeStore,
+        registered_user: User,  # noqa: ARG002 Unused method argument
+    ) -> None:
+        request = ResendCodeRequest(
+            email=resend_code_request.email,
+            password="wrongpassword",  # noqa: S106 Possible hardcoded password
+        )
+
+        with pytest.raises(InvalidCredentialsError):
+            await use_case.execute(request)
+
+        assert code_store.started_cooldowns == []
+
+    async def test_unknown_email_does_not_start_the_cooldown(
+        self,
+        use_case: ResendCodeUseCase,
+        resend_code_request: ResendCodeRequest,
+        code_store: FakeCodeStore,
+    ) -> None:
+        with pytest.raises(UserNotFoundError):
+            await use_case.execute(resend_code_request)
+
+        assert code_store.started_cooldowns == []
+
+
+class TestResendCodeUseCaseWithPendingRegistrations:
+    """Tests for ResendCodeUseCase with pending registrations."""
+
+    async def test_resend_code_to_pending_user(
+        self,
+        uow: FakeUnitOfWork,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+        pending_registrations: FakePendingRegistrationStore,
+        resend_code_request: ResendCodeRequest,
+    ) -> None:
+        user = User.create(
+            email=resend_code_request.email,
+            password=Password.create(resend_code_request.password),
+        )
+        await pending_registrations.add(user)
+        use_case = ResendCodeUseCase(
+            uow_factory=lambda: uow,
+            code_store=code_store,
+            event_publisher=event_publisher,
+            pending_registrations=pending_registrations,
+        )
+
+        await use_case.execute(resend_code_request)
+
+        assert await code_store.get(user.email) is not None
+        event = event_publisher.published_events[0]
+        assert isinstance(event, UserNewVerificationCodeCreated)
+        assert event.user_id == user.id
@@ -0,0 +1,126 @@
+"""Unit tests for SingleFlight."""
+
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from app.application.use_cases.single_flight import SingleFlight
+from tests.unit.fakes.fake_distributed_lock import FakeDistributedLock
+
+
+@dataclass(frozen=True, slots=True)
+class Request:
+    email: str
+    password: str
+
+
+class SlowUseCase:
+    """Use case held open until released."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.error: Exception | None = None
+
+    async def execute(self, request: Request) -> str:
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return f"{request.email}:{self.calls}"
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    @pytest.fixture
+    def use_case(self) -> SlowUseCase:
+        return SlowUseCase()
+
+    @pytest.fixture
+    def single_flight(self, use_case: SlowUseCase) -> SingleFlight[Request, str]:
+        return SingleFlight("slow", use_case)
+
+    async def run_concurrently(
+        self,
+        single_flight: SingleFlight[Request, str],
+        use_case: SlowUseCase,
+        *requests: Request,
+    ) -> list[str | BaseException]:
+        tasks = [
+            asyncio.create_task(single_flight.execute(request)) for request in requests
+        ]
+        await asyncio.sleep(0)
+        use_case.release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def test_identical_requests_run_once(
+        self, single_flight: SingleFlight[Request, str], use_case: SlowUseCase
+    ) -> None:
+        request = Request("a@example.com", "password")
+
+        results = await self.run_concurrently(
+            single_flight, use_case, request, request, request
+        )
+
+        assert results == ["a@example.com:1"] * 3
+        assert use_case.calls == 1
+        assert single_flight.metrics() == {"calls": 3, "coalesced": 2}
+
+    async def test_different_requests_run_separately(
+        self, single_flight: SingleFlight[Request, str], use_case: SlowUseCase
+    ) -> None:
+        await self.run_concurrently(
+            single_flight,
+            use_case,
+            Request("a@example.com", "password"),
+            Request("a@example.com", "other password"),
+        )
+
+        assert use_case.calls == 2  # noqa: PLR2004 Magic value used in comparison
+        assert single_flight.coalesced == 0
+
+    async def test_error_is_shared(
+        self, single_flight: SingleFlight[Request, str], use_case: SlowUseCase
+    ) -> None:
+        request = Request("a@example.com", "password")
+        use_case.error = ValueError("boom")
+
+        results = await self.run_concurrently(single_flight, use_case, request, request)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert use_case.calls == 1
+
+    async def test_sequential_requests_are_not_coalesced(
+        self, single_flight: SingleFlight[Request, str], use_case: SlowUseCase
+    ) -> None:
+        request = Request("a@example.com", "password")
+        use_case.release.set()
+
+        assert await single_flight.execute(request) == "a@example.com:1"
+        assert await single_flight.execute(request) == "a@example.com:2"
+
+    async def test_cancelled_caller_does_not_cancel_shared_call(
+        self, single_flight: SingleFlight[Request, str], use_case: SlowUseCase
+    ) -> None:
+        request = Request("a@example.com", "password")
+        first = asyncio.create_task(single_flight.execute(request))
+        second = asyncio.create_task(single_flight.execute(request))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        use_case.release.set()
+
+        assert await second == "a@example.com:1"
+
+    async def test_lock_is_held_per_lock_key(self, use_case: SlowUseCase) -> None:
+        lock = FakeDistributedLock()
+        single_flight = SingleFlight(
+            "slow", use_case, lock=lock, lock_key=lambda request: request.email
+        )
+        use_case.release.set()
+
+        await single_flight.execute(Request("a@example.com", "password"))
+
+        assert lock.keys == ["slow:a@example.com"]
@@ -0,0 +1,100 @@
+"""Unit tests for the import-users command."""
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from app.cli.import_users import ImportReport, read_checkpoint, run_import
+from app.domain import Email, Password
+from tests.unit.fakes.fake_unit_of_work import FakeUnitOfWork
+
+HASH = Password.create("legacypassword").hashed_value
+CSV = f"""email,password,hashed_password,is_active,created_at
+plain@example.com,securepassword123,,,
+hashed@example.com,,{HASH},true,2020-05-17T10:00:00+00:00
+not-an-email,securepassword123,,,
+short@example.com,short,,,
+plain@example.com,securepassword123,,,
+md5@example.com,,5f4dcc3b5aa765d61d8327deb882cf99,,
+truncated@example.com,,{HASH[:-1]},,
+"""
+
+
+class TestRunImport:
+    """Tests for run_import."""
+
+    @pytest.fixture
+    def path(self, tmp_path: Path) -> Path:
+        path = tmp_path / "users.csv"
+        path.write_text(CSV, encoding="utf-8")
+        return path
+
+    @pytest.fixture
+    def executor(self) -> Iterator[ThreadPoolExecutor]:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            yield executor
+
+    @pytest.fixture
+    def uow(self) -> FakeUnitOfWork:
+        return FakeUnitOfWork()
+
+    async def run(
+        self, path: Path, uow: FakeUnitOfWork, executor: ThreadPoolExecutor
+    ) -> ImportReport:
+        return await run_import(
+            path,
+            lambda: uow,
+            executor,
+            workers=2,
+            chunk_size=2,
+            checkpoint=path.with_suffix(".checkpoint"),
+        )
+
+    async def test_imports_valid_rows(
+        self, path: Path, uow: FakeUnitOfWork, executor: ThreadPoolExecutor
+    ) -> None:
+        report = await self.run(path, uow, executor)
+
+        assert (report.rows, report.imported, report.skipped, report.rejected) == (
+            7,
+            2,
+            1,
+            4,
+        )
+        plain = await uow.user_repository.get_by_email(Email("plain@example.com"))
+        assert plain is not None
+        assert plain.verify_password("securepassword123")
+        assert plain.is_active is False
+        hashed = await uow.user_repository.get_by_email(Email("hashed@example.com"))
+        assert hashed is not None
+        assert hashed.password.hashed_value == HASH
+        assert hashed.is_active is True
+        assert hashed.created_at == datetime(2020, 5, 17, 10, tzinfo=UTC)
+        for email in ("md5@example.com", "truncated@example.com"):
+            assert await uow.user_repository.get_by_email(Email(email)) is None
+
+    async def test_resumes_after_the_checkpoint(
+        self, path: Path, uow: FakeUnitOfWork, executor: ThreadPoolExecutor
+    ) -> None:
+        path.with_suffix(".checkpoint").write_text("2", encoding="utf-8")
+
+        report = await self.run(path, uow, executor)
+
+        assert (report.rows, report.imported, report.resumed) == (7, 1, 2)
+        assert report.rows_per_second == (7 - 2) / report.elapsed_seconds
+        assert (
+            await uow.user_repository.get_by_email(Email("hashed@example.com")) is None
+        )
+        assert read_checkpoint(path.with_suffix(".checkpoint")) == 7  # noqa: PLR2004 Magic value used in comparison
+
+    async def test_completed_import_is_not_run_again(
+        self, path: Path, uow: FakeUnitOfWork, executor: ThreadPoolExecutor
+    ) -> None:
+        await self.run(path, uow, executor)
+
+        report = await self.run(path, uow, executor)
+
+        assert (report.imported, report.rejected) == (0, 0)
@@ -61,6 +61,32 @@ class TestUserActivate:
             user.activate()
 
 
+class TestUserChanges:
+    """Tests for User change tracking."""
+
+    def test_new_user_is_version_0_without_changes(self, make_user) -> None:
+        user = make_user()
+
+        assert user.version == 0
+        assert user.changes == frozenset()
+
+    def test_activate_changes_is_active(self, make_user) -> None:
+        user = make_user()
+
+        user.activate()
+
+        assert user.changes == {"is_active"}
+
+    def test_mark_saved_increments_version_and_clears_changes(self, make_user) -> None:
+        user = make_user()
+        user.activate()
+
+        user.mark_saved()
+
+        assert user.version == 1
+        assert user.changes == frozenset()
+
+
 class TestUserVerifyPassword:
     """Tests for User.verify_password()."""
 
@@ -0,0 +1,77 @@
+"""Unit tests for UUIDv7 generation."""
+
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+
+from app.domain.uuid7 import UUIDv7Generator, uuid7, uuid7_timestamp
+
+NOW_NS = 1_760_000_000_123_456_789
+NOW = datetime(2025, 10, 9, 8, 53, 20, 123000, tzinfo=UTC)
+
+
+class FakeNanosecondClock:
+    def __init__(self) -> None:
+        self.now = NOW_NS
+
+    def __call__(self) -> int:
+        return self.now
+
+
+class TestUUIDv7Generator:
+    """Tests for UUIDv7Generator."""
+
+    @pytest.fixture
+    def clock(self) -> FakeNanosecondClock:
+        return FakeNanosecondClock()
+
+    @pytest.fixture
+    def generate(self, clock: FakeNanosecondClock) -> UUIDv7Generator:
+        return UUIDv7Generator(clock)
+
+    def test_version_and_variant(self, generate: UUIDv7Generator) -> None:
+        value = generate()
+
+        assert value.version == 7  # noqa: PLR2004 Magic value used in comparison
+        assert value.variant == "specified in RFC 4122"
+
+    def test_timestamp_round_trip(self, generate: UUIDv7Generator) -> None:
+        assert uuid7_timestamp(generate()) == NOW
+
+    def test_monotonic_within_a_millisecond(self, generate: UUIDv7Generator) -> None:
+        values = [generate() for _ in range(1000)]
+
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)
+
+    def test_monotonic_when_clock_goes_back(
+        self, generate: UUIDv7Generator, clock: FakeNanosecondClock
+    ) -> None:
+        first = generate()
+        clock.now -= 5_000_000
+        second = generate()
+
+        assert second > first
+        assert uuid7_timestamp(second) == NOW
+
+    def test_sorted_by_time(
+        self, generate: UUIDv7Generator, clock: FakeNanosecondClock
+    ) -> None:
+        first = generate()
+        clock.now += 1_000_000
+
+        assert generate() > first
+
+
+class TestUUIDv7Timestamp:
+    """Tests for uuid7_timestamp()."""
+
+    def test_default_generator_uses_current_time(self) -> None:
+        before = datetime.now(UTC).replace(microsecond=0)
+
+        assert uuid7_timestamp(uuid7()) >= before
+
+    def test_rejects_other_versions(self) -> None:
+        with pytest.raises(ValueError, match="Not a UUIDv7"):
+            uuid7_timestamp(uuid4())
@@ -21,6 +21,19 @@ class TestUserIdGenerate:
         unique_values = {uid.value for uid in ids}
         assert len(unique_values) == count
 
+    def test_generate_creates_time_ordered_ids(self) -> None:
+        ids = [UserId.generate() for _ in range(100)]
+        assert [uid.value for uid in ids] == sorted(uid.value for uid in ids)
+        assert ids[0].timestamp is not None
+
+
+class TestUserIdTimestamp:
+    """Tests for UserId.timestamp."""
+
+    def test_timestamp_of_random_id_is_none(self) -> None:
+        user_id = UserId.from_string("550e8400-e29b-41d4-a716-446655440000")
+        assert user_id.timestamp is None
+
 
 class TestUserIdFromString:
     """Tests for UserId.from_string()."""
@@ -1,5 +1,7 @@
 """Fake code store for testing."""
 
+from collections.abc import Mapping, Sequence
+
 from app.domain import Email, VerificationCode
 
 
@@ -8,16 +10,34 @@ class FakeCodeStore:
 
     def __init__(self) -> None:
         self._codes: dict[str, VerificationCode] = {}
+        self.cooldowns: dict[str, float] = {}
+        self.started_cooldowns: list[str] = []
 
     async def save(self, email: Email, code: VerificationCode) -> None:
         self._codes[email.value] = code
 
+    async def save_many(self, codes: Mapping[Email, VerificationCode]) -> None:
+        for email, code in codes.items():
+            self._codes[email.value] = code
+
     async def get(self, email: Email) -> VerificationCode | None:
         return self._codes.get(email.value)
 
+    async def get_many(self, emails: Sequence[Email]) -> list[VerificationCode | None]:
+        return [self._codes.get(email.value) for email in emails]
+
     async def delete(self, email: Email) -> None:
         self._codes.pop(email.value, None)
 
+    async def cooldown_remaining(self, email: Email) -> float:
+        return self.cooldowns.get(email.value, 0.0)
+
+    async def start_cooldown(self, email: Email) -> float:
+        self.started_cooldowns.append(email.value)
+        return self.cooldowns.get(email.value, 0.0)
+
     def clear(self) -> None:
         """Clear all codes (for test cleanup)."""
         self._codes.clear()
+        self.cooldowns.clear()
+        self.started_cooldowns.clear()
@@ -0,0 +1,20 @@
+"""Fake distributed lock for testing"""
+
+import asyncio
+import contextlib
+from collections import defaultdict
+from collections.abc import AsyncIterator
+
+
+class FakeDistributedLock:
+    """In-process lock per key, records the keys taken."""
+
+    def __init__(self) -> None:
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.keys: list[str] = []
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        async with self._locks[key]:
+            self.keys.append(key)
+            yield
@@ -0,0 +1,23 @@
+"""Fake email filter for testing"""
+
+from collections.abc import Iterable
+
+from app.domain import Email
+
+
+class FakeEmailFilter:
+    """Exact set of emails, with the checks it answered."""
+
+    def __init__(self) -> None:
+        self.emails: set[str] = set()
+        self.checked: list[str] = []
+
+    async def might_contain(self, email: Email) -> bool:
+        self.checked.append(email.value)
+        return email.value in self.emails
+
+    async def add(self, email: Email) -> None:
+        self.emails.add(email.value)
+
+    async def add_many(self, emails: Iterable[str]) -> None:
+        self.emails.update(emails)
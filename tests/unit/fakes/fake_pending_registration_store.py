@@ -0,0 +1,31 @@
+"""Fake pending registration store for testing."""
+
+from collections.abc import Sequence
+
+from app.domain import Email, User
+
+
+class FakePendingRegistrationStore:
+    """In-memory fake pending registration store for testing (no TTL)."""
+
+    def __init__(self) -> None:
+        self._users: dict[str, User] = {}
+
+    async def add(self, user: User) -> bool:
+        if user.email.value in self._users:
+            return False
+        self._users[user.email.value] = user
+        return True
+
+    async def add_many(self, users: Sequence[User]) -> list[bool]:
+        return [await self.add(user) for user in users]
+
+    async def get(self, email: Email) -> User | None:
+        return self._users.get(email.value)
+
+    async def delete(self, email: Email) -> None:
+        self._users.pop(email.value, None)
+
+    async def delete_many(self, emails: Sequence[Email]) -> None:
+        for email in emails:
+            self._users.pop(email.value, None)
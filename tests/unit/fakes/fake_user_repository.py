@@ -1,5 +1,8 @@
 """Fake user repository for testing."""
 
+from collections.abc import Sequence
+
+from app.application.exceptions import ConcurrentUpdateError, UserAlreadyExistsError
 from app.domain import Email, User, UserId
 
 
@@ -8,6 +11,7 @@ class FakeUserRepository:
 
     def __init__(self) -> None:
         self._users: dict[UserId, User] = {}
+        self._versions: dict[UserId, int] = {}
 
     async def get_by_id(self, user_id: UserId) -> User | None:
         return self._users.get(user_id)
@@ -19,8 +23,28 @@ class FakeUserRepository:
         return None
 
     async def save(self, user: User) -> None:
+        existing = await self.get_by_email(user.email)
+        if existing is not None and existing.id != user.id:
+            raise UserAlreadyExistsError(user.email.value)
+        if self._versions.get(user.id, 0) != user.version:
+            raise ConcurrentUpdateError(user.email.value)
+        user.mark_saved()
         self._users[user.id] = user
+        self._versions[user.id] = user.version
+
+    async def add_many(self, users: Sequence[User]) -> list[User]:
+        added = []
+        for user in users:
+            if await self.get_by_email(user.email) is None:
+                await self.save(user)
+                added.append(user)
+        return added
+
+    def save_elsewhere(self, user_id: UserId) -> None:
+        """Bump the stored version, as a concurrent save would."""
+        self._versions[user_id] += 1
 
     def clear(self) -> None:
         """Clear all users (for test cleanup)."""
         self._users.clear()
+        self._versions.clear()
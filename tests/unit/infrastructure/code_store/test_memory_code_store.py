@@ -0,0 +1,44 @@
+"""Unit tests for MemoryCodeStore."""
+
+import pytest
+
+from app.domain import Email
+from app.infrastructure.code_store import memory_code_store
+from app.infrastructure.code_store.memory_code_store import MemoryCodeStore
+
+COOLDOWN_SECONDS = 30
+
+
+class TestMemoryCodeStoreCooldowns:
+    """Tests for the resend cooldowns of MemoryCodeStore."""
+
+    @pytest.fixture
+    def now(self, monkeypatch: pytest.MonkeyPatch) -> list[float]:
+        now = [1_000.0]
+        monkeypatch.setattr(memory_code_store.time, "time", lambda: now[0])
+        return now
+
+    @pytest.fixture
+    def code_store(self, now: list[float]) -> MemoryCodeStore:  # noqa: ARG002 Unused method argument
+        return MemoryCodeStore(cooldown_seconds=COOLDOWN_SECONDS)
+
+    async def test_reading_does_not_start_the_cooldown(
+        self, code_store: MemoryCodeStore
+    ) -> None:
+        email = Email("user@example.com")
+
+        assert await code_store.cooldown_remaining(email) == 0.0
+        assert await code_store.start_cooldown(email) == 0.0
+        assert await code_store.cooldown_remaining(email) == COOLDOWN_SECONDS
+        assert await code_store.start_cooldown(email) == COOLDOWN_SECONDS
+
+    async def test_expired_cooldowns_are_evicted(
+        self, code_store: MemoryCodeStore, now: list[float]
+    ) -> None:
+        await code_store.start_cooldown(Email("old1@example.com"))
+        await code_store.start_cooldown(Email("old2@example.com"))
+        now[0] += COOLDOWN_SECONDS
+
+        await code_store.start_cooldown(Email("new@example.com"))
+
+        assert list(code_store._cooldowns) == ["new@example.com"]  # noqa: SLF001 Private member accessed
@@ -0,0 +1,340 @@
+"""Unit tests for PostgresUserRepository."""
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, cast
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.application.exceptions import ConcurrentUpdateError, UserAlreadyExistsError
+from app.application.ports.user_lister import FIRST_PAGE
+from app.domain import Email, Password, User
+from app.infrastructure.database.mappers.user_mapper import UserMapper
+from app.infrastructure.database.repositories.postgres_user_repository import (
+    PostgresUserRepository,
+)
+
+if TYPE_CHECKING:
+    import asyncpg
+
+    from app.infrastructure.database.replica_set import ReplicaSet
+
+EMAIL = Email("user@example.com")
+
+
+class FakeConnection:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.queries = 0
+        self.email_owner: UUID | None = None
+        self.executed: list[tuple[str, tuple[Any, ...]]] = []
+        self.status = "UPDATE 1"
+
+    async def fetchrow(self, _query: str, email: str) -> dict[str, Any] | None:
+        self.queries += 1
+        return next((row for row in self.rows if row["email"] == email), None)
+
+    async def fetchval(
+        self, _query: str, _email: str, user_id: UUID, *_args: Any
+    ) -> UUID:
+        self.queries += 1
+        return self.email_owner or user_id
+
+    async def execute(self, query: str, *args: Any) -> str:
+        self.queries += 1
+        self.executed.append((query, args))
+        return self.status
+
+
+class TestPostgresUserRepositoryWithReplicas:
+    """Tests for PostgresUserRepository reading from replicas."""
+
+    @pytest.fixture
+    def row(self) -> dict[str, Any]:
+        user = User.create(email=EMAIL, password=Password.from_hash("hash"))
+        return UserMapper.to_model(user).model_dump()
+
+    @pytest.fixture
+    def primary(self, row: dict[str, Any]) -> FakeConnection:
+        return FakeConnection([row])
+
+    @pytest.fixture
+    def replica(self) -> FakeConnection:
+        return FakeConnection([])
+
+    @pytest.fixture
+    def repository(
+        self, primary: FakeConnection, replica: FakeConnection
+    ) -> PostgresUserRepository:
+        async def connection() -> "asyncpg.Connection":
+            return cast("asyncpg.Connection", primary)
+
+        return PostgresUserRepository(connection, replicas=cast("ReplicaSet", replica))
+
+    async def test_replica_hit_does_not_touch_primary(
+        self,
+        repository: PostgresUserRepository,
+        primary: FakeConnection,
+        replica: FakeConnection,
+        row: dict[str, Any],
+    ) -> None:
+        replica.rows.append(row)
+
+        assert await repository.get_by_email(EMAIL) is not None
+        assert (replica.queries, primary.queries) == (1, 0)
+
+    async def test_row_not_yet_replicated_is_read_from_primary(
+        self,
+        repository: PostgresUserRepository,
+        primary: FakeConnection,
+        replica: FakeConnection,
+    ) -> None:
+        assert await repository.get_by_email(EMAIL) is not None
+        assert (replica.queries, primary.queries) == (1, 1)
+
+    async def test_reads_after_save_stay_on_primary(
+        self,
+        repository: PostgresUserRepository,
+        primary: FakeConnection,
+        replica: FakeConnection,
+        row: dict[str, Any],
+    ) -> None:
+        replica.rows.append(row)
+        user = await repository.get_by_email(EMAIL)
+        assert user is not None
+        await repository.save(user)
+
+        assert await repository.get_by_email(EMAIL) is not None
+        assert (replica.queries, primary.queries) == (1, 3)
+
+
+class TestPostgresUserRepositorySave:
+    """Tests for PostgresUserRepository.save email uniqueness."""
+
+    @pytest.fixture
+    def connection(self) -> FakeConnection:
+        return FakeConnection([])
+
+    @pytest.fixture
+    def repository(self, connection: FakeConnection) -> PostgresUserRepository:
+        async def provider() -> "asyncpg.Connection":
+            return cast("asyncpg.Connection", connection)
+
+        return PostgresUserRepository(provider)
+
+    async def test_email_claimed_by_the_user_is_saved(
+        self, repository: PostgresUserRepository, connection: FakeConnection
+    ) -> None:
+        await repository.save(
+            User.create(email=EMAIL, password=Password.from_hash("h"))
+        )
+
+        assert connection.queries == 2  # noqa: PLR2004 Magic value used in comparison
+
+    async def test_email_owned_by_another_user_raises_error(
+        self, repository: PostgresUserRepository, connection: FakeConnection
+    ) -> None:
+        connection.email_owner = UUID(int=1)
+
+        with pytest.raises(UserAlreadyExistsError):
+            await repository.save(
+                User.create(email=EMAIL, password=Password.from_hash("h"))
+            )
+
+        assert connection.queries == 1
+
+    async def test_new_user_is_inserted_as_version_1(
+        self, repository: PostgresUserRepository, connection: FakeConnection
+    ) -> None:
+        user = User.create(email=EMAIL, password=Password.from_hash("h"))
+
+        await repository.save(user)
+
+        assert "INSERT INTO users" in connection.executed[0][0]
+        assert user.version == 1
+        assert user.changes == frozenset()
+
+
+class TestPostgresUserRepositoryUpdate:
+    """Tests for PostgresUserRepository.save of a user saved before."""
+
+    @pytest.fixture
+    def connection(self) -> FakeConnection:
+        return FakeConnection([])
+
+    @pytest.fixture
+    def repository(self, connection: FakeConnection) -> PostgresUserRepository:
+        async def provider() -> "asyncpg.Connection":
+            return cast("asyncpg.Connection", connection)
+
+        return PostgresUserRepository(provider)
+
+    @pytest.fixture
+    def user(self) -> User:
+        user = User.create(email=EMAIL, password=Password.from_hash("h"))
+        user.version = 3
+        return user
+
+    async def test_only_changed_columns_are_updated(
+        self,
+        repository: PostgresUserRepository,
+        connection: FakeConnection,
+        user: User,
+    ) -> None:
+        user.activate()
+
+        await repository.save(user)
+
+        [(query, args)] = connection.executed
+        assert "SET is_active = $4, version = version + 1" in query
+        assert "hashed_password" not in query
+        assert args == (user.id.value, user.created_at, 3, True)
+        assert user.version == 4  # noqa: PLR2004 Magic value used in comparison
+        assert user.changes == frozenset()
+
+    async def test_unchanged_user_is_not_written(
+        self,
+        repository: PostgresUserRepository,
+        connection: FakeConnection,
+        user: User,
+    ) -> None:
+        await repository.save(user)
+
+        assert connection.queries == 0
+        assert user.version == 3  # noqa: PLR2004 Magic value used in comparison
+
+    async def test_stale_version_raises_error(
+        self,
+        repository: PostgresUserRepository,
+        connection: FakeConnection,
+        user: User,
+    ) -> None:
+        connection.status = "UPDATE 0"
+        user.activate()
+
+        with pytest.raises(ConcurrentUpdateError):
+            await repository.save(user)
+
+        assert user.version == 3  # noqa: PLR2004 Magic value used in comparison
+        assert user.changes == {"is_active"}
+
+
+class FakeCursor:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.fetches: list[int] = []
+
+    async def fetch(self, count: int) -> list[dict[str, Any]]:
+        self.fetches.append(count)
+        rows, self.rows = self.rows[:count], self.rows[count:]
+        return rows
+
+
+class FakeCursorConnection:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.cursor_ = FakeCursor(rows)
+        self.query = ""
+
+    async def cursor(self, query: str) -> FakeCursor:
+        self.query = query
+        return self.cursor_
+
+
+class TestPostgresUserRepositoryExport:
+    """Tests for PostgresUserRepository.export."""
+
+    @pytest.fixture
+    def conn(self) -> FakeCursorConnection:
+        return FakeCursorConnection([{"id": index} for index in range(5)])
+
+    @pytest.fixture
+    def repository(self, conn: FakeCursorConnection) -> PostgresUserRepository:
+        async def connection() -> "asyncpg.Connection":
+            return cast("asyncpg.Connection", conn)
+
+        return PostgresUserRepository(connection)
+
+    async def test_rows_are_fetched_in_batches(
+        self, repository: PostgresUserRepository, conn: FakeCursorConnection
+    ) -> None:
+        batches = [rows async for rows in repository.export(2)]
+
+        assert [len(rows) for rows in batches] == [2, 2, 1]
+        assert conn.cursor_.fetches == [2, 2, 2, 2]
+
+    async def test_password_hash_is_exported_on_request(
+        self, repository: PostgresUserRepository, conn: FakeCursorConnection
+    ) -> None:
+        [rows async for rows in repository.export(2)]
+        assert "hashed_password" not in conn.query
+
+        [rows async for rows in repository.export(2, with_password_hash=True)]
+        assert "hashed_password" in conn.query
+
+
+class FakePageConnection:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.fetched: list[tuple[str, tuple[Any, ...]]] = []
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        self.fetched.append((query, args))
+        return self.rows[: args[-1]]
+
+
+class TestPostgresUserRepositoryListPage:
+    """Tests for PostgresUserRepository.list_page."""
+
+    @pytest.fixture
+    def conn(self) -> FakePageConnection:
+        users = [
+            User.create(
+                email=Email(f"user{index}@example.com"),
+                password=Password.from_hash("hash"),
+            )
+            for index in range(3)
+        ]
+        return FakePageConnection(
+            [UserMapper.to_model(user).model_dump() for user in users]
+        )
+
+    @pytest.fixture
+    def repository(self, conn: FakePageConnection) -> PostgresUserRepository:
+        async def connection() -> "asyncpg.Connection":
+            return cast("asyncpg.Connection", conn)
+
+        return PostgresUserRepository(connection)
+
+    async def test_page_seeks_after_the_cursor(
+        self, repository: PostgresUserRepository, conn: FakePageConnection
+    ) -> None:
+        after = (datetime(2026, 1, 1, tzinfo=UTC), uuid4())
+
+        users = await repository.list_page(2, after)
+
+        assert [user.email.value for user in users] == [
+            "user0@example.com",
+            "user1@example.com",
+        ]
+        query, args = conn.fetched[0]
+        assert "(users.created_at, users.id) > ($1, $2)" in query
+        assert "OFFSET" not in query
+        assert args == (*after, 2)
+
+    async def test_inactive_filter_matches_the_partial_index(
+        self, repository: PostgresUserRepository, conn: FakePageConnection
+    ) -> None:
+        await repository.list_page(10, is_active=False)
+
+        query, args = conn.fetched[0]
+        assert "NOT users.is_active" in query
+        assert args == (*FIRST_PAGE, 10)
+
+    async def test_email_prefix_is_escaped(
+        self, repository: PostgresUserRepository, conn: FakePageConnection
+    ) -> None:
+        await repository.list_page(10, email_prefix="User_1%")
+
+        query, args = conn.fetched[0]
+        assert "user_emails.email LIKE $3" in query
+        assert args == (*FIRST_PAGE, "user\\_1\\%%", 10)
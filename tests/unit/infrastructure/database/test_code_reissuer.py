@@ -0,0 +1,210 @@
+"""Unit tests for PostgresCodeReissuer."""
+
+import contextlib
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, cast
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.domain import Email, UserNewVerificationCodeCreated, VerificationCode
+from app.infrastructure.database.code_reissuer import PostgresCodeReissuer
+from tests.unit.fakes.fake_code_store import FakeCodeStore
+from tests.unit.fakes.fake_event_publisher import FakeEventPublisher
+
+if TYPE_CHECKING:
+    import asyncpg
+
+BATCH_SIZE = 3
+RATE_PER_SECOND = 10.0
+SINCE = datetime.now(UTC) - timedelta(days=7)
+
+
+class FakeConnection:
+    """Keeps users as dicts, understands the reissuer queries only."""
+
+    def __init__(self) -> None:
+        self.users: list[dict[str, Any]] = []
+        self.locked = False
+        self.lock_taken_elsewhere = False
+        self.selects: list[tuple[datetime, UUID]] = []
+
+    async def fetchval(self, query: str, _key: int) -> bool:
+        assert "pg_try_advisory_lock" in query
+        if self.lock_taken_elsewhere:
+            return False
+        self.locked = True
+        return True
+
+    async def fetch(
+        self, _query: str, since: datetime, created_at: datetime, id_: UUID, limit: int
+    ) -> list[dict[str, Any]]:
+        self.selects.append((created_at, id_))
+        rows = sorted(
+            (
+                user
+                for user in self.users
+                if not user["is_active"]
+                and user["created_at"] >= since
+                and (user["created_at"], user["id"]) > (created_at, id_)
+            ),
+            key=lambda user: (user["created_at"], user["id"]),
+        )
+        return rows[:limit]
+
+    async def execute(self, query: str, *_args: Any) -> str:
+        assert "pg_advisory_unlock" in query
+        self.locked = False
+        return "SELECT 1"
+
+
+class FakePool:
+    def __init__(self, connection: FakeConnection) -> None:
+        self._connection = connection
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[FakeConnection]:
+        yield self._connection
+
+
+class FakeClock:
+    """Time only moves when the reissuer sleeps."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestPostgresCodeReissuer:
+    """Tests for PostgresCodeReissuer."""
+
+    @pytest.fixture
+    def connection(self) -> FakeConnection:
+        connection = FakeConnection()
+        now = datetime.now(UTC)
+        for index, (days, is_active) in enumerate(
+            [(1, False)] * 7 + [(1, True), (10, False)]
+        ):
+            connection.users.append(
+                {
+                    "id": uuid4(),
+                    "email": f"user{index}@example.com",
+                    "created_at": now - timedelta(days=days),
+                    "is_active": is_active,
+                }
+            )
+        return connection
+
+    @pytest.fixture
+    def code_store(self) -> FakeCodeStore:
+        return FakeCodeStore()
+
+    @pytest.fixture
+    def event_publisher(self) -> FakeEventPublisher:
+        return FakeEventPublisher()
+
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def reissuer(
+        self,
+        connection: FakeConnection,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+        clock: FakeClock,
+    ) -> PostgresCodeReissuer:
+        return PostgresCodeReissuer(
+            cast("asyncpg.Pool", FakePool(connection)),
+            code_store,
+            event_publisher,
+            batch_size=BATCH_SIZE,
+            rate_per_second=RATE_PER_SECOND,
+            clock=clock,
+            sleep=clock.sleep,
+        )
+
+    async def test_reissues_codes_of_recent_inactive_users(
+        self,
+        reissuer: PostgresCodeReissuer,
+        connection: FakeConnection,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+    ) -> None:
+        report = await reissuer.reissue(SINCE)
+
+        assert (report.reissued, report.batches) == (7, 3)
+        emails = [f"user{index}@example.com" for index in range(7)]
+        assert sorted(
+            event.email.value
+            for event in event_publisher.published_events
+            if isinstance(event, UserNewVerificationCodeCreated)
+        ) == sorted(emails)
+        codes = await code_store.get_many([Email(email) for email in emails])
+        assert all(code is not None for code in codes)
+        assert await code_store.get(Email("user8@example.com")) is None
+        assert connection.locked is False
+
+    async def test_batches_follow_the_keyset(
+        self, reissuer: PostgresCodeReissuer, connection: FakeConnection
+    ) -> None:
+        await reissuer.reissue(SINCE)
+
+        cursors = connection.selects
+        assert cursors == sorted(cursors)
+        assert len(set(cursors)) == len(cursors)
+
+    async def test_batches_are_paced_to_the_rate(
+        self, reissuer: PostgresCodeReissuer, clock: FakeClock
+    ) -> None:
+        report = await reissuer.reissue(SINCE)
+
+        # The last, short batch ends the run without a pause
+        assert clock.sleeps == [
+            pytest.approx(BATCH_SIZE / RATE_PER_SECOND),
+            pytest.approx(BATCH_SIZE / RATE_PER_SECOND),
+        ]
+        assert report.paused_seconds == pytest.approx(sum(clock.sleeps))
+
+    async def test_unexpired_codes_are_kept(
+        self,
+        reissuer: PostgresCodeReissuer,
+        code_store: FakeCodeStore,
+        event_publisher: FakeEventPublisher,
+    ) -> None:
+        email = Email("user0@example.com")
+        code = VerificationCode.generate()
+        await code_store.save(email, code)
+
+        report = await reissuer.reissue(SINCE)
+
+        assert (report.reissued, report.skipped_unexpired) == (6, 1)
+        assert await code_store.get(email) == code
+        assert len(event_publisher.published_events) == 6  # noqa: PLR2004 Magic value used in comparison
+        assert email not in [
+            event.email
+            for event in event_publisher.published_events
+            if isinstance(event, UserNewVerificationCodeCreated)
+        ]
+
+    async def test_skipped_while_another_instance_holds_the_lock(
+        self,
+        reissuer: PostgresCodeReissuer,
+        connection: FakeConnection,
+        event_publisher: FakeEventPublisher,
+    ) -> None:
+        connection.lock_taken_elsewhere = True
+
+        report = await reissuer.reissue(SINCE)
+
+        assert report.skipped is True
+        assert event_publisher.published_events == []
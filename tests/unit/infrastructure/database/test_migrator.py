@@ -0,0 +1,228 @@
+"""Unit tests for PostgresMigrator."""
+
+import contextlib
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+
+from app.infrastructure.database.migrator import (
+    NO_TRANSACTION_MARKER,
+    Migration,
+    PostgresMigrator,
+    load_migrations,
+)
+
+if TYPE_CHECKING:
+    import asyncpg
+
+MIGRATIONS = [
+    Migration(1, "create_users", "CREATE TABLE users (id UUID);"),
+    Migration(
+        2,
+        "index_users",
+        f"{NO_TRANSACTION_MARKER}\n-- Comment; with a semicolon\n"
+        "DROP INDEX CONCURRENTLY IF EXISTS idx;\n"
+        "CREATE INDEX CONCURRENTLY idx ON users (id);\n",
+    ),
+]
+
+
+class FakeConnection:
+    """Records statements, keeps the schema_migrations versions."""
+
+    def __init__(self) -> None:
+        self.versions: set[int] = set()
+        self.statements: list[str] = []
+        self.in_transaction = False
+        self.transactions: list[list[str]] = []
+        self.locked = False
+        self.fail_on: str | None = None
+        self.partitions = ["users_p1", "users_p2"]
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        if "pg_inherits" in query:
+            assert args == ("users",)
+            return [{"relname": partition} for partition in self.partitions]
+        assert "schema_migrations" in query
+        return [{"version": version} for version in sorted(self.versions)]
+
+    async def execute(self, query: str, *args: Any) -> str:
+        if "pg_advisory_lock" in query:
+            self.locked = True
+        elif "pg_advisory_unlock" in query:
+            self.locked = False
+        elif query.startswith("INSERT INTO schema_migrations"):
+            self.versions.add(args[0])
+        elif query == self.fail_on:
+            msg = "statement failed"
+            raise RuntimeError(msg)
+        self.statements.append(query)
+        if self.in_transaction:
+            self.transactions[-1].append(query)
+        return "OK"
+
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        self.in_transaction = True
+        self.transactions.append([])
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+
+class FakePool:
+    def __init__(self, connection: FakeConnection) -> None:
+        self._connection = connection
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[FakeConnection]:
+        yield self._connection
+
+
+class TestPostgresMigrator:
+    """Tests for PostgresMigrator."""
+
+    @pytest.fixture
+    def connection(self) -> FakeConnection:
+        return FakeConnection()
+
+    @pytest.fixture
+    def migrator(self, connection: FakeConnection) -> PostgresMigrator:
+        return PostgresMigrator(
+            cast("asyncpg.Pool", FakePool(connection)),
+            MIGRATIONS,
+            lock_timeout_seconds=2,
+        )
+
+    async def test_applies_pending_migrations_in_order(
+        self, migrator: PostgresMigrator, connection: FakeConnection
+    ) -> None:
+        applied = await migrator.migrate()
+
+        assert applied == MIGRATIONS
+        assert connection.versions == {1, 2}
+        assert "SET lock_timeout = 2000" in connection.statements
+        assert connection.locked is False
+
+    async def test_skips_applied_migrations(
+        self, migrator: PostgresMigrator, connection: FakeConnection
+    ) -> None:
+        connection.versions = {1}
+
+        assert await migrator.pending() == MIGRATIONS[1:]
+        assert await migrator.migrate() == MIGRATIONS[1:]
+        assert await migrator.migrate() == []
+
+    async def test_transactional_migration_runs_with_its_record(
+        self, migrator: PostgresMigrator, connection: FakeConnection
+    ) -> None:
+        await migrator.migrate()
+
+        first, *others = connection.transactions
+        assert first[0] == MIGRATIONS[0].sql
+        assert first[1].startswith("INSERT INTO schema_migrations")
+        assert others == []
+
+    async def test_non_transactional_migration_runs_statement_by_statement(
+        self, migrator: PostgresMigrator, connection: FakeConnection
+    ) -> None:
+        await migrator.migrate()
+
+        assert MIGRATIONS[1].statements() == [
+            "DROP INDEX CONCURRENTLY IF EXISTS idx",
+            "CREATE INDEX CONCURRENTLY idx ON users (id)",
+        ]
+        index = connection.statements.index("DROP INDEX CONCURRENTLY IF EXISTS idx")
+        assert connection.statements[index + 1] == (
+            "CREATE INDEX CONCURRENTLY idx ON users (id)"
+        )
+
+    async def test_failed_migration_is_not_recorded(
+        self, migrator: PostgresMigrator, connection: FakeConnection
+    ) -> None:
+        connection.fail_on = "CREATE INDEX CONCURRENTLY idx ON users (id)"
+
+        with pytest.raises(RuntimeError):
+            await migrator.migrate()
+
+        assert connection.versions == {1}
+        assert connection.locked is False
+
+    async def test_partition_statements_run_for_each_partition(
+        self, connection: FakeConnection
+    ) -> None:
+        migration = Migration(
+            3,
+            "index_partitions",
+            f"{NO_TRANSACTION_MARKER}\n-- migrate: for-each-partition users\n"
+            "CREATE INDEX IF NOT EXISTS idx ON ONLY users (id);\n"
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition}_idx "
+            "ON {partition} (id);\n"
+            "ALTER INDEX idx ATTACH PARTITION {partition}_idx;\n",
+        )
+        migrator = PostgresMigrator(
+            cast("asyncpg.Pool", FakePool(connection)), [migration]
+        )
+
+        await migrator.migrate()
+
+        start = connection.statements.index(
+            "CREATE INDEX IF NOT EXISTS idx ON ONLY users (id)"
+        )
+        assert connection.statements[start + 1 : start + 5] == [
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS users_p1_idx ON users_p1 (id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS users_p2_idx ON users_p2 (id)",
+            "ALTER INDEX idx ATTACH PARTITION users_p1_idx",
+            "ALTER INDEX idx ATTACH PARTITION users_p2_idx",
+        ]
+        assert connection.versions == {3}
+
+    def test_dollar_quoted_bodies_are_not_split(self) -> None:
+        migration = Migration(
+            1,
+            "function",
+            f"{NO_TRANSACTION_MARKER}\n"
+            "DO $$ BEGIN PERFORM 1; PERFORM 2; END $$;\nSELECT 3;\n",
+        )
+
+        assert migration.statements() == [
+            "DO $$ BEGIN PERFORM 1; PERFORM 2; END $$",
+            "SELECT 3",
+        ]
+
+
+class TestLoadMigrations:
+    """Tests for the shipped migrations."""
+
+    def test_versions_are_contiguous(self) -> None:
+        migrations = load_migrations()
+
+        assert [migration.version for migration in migrations] == list(
+            range(1, len(migrations) + 1)
+        )
+
+    def test_concurrent_index_changes_run_outside_transactions(self) -> None:
+        for migration in load_migrations():
+            if "CONCURRENTLY" in migration.sql:
+                assert not migration.transactional, migration.name
+
+    def test_partitioned_users_are_indexed_online(self) -> None:
+        for migration in load_migrations():
+            if migration.partitioned_table is not None:
+                assert not migration.transactional, migration.name
+
+        (created_at,) = (
+            migration
+            for migration in load_migrations()
+            if migration.name == "index_users_created_at"
+        )
+        assert created_at.partitioned_table == "users"
+        assert "ON ONLY users" in created_at.sql
+
+    def test_redundant_email_index_is_dropped(self) -> None:
+        sql = "\n".join(migration.sql for migration in load_migrations())
+
+        assert "DROP INDEX CONCURRENTLY IF EXISTS idx_users_email;" in sql
+        assert "CREATE INDEX idx_users_email" not in sql
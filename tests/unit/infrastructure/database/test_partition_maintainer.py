@@ -0,0 +1,67 @@
+"""Unit tests for PostgresPartitionMaintainer."""
+
+import asyncio
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, cast
+
+from app.infrastructure.database.partition_maintainer import (
+    PostgresPartitionMaintainer,
+)
+
+if TYPE_CHECKING:
+    import asyncpg
+
+MONTHS_AHEAD = 2
+
+
+class FakePool:
+    def __init__(self) -> None:
+        self.calls: list[tuple[object, ...]] = []
+
+    async def fetchval(self, query: str, *args: int) -> int:
+        self.calls.append((query, *args))
+        return 1 if len(self.calls) == 1 else 0
+
+
+class TestPostgresPartitionMaintainer:
+    """Tests for PostgresPartitionMaintainer."""
+
+    async def test_ensure_partitions_reports_created_count(self) -> None:
+        pool = FakePool()
+        maintainer = PostgresPartitionMaintainer(
+            cast("asyncpg.Pool", pool), months_ahead=MONTHS_AHEAD
+        )
+
+        assert await maintainer.ensure_partitions() == 1
+        assert await maintainer.ensure_partitions() == 0
+        assert pool.calls[0] == ("SELECT ensure_users_partitions($1)", MONTHS_AHEAD)
+
+    async def test_ensure_partitions_since_goes_back_to_oldest_month(
+        self,
+    ) -> None:
+        pool = FakePool()
+        maintainer = PostgresPartitionMaintainer(
+            cast("asyncpg.Pool", pool), months_ahead=MONTHS_AHEAD
+        )
+        now = datetime.now(UTC)
+        oldest = now.replace(year=now.year - 1, day=1)
+
+        await maintainer.ensure_partitions_since(oldest)
+
+        # Twelve months back, plus the spare one
+        assert pool.calls[0] == (
+            "SELECT ensure_users_partitions($1, $2)",
+            MONTHS_AHEAD,
+            13,
+        )
+
+    async def test_run_checks_periodically(self) -> None:
+        pool = FakePool()
+        maintainer = PostgresPartitionMaintainer(cast("asyncpg.Pool", pool))
+
+        task = asyncio.create_task(maintainer.run(0))
+        for _ in range(3):
+            await asyncio.sleep(0)
+        task.cancel()
+
+        assert len(pool.calls) > 1
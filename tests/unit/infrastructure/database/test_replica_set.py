@@ -0,0 +1,144 @@
+"""Unit tests for ReplicaSet."""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+
+from app.infrastructure.database.replica_set import ReplicaSet
+from tests.unit.fakes.fake_clock import FakeClock
+
+if TYPE_CHECKING:
+    import asyncpg
+
+RETRY_SECONDS = 5.0
+
+
+class FakeConnection:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.lag_seconds = 0.0
+
+    async def fetchrow(self, _query: str, *_args: Any) -> dict[str, str]:
+        return {"server": self.name}
+
+    async def fetchval(self, _query: str) -> float:
+        return self.lag_seconds
+
+
+class FakePool:
+    def __init__(self, name: str) -> None:
+        self.connection = FakeConnection(name)
+        self.error: Exception | None = None
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[FakeConnection]:
+        if self.error is not None:
+            raise self.error
+        yield self.connection
+
+
+class TestReplicaSet:
+    """Tests for ReplicaSet."""
+
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def primary(self) -> FakePool:
+        return FakePool("primary")
+
+    @pytest.fixture
+    def replicas(self) -> list[FakePool]:
+        return [FakePool("replica-1"), FakePool("replica-2")]
+
+    @pytest.fixture
+    def replica_set(
+        self, primary: FakePool, replicas: list[FakePool], clock: FakeClock
+    ) -> ReplicaSet:
+        return ReplicaSet(
+            cast("asyncpg.Pool", primary),
+            cast("list[asyncpg.Pool]", replicas),
+            max_lag_seconds=1.0,
+            retry_seconds=RETRY_SECONDS,
+            clock=clock,
+        )
+
+    async def read_from(self, replica_set: ReplicaSet) -> str:
+        row = await replica_set.fetchrow("SELECT 1")
+        assert row is not None
+        return row["server"]
+
+    async def test_reads_alternate_between_replicas(
+        self, replica_set: ReplicaSet
+    ) -> None:
+        servers = [await self.read_from(replica_set) for _ in range(4)]
+
+        assert servers == ["replica-1", "replica-2", "replica-1", "replica-2"]
+        assert (replica_set.replica_reads, replica_set.primary_reads) == (4, 0)
+
+    async def test_least_busy_replica_is_chosen(self, replica_set: ReplicaSet) -> None:
+        async with replica_set.acquire() as busy:
+            servers = {await self.read_from(replica_set) for _ in range(3)}
+
+        assert servers == {"replica-1", "replica-2"} - {busy.name}
+
+    async def test_unreachable_replica_is_skipped_until_retry(
+        self, replica_set: ReplicaSet, replicas: list[FakePool], clock: FakeClock
+    ) -> None:
+        replicas[0].error = OSError("connection refused")
+
+        servers = [await self.read_from(replica_set) for _ in range(3)]
+        assert servers == ["primary", "replica-2", "replica-2"]
+
+        replicas[0].error = None
+        clock.now = RETRY_SECONDS
+        servers = {await self.read_from(replica_set) for _ in range(2)}
+        assert servers == {"replica-1", "replica-2"}
+
+    async def test_lagging_replica_is_skipped(
+        self, replica_set: ReplicaSet, replicas: list[FakePool]
+    ) -> None:
+        replicas[1].connection.lag_seconds = 3.0
+        await replica_set.check_lag()
+
+        servers = {await self.read_from(replica_set) for _ in range(3)}
+        assert servers == {"replica-1"}
+
+    async def test_reads_go_to_primary_without_usable_replica(
+        self, replica_set: ReplicaSet, replicas: list[FakePool]
+    ) -> None:
+        for replica in replicas:
+            replica.connection.lag_seconds = 3.0
+        await replica_set.check_lag()
+
+        assert await self.read_from(replica_set) == "primary"
+
+    async def test_monitor_checks_lag_periodically(
+        self, replica_set: ReplicaSet, replicas: list[FakePool]
+    ) -> None:
+        replicas[0].connection.lag_seconds = 3.0
+        monitor = asyncio.create_task(replica_set.monitor(0))
+        await asyncio.sleep(0)
+        monitor.cancel()
+
+        servers = {await self.read_from(replica_set) for _ in range(2)}
+        assert servers == {"replica-2"}
+
+    async def test_monitor_survives_unexpected_errors(
+        self,
+        replica_set: ReplicaSet,
+        replicas: list[FakePool],
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        replicas[0].error = ValueError("unexpected")
+        monitor = asyncio.create_task(replica_set.monitor(0))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert not monitor.done()
+        monitor.cancel()
+        assert "Replica lag check failed" in caplog.text
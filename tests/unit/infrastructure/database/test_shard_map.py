@@ -0,0 +1,43 @@
+"""Unit tests for ShardMap."""
+
+import pytest
+
+from app.infrastructure.database.shard_map import ShardMap
+
+USER_BUCKET = 72
+EMAILS = [f"user{index}@example.com" for index in range(2000)]
+
+
+class TestShardMap:
+    """Tests for ShardMap."""
+
+    def test_bucket_is_stable(self) -> None:
+        shard_map = ShardMap(1, bucket_count=1024)
+
+        assert shard_map.bucket("user@example.com") == USER_BUCKET
+        assert ShardMap(4).bucket("user@example.com") == USER_BUCKET
+
+    def test_even_split(self) -> None:
+        shard_map = ShardMap(4)
+        counts = [0] * 4
+        for email in EMAILS:
+            counts[shard_map.shard(email)] += 1
+
+        assert all(400 < count < 600 for count in counts)  # noqa: PLR2004 Magic value used in comparison
+
+    def test_splitting_a_range_only_moves_its_buckets(self) -> None:
+        before = ShardMap(2, ranges={0: 0, 512: 1})
+        after = ShardMap(3, ranges={0: 0, 512: 1, 768: 2})
+
+        for email in EMAILS:
+            if before.shard(email) != after.shard(email):
+                assert after.shard(email) == 2  # noqa: PLR2004 Magic value used in comparison
+                assert after.bucket(email) >= 768  # noqa: PLR2004 Magic value used in comparison
+
+    @pytest.mark.parametrize(
+        "ranges",
+        [{1: 0}, {0: 0, 1024: 1}, {0: 0, 512: 2}],
+    )
+    def test_invalid_ranges(self, ranges: dict[int, int]) -> None:
+        with pytest.raises(ValueError, match="Bucket ranges"):
+            ShardMap(2, ranges=ranges)
@@ -0,0 +1,147 @@
+"""Unit tests for ShardedUnitOfWork."""
+
+from types import TracebackType
+
+import pytest
+
+from app.application.exceptions import PartialCommitError, UserAlreadyExistsError
+from app.domain import Email, Password, User
+from app.infrastructure.database.shard_map import ShardMap
+from app.infrastructure.database.sharded_unit_of_work import ShardedUnitOfWork
+from tests.unit.fakes.fake_unit_of_work import FakeUnitOfWork
+
+SHARD_COUNT = 3
+
+
+def make_user(email: str) -> User:
+    return User.create(email=Email(email), password=Password.from_hash("hash"))
+
+
+class FailingCommitUnitOfWork(FakeUnitOfWork):
+    """Fails to commit, as a shard whose database went away."""
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            msg = "connection lost"
+            raise OSError(msg)
+        await self.rollback()
+
+
+def user_on_shard(shard_map: ShardMap, index: int) -> User:
+    return next(
+        make_user(email)
+        for email in (f"user{n}@example.com" for n in range(1000))
+        if shard_map.shard(email) == index
+    )
+
+
+class TestShardedUnitOfWork:
+    """Tests for ShardedUnitOfWork."""
+
+    @pytest.fixture
+    def shards(self) -> list[FakeUnitOfWork]:
+        return [FakeUnitOfWork() for _ in range(SHARD_COUNT)]
+
+    @pytest.fixture
+    def shard_map(self) -> ShardMap:
+        return ShardMap(SHARD_COUNT)
+
+    @pytest.fixture
+    def uow(
+        self, shards: list[FakeUnitOfWork], shard_map: ShardMap
+    ) -> ShardedUnitOfWork:
+        return ShardedUnitOfWork(
+            [lambda shard=shard: shard for shard in shards], shard_map
+        )
+
+    async def test_user_is_saved_on_its_shard(
+        self,
+        uow: ShardedUnitOfWork,
+        shards: list[FakeUnitOfWork],
+        shard_map: ShardMap,
+    ) -> None:
+        users = [make_user(f"user{index}@example.com") for index in range(20)]
+        async with uow:
+            for user in users:
+                await uow.user_repository.save(user)
+
+        for user in users:
+            owner = shard_map.shard(user.email.value)
+            for index, shard in enumerate(shards):
+                found = await shard.user_repository.get_by_email(user.email)
+                assert (found is not None) == (index == owner)
+
+    async def test_lookups_are_routed(self, uow: ShardedUnitOfWork) -> None:
+        user = make_user("user@example.com")
+        async with uow:
+            await uow.user_repository.save(user)
+
+        async with uow:
+            assert await uow.user_repository.get_by_email(user.email) is not None
+            assert await uow.user_repository.get_by_id(user.id) is not None
+
+    async def test_only_used_shards_are_entered(
+        self,
+        uow: ShardedUnitOfWork,
+        shards: list[FakeUnitOfWork],
+        shard_map: ShardMap,
+    ) -> None:
+        email = Email("user@example.com")
+
+        async def register_twice() -> None:
+            async with uow:
+                await uow.user_repository.save(make_user(email.value))
+                await uow.user_repository.save(make_user(email.value))
+
+        with pytest.raises(UserAlreadyExistsError):
+            await register_twice()
+
+        owner = shard_map.shard(email.value)
+        assert [shard.rolled_back for shard in shards] == [
+            index == owner for index in range(SHARD_COUNT)
+        ]
+
+    async def test_failed_commit_after_a_committed_shard_is_reported(
+        self, shards: list[FakeUnitOfWork], shard_map: ShardMap
+    ) -> None:
+        shards[1] = FailingCommitUnitOfWork()
+        uow = ShardedUnitOfWork(
+            [lambda shard=shard: shard for shard in shards], shard_map
+        )
+
+        users = [user_on_shard(shard_map, index) for index in range(SHARD_COUNT)]
+
+        with pytest.raises(PartialCommitError) as exc_info:
+            async with uow:
+                await uow.user_repository.add_many(users)
+
+        assert (exc_info.value.committed, exc_info.value.failed) == ([0], 1)
+        assert exc_info.value.saved == [users[0].id]
+        assert [shard.rolled_back for shard in shards] == [False, False, True]
+
+    async def test_failed_first_commit_raises_its_error(
+        self, shards: list[FakeUnitOfWork], shard_map: ShardMap
+    ) -> None:
+        shards[0] = FailingCommitUnitOfWork()
+        uow = ShardedUnitOfWork(
+            [lambda shard=shard: shard for shard in shards], shard_map
+        )
+
+        with pytest.raises(OSError, match="connection lost"):
+            async with uow:
+                await uow.user_repository.add_many(
+                    [user_on_shard(shard_map, index) for index in range(SHARD_COUNT)]
+                )
+
+        assert [shard.rolled_back for shard in shards] == [False, True, True]
+
+    def test_shard_count_must_match_map(self, shards: list[FakeUnitOfWork]) -> None:
+        with pytest.raises(ValueError, match="Expected 2 shards"):
+            ShardedUnitOfWork(
+                [lambda shard=shard: shard for shard in shards], ShardMap(2)
+            )
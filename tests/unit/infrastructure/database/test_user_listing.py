@@ -0,0 +1,79 @@
+"""Unit tests for list_users."""
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, cast
+
+from app.domain import Email, Password, User, UserId
+from app.infrastructure.database.mappers.user_mapper import UserMapper
+from app.infrastructure.database.user_listing import list_users
+
+if TYPE_CHECKING:
+    import asyncpg
+
+
+class FakeConnection:
+    """Returns its rows in keyset order, as the listing query does."""
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = sorted(rows, key=lambda row: (row["created_at"], row["id"]))
+
+    def transaction(self) -> "FakeConnection":
+        return self
+
+    async def start(self) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+    async def fetch(self, _query: str, created_at: datetime, *args: Any) -> list[Any]:
+        id_, limit = args[0], args[-1]
+        rows = [
+            row
+            for row in self.rows
+            if (row["created_at"], row["id"]) > (created_at, id_)
+        ]
+        return rows[:limit]
+
+
+class FakePool:
+    def __init__(self, connection: FakeConnection) -> None:
+        self._connection = connection
+
+    async def acquire(self) -> FakeConnection:
+        return self._connection
+
+    async def release(self, _connection: FakeConnection) -> None:
+        pass
+
+
+def make_row(index: int, created_at: datetime) -> dict[str, Any]:
+    user = User(
+        id=UserId.generate(),
+        email=Email(f"user{index}@example.com"),
+        password=Password.from_hash("hash"),
+        created_at=created_at,
+    )
+    return UserMapper.to_model(user).model_dump()
+
+
+class TestListUsers:
+    """Tests for list_users."""
+
+    async def test_pages_of_shards_are_merged_in_keyset_order(self) -> None:
+        start = datetime(2026, 1, 1, tzinfo=UTC)
+        rows = [make_row(index, start + timedelta(minutes=index)) for index in range(9)]
+        pools = [
+            cast("asyncpg.Pool", FakePool(FakeConnection(rows[shard::3])))
+            for shard in range(3)
+        ]
+
+        first = await list_users(pools, 4)
+        after = (first[-1].created_at, first[-1].id.value)
+        second = await list_users(pools, 4, after)
+        last = await list_users(pools, 4, (second[-1].created_at, second[-1].id.value))
+
+        assert [user.email.value for user in [*first, *second, *last]] == [
+            f"user{index}@example.com" for index in range(9)
+        ]
+        assert len(last) == 1
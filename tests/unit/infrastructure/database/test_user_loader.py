@@ -0,0 +1,119 @@
+"""Unit tests for PostgresUserLoader."""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any, cast
+from uuid import uuid4
+
+import pytest
+
+from app.infrastructure.database.user_loader import PostgresUserLoader
+
+if TYPE_CHECKING:
+    import asyncpg
+
+MAX_BATCH_SIZE = 3
+
+
+class FakeConnection:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self._rows = rows
+        self.queries: list[tuple[str, list[Any]]] = []
+        self.error: Exception | None = None
+
+    async def fetch(self, query: str, keys: list[Any]) -> list[dict[str, Any]]:
+        self.queries.append((query, keys))
+        if self.error is not None:
+            raise self.error
+        column = "email" if "email" in query else "id"
+        return [row for row in self._rows if row[column] in keys]
+
+
+class FakePool:
+    def __init__(self, connection: FakeConnection) -> None:
+        self._connection = connection
+        self.acquired = 0
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[FakeConnection]:
+        self.acquired += 1
+        yield self._connection
+
+
+class TestPostgresUserLoader:
+    """Tests for PostgresUserLoader."""
+
+    @pytest.fixture
+    def rows(self) -> list[dict[str, Any]]:
+        return [
+            {"id": uuid4(), "email": f"user{index}@example.com"} for index in range(5)
+        ]
+
+    @pytest.fixture
+    def connection(self, rows: list[dict[str, Any]]) -> FakeConnection:
+        return FakeConnection(rows)
+
+    @pytest.fixture
+    def pool(self, connection: FakeConnection) -> FakePool:
+        return FakePool(connection)
+
+    @pytest.fixture
+    def loader(self, pool: FakePool) -> PostgresUserLoader:
+        return PostgresUserLoader(
+            cast("asyncpg.Pool", pool), max_batch_size=MAX_BATCH_SIZE
+        )
+
+    async def test_concurrent_lookups_share_one_query(
+        self,
+        loader: PostgresUserLoader,
+        pool: FakePool,
+        connection: FakeConnection,
+        rows: list[dict[str, Any]],
+    ) -> None:
+        results = await asyncio.gather(
+            loader.load_by_email("user0@example.com"),
+            loader.load_by_email("user1@example.com"),
+            loader.load_by_email("user0@example.com"),
+        )
+
+        assert results == [rows[0], rows[1], rows[0]]
+        assert pool.acquired == 1
+        assert connection.queries[0][1] == ["user0@example.com", "user1@example.com"]
+
+    async def test_missing_key_returns_none(self, loader: PostgresUserLoader) -> None:
+        results = await asyncio.gather(
+            loader.load_by_email("user0@example.com"),
+            loader.load_by_email("missing@example.com"),
+        )
+
+        assert results[1] is None
+
+    async def test_lookups_by_id(
+        self, loader: PostgresUserLoader, rows: list[dict[str, Any]]
+    ) -> None:
+        assert await loader.load_by_id(rows[2]["id"]) == rows[2]
+        assert await loader.load_by_id(uuid4()) is None
+
+    async def test_batches_are_capped(
+        self, loader: PostgresUserLoader, connection: FakeConnection
+    ) -> None:
+        await asyncio.gather(
+            *(loader.load_by_email(f"user{index}@example.com") for index in range(5))
+        )
+
+        assert [len(keys) for _, keys in connection.queries] == [MAX_BATCH_SIZE, 2]
+        assert loader.queries == len(connection.queries)
+
+    async def test_query_error_reaches_every_caller(
+        self, loader: PostgresUserLoader, connection: FakeConnection
+    ) -> None:
+        connection.error = ConnectionError("down")
+
+        results = await asyncio.gather(
+            loader.load_by_email("user0@example.com"),
+            loader.load_by_email("user1@example.com"),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, ConnectionError) for result in results)
@@ -0,0 +1,160 @@
+"""Unit tests for PostgresUserPurger."""
+
+import contextlib
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, cast
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.domain import Email, Password, User
+from app.infrastructure.database.user_purger import PostgresUserPurger
+from app.infrastructure.user_cache.memory_user_cache import MemoryUserCache
+
+if TYPE_CHECKING:
+    import asyncpg
+
+MAX_AGE = timedelta(days=7)
+BATCH_SIZE = 3
+PASSWORD = Password.from_hash("$2b$12$" + "x" * 53)
+
+
+class FakeConnection:
+    """Keeps users as dicts, understands the purger queries only."""
+
+    def __init__(self) -> None:
+        self.users: list[dict[str, Any]] = []
+        self.locked = False
+        self.lock_taken_elsewhere = False
+        self.selects: list[tuple[datetime, UUID]] = []
+
+    async def fetchval(self, query: str, _key: int) -> bool:
+        assert "pg_try_advisory_lock" in query
+        if self.lock_taken_elsewhere:
+            return False
+        self.locked = True
+        return True
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        if "DELETE" in query:
+            return self.delete(*args)
+        cutoff, created_at, id_, limit = args
+        self.selects.append((created_at, id_))
+        rows = sorted(
+            (
+                user
+                for user in self.users
+                if not user["is_active"]
+                and user["created_at"] < cutoff
+                and (user["created_at"], user["id"]) > (created_at, id_)
+            ),
+            key=lambda user: (user["created_at"], user["id"]),
+        )
+        return rows[:limit]
+
+    def delete(self, ids: list[UUID], cutoff: datetime) -> list[dict[str, Any]]:
+        deleted = [
+            user
+            for user in self.users
+            if user["id"] in ids
+            and not user["is_active"]
+            and user["created_at"] < cutoff
+        ]
+        self.users = [user for user in self.users if user not in deleted]
+        return [{"email": user["email"]} for user in deleted]
+
+    async def execute(self, query: str, *_args: Any) -> str:
+        assert "pg_advisory_unlock" in query
+        self.locked = False
+        return "SELECT 1"
+
+
+class FakePool:
+    def __init__(self, connection: FakeConnection) -> None:
+        self._connection = connection
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[FakeConnection]:
+        yield self._connection
+
+
+class TestPostgresUserPurger:
+    """Tests for PostgresUserPurger."""
+
+    @pytest.fixture
+    def connection(self) -> FakeConnection:
+        connection = FakeConnection()
+        now = datetime.now(UTC)
+        for index, (days, is_active) in enumerate(
+            [(10, False)] * 7 + [(10, True), (1, False)]
+        ):
+            connection.users.append(
+                {
+                    "id": uuid4(),
+                    "email": f"user{index}@example.com",
+                    "created_at": now - timedelta(days=days),
+                    "is_active": is_active,
+                }
+            )
+        return connection
+
+    @pytest.fixture
+    def user_cache(self) -> MemoryUserCache:
+        return MemoryUserCache()
+
+    @pytest.fixture
+    def purger(
+        self, connection: FakeConnection, user_cache: MemoryUserCache
+    ) -> PostgresUserPurger:
+        return PostgresUserPurger(
+            cast("asyncpg.Pool", FakePool(connection)),
+            max_age_seconds=MAX_AGE.total_seconds(),
+            batch_size=BATCH_SIZE,
+            pause_seconds=0,
+            user_cache=user_cache,
+        )
+
+    async def test_purges_old_inactive_users_in_batches(
+        self, purger: PostgresUserPurger, connection: FakeConnection
+    ) -> None:
+        report = await purger.purge()
+
+        assert (report.deleted, report.batches) == (7, 3)
+        assert len(connection.users) == 2  # noqa: PLR2004 Magic value used in comparison
+        assert report.max_lock_seconds <= report.lock_seconds
+        assert purger.last_report is report
+        assert connection.locked is False
+
+    async def test_batches_follow_the_keyset(
+        self, purger: PostgresUserPurger, connection: FakeConnection
+    ) -> None:
+        await purger.purge()
+
+        cursors = connection.selects
+        assert cursors == sorted(cursors)
+        assert len(set(cursors)) == len(cursors)
+
+    async def test_purged_users_leave_the_cache(
+        self, purger: PostgresUserPurger, user_cache: MemoryUserCache
+    ) -> None:
+        purged = User.create(email=Email("user0@example.com"), password=PASSWORD)
+        active = User.create(email=Email("user7@example.com"), password=PASSWORD)
+        await user_cache.set(purged)
+        await user_cache.set(active)
+
+        await purger.purge()
+
+        assert await user_cache.get(purged.email) is None
+        assert await user_cache.get(active.email) is not None
+
+    async def test_skipped_while_another_instance_holds_the_lock(
+        self, purger: PostgresUserPurger, connection: FakeConnection
+    ) -> None:
+        connection.lock_taken_elsewhere = True
+
+        report = await purger.purge()
+
+        assert report.skipped is True
+        assert report.deleted == 0
+        assert len(connection.users) == 9  # noqa: PLR2004 Magic value used in comparison
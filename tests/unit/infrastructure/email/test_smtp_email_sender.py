@@ -0,0 +1,106 @@
+"""Unit tests for SmtpEmailSender against a local aiosmtpd server."""
+
+import asyncio
+import smtplib
+import socket
+from collections.abc import AsyncGenerator, Generator
+from email.message import EmailMessage
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.infrastructure.email.smtp_email_sender import SmtpEmailSender
+
+REFUSED_RECIPIENT = "refused@example.com"
+MESSAGE_COUNT = 20
+POOL_SIZE = 2
+
+
+class RecordingHandler:
+    """aiosmtpd handler recording delivered envelopes."""
+
+    def __init__(self) -> None:
+        self.recipients: list[str] = []
+
+    async def handle_RCPT(  # noqa: N802 aiosmtpd hook name
+        self, _server, _session, envelope, address, _rcpt_options
+    ) -> str:
+        if address == REFUSED_RECIPIENT:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, _server, _session, envelope) -> str:  # noqa: N802 aiosmtpd hook name
+        self.recipients.extend(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _message(recipient: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "no-reply@example.com"
+    message["To"] = recipient
+    message["Subject"] = "Your verification code: 1234"
+    message.set_content("Your verification code is 1234.")
+    return message
+
+
+class TestSmtpEmailSender:
+    """Tests for SmtpEmailSender."""
+
+    @pytest.fixture
+    def handler(self) -> RecordingHandler:
+        return RecordingHandler()
+
+    @pytest.fixture
+    def smtp_port(self, handler: RecordingHandler) -> Generator[int]:
+        port = _free_port()
+        controller = Controller(handler, hostname="127.0.0.1", port=port)
+        controller.start()
+        yield port
+        controller.stop()
+
+    @pytest.fixture
+    async def sender(self, smtp_port: int) -> AsyncGenerator[SmtpEmailSender]:
+        sender = SmtpEmailSender(
+            "127.0.0.1", smtp_port, pool_size=POOL_SIZE, per_domain_limit=10
+        )
+        yield sender
+        await sender.close()
+
+    async def test_send_delivers_message(
+        self, sender: SmtpEmailSender, handler: RecordingHandler
+    ) -> None:
+        await sender.send(_message("user@example.com"))
+
+        assert handler.recipients == ["user@example.com"]
+
+    async def test_concurrent_sends_reuse_pooled_connections(
+        self, sender: SmtpEmailSender, handler: RecordingHandler
+    ) -> None:
+        recipients = [f"user{i}@example.com" for i in range(MESSAGE_COUNT)]
+
+        await asyncio.gather(*(sender.send(_message(r)) for r in recipients))
+
+        assert sorted(handler.recipients) == sorted(recipients)
+        assert sender.connections_opened <= POOL_SIZE
+
+    async def test_refused_recipient_raises_and_keeps_session(
+        self, smtp_port: int, handler: RecordingHandler
+    ) -> None:
+        sender = SmtpEmailSender("127.0.0.1", smtp_port, pool_size=1)
+        try:
+            await sender.send(_message("user@example.com"))
+            with pytest.raises(smtplib.SMTPRecipientsRefused):
+                await sender.send(_message(REFUSED_RECIPIENT))
+            await sender.send(_message("other@example.com"))
+        finally:
+            await sender.close()
+
+        assert handler.recipients == ["user@example.com", "other@example.com"]
+        assert sender.connections_opened == 1
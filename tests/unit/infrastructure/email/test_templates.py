@@ -0,0 +1,36 @@
+"""Unit tests for email templates."""
+
+import pytest
+
+from app.infrastructure.email.templates import render_event_email
+
+SENDER = "no-reply@example.com"
+
+
+class TestRenderEventEmail:
+    """Tests for render_event_email()."""
+
+    @pytest.mark.parametrize(
+        "event_type", ["UserRegistered", "UserNewVerificationCodeCreated"]
+    )
+    def test_renders_verification_code(self, event_type: str) -> None:
+        message = {
+            "event_type": event_type,
+            "payload": {"user_id": "1", "email": "user@example.com", "code": "1234"},
+        }
+
+        email = render_event_email(message, SENDER)
+
+        assert email is not None
+        assert email["From"] == SENDER
+        assert email["To"] == "user@example.com"
+        assert "1234" in email["Subject"]
+        assert "1234" in email.get_content()
+
+    def test_event_without_email_returns_none(self) -> None:
+        message = {
+            "event_type": "UserActivated",
+            "payload": {"user_id": "1", "email": "user@example.com"},
+        }
+
+        assert render_event_email(message, SENDER) is None
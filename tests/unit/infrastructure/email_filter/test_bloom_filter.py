@@ -0,0 +1,56 @@
+"""Unit tests for the Bloom filter."""
+
+import pytest
+
+from app.infrastructure.email_filter.bloom_filter import BloomFilter, BloomParameters
+
+CAPACITY = 10_000
+FALSE_POSITIVE_RATE = 0.01
+
+
+class TestBloomParameters:
+    """Tests for BloomParameters."""
+
+    def test_optimal_parameters(self) -> None:
+        parameters = BloomParameters.for_capacity(100_000_000, FALSE_POSITIVE_RATE)
+
+        # ~9.6 bits and 7 hashes per item at 1%
+        assert parameters.bits == pytest.approx(958_505_838, rel=1e-6)
+        assert parameters.hashes == 7  # noqa: PLR2004 Magic value used in comparison
+        assert parameters.false_positive_rate(100_000_000) == pytest.approx(
+            FALSE_POSITIVE_RATE, rel=0.05
+        )
+
+    def test_positions_are_stable_and_in_range(self) -> None:
+        parameters = BloomParameters.for_capacity(CAPACITY, FALSE_POSITIVE_RATE)
+
+        positions = parameters.positions("user@example.com")
+
+        assert positions == parameters.positions("user@example.com")
+        assert len(positions) == parameters.hashes
+        assert all(0 <= position < parameters.bits for position in positions)
+
+
+class TestBloomFilter:
+    """Tests for BloomFilter."""
+
+    @pytest.fixture
+    def bloom_filter(self) -> BloomFilter:
+        bloom_filter = BloomFilter(
+            BloomParameters.for_capacity(CAPACITY, FALSE_POSITIVE_RATE)
+        )
+        for index in range(CAPACITY):
+            bloom_filter.add(f"user{index}@example.com")
+        return bloom_filter
+
+    def test_no_false_negatives(self, bloom_filter: BloomFilter) -> None:
+        assert all(
+            f"user{index}@example.com" in bloom_filter for index in range(CAPACITY)
+        )
+
+    def test_false_positive_rate_at_capacity(self, bloom_filter: BloomFilter) -> None:
+        false_positives = sum(
+            f"other{index}@example.com" in bloom_filter for index in range(CAPACITY)
+        )
+
+        assert false_positives / CAPACITY < 2 * FALSE_POSITIVE_RATE
@@ -0,0 +1,33 @@
+"""Unit tests for MemoryEmailFilter."""
+
+import pytest
+
+from app.domain import Email
+from app.infrastructure.email_filter.memory_email_filter import MemoryEmailFilter
+
+
+class TestMemoryEmailFilter:
+    """Tests for MemoryEmailFilter."""
+
+    @pytest.fixture
+    def email_filter(self) -> MemoryEmailFilter:
+        return MemoryEmailFilter(capacity=1_000)
+
+    async def test_everything_might_exist_until_populated(
+        self, email_filter: MemoryEmailFilter
+    ) -> None:
+        assert await email_filter.might_contain(Email("new@example.com")) is True
+
+        await email_filter.mark_populated()
+
+        assert await email_filter.might_contain(Email("new@example.com")) is False
+
+    async def test_added_emails_might_exist(
+        self, email_filter: MemoryEmailFilter
+    ) -> None:
+        await email_filter.add_many(["a@example.com"])
+        await email_filter.add(Email("b@example.com"))
+        await email_filter.mark_populated()
+
+        assert await email_filter.might_contain(Email("a@example.com")) is True
+        assert await email_filter.might_contain(Email("B@example.com")) is True
@@ -0,0 +1,151 @@
+"""Unit tests for DeliveryPipeline."""
+
+import asyncio
+import socket
+import threading
+import time
+from collections.abc import AsyncGenerator, Callable, Coroutine, Generator
+from email.message import EmailMessage
+from typing import Any
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.infrastructure.email.smtp_email_sender import SmtpEmailSender
+from app.infrastructure.event_consumer.delivery_pipeline import (
+    DeliveryPipeline,
+    Outcome,
+)
+
+DELIVERY_COUNT = 40
+POOL_SIZE = 2
+MAX_IN_FLIGHT = 8
+
+
+class RecordingHandler:
+    """aiosmtpd handler recording delivered recipients."""
+
+    def __init__(self) -> None:
+        self.recipients: list[str] = []
+
+    async def handle_DATA(self, _server, _session, envelope) -> str:  # noqa: N802 aiosmtpd hook name
+        self.recipients.extend(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+
+class Settled:
+    """Outcomes of the settled deliveries, with the thread settling them."""
+
+    def __init__(self) -> None:
+        self.outcomes: dict[int, Outcome] = {}
+        self.threads: set[str] = set()
+
+    def __call__(self, delivery: int, outcome: Outcome) -> None:
+        self.outcomes[delivery] = outcome
+        self.threads.add(threading.current_thread().name)
+
+
+def consume(
+    pipeline: DeliveryPipeline[int],
+    processing: Callable[[int], Coroutine[Any, Any, Outcome]],
+) -> None:
+    """Submit the deliveries as the consumer thread does, then settle them."""
+    for delivery in range(DELIVERY_COUNT):
+        pipeline.submit(delivery, processing(delivery))
+    while pipeline.in_flight:
+        time.sleep(0.001)
+        pipeline.settle_ready()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _message(recipient: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "no-reply@example.com"
+    message["To"] = recipient
+    message["Subject"] = "Your verification code: 1234"
+    message.set_content("Your verification code is 1234.")
+    return message
+
+
+class TestDeliveryPipeline:
+    """Tests for DeliveryPipeline."""
+
+    @pytest.fixture
+    def handler(self) -> RecordingHandler:
+        return RecordingHandler()
+
+    @pytest.fixture
+    def smtp_port(self, handler: RecordingHandler) -> Generator[int]:
+        port = _free_port()
+        controller = Controller(handler, hostname="127.0.0.1", port=port)
+        controller.start()
+        yield port
+        controller.stop()
+
+    @pytest.fixture
+    async def sender(self, smtp_port: int) -> AsyncGenerator[SmtpEmailSender]:
+        sender = SmtpEmailSender(
+            "127.0.0.1", smtp_port, pool_size=POOL_SIZE, per_domain_limit=10
+        )
+        yield sender
+        await sender.close()
+
+    @pytest.fixture
+    def settled(self) -> Settled:
+        return Settled()
+
+    @pytest.fixture
+    async def pipeline(self, settled: Settled) -> DeliveryPipeline[int]:
+        return DeliveryPipeline(
+            asyncio.get_running_loop(), settled, max_in_flight=MAX_IN_FLIGHT
+        )
+
+    async def test_deliveries_share_the_smtp_sessions_concurrently(
+        self,
+        pipeline: DeliveryPipeline[int],
+        settled: Settled,
+        sender: SmtpEmailSender,
+        handler: RecordingHandler,
+    ) -> None:
+        sending = 0
+        peak = 0
+
+        async def send(delivery: int) -> Outcome:
+            nonlocal sending, peak
+            sending += 1
+            peak = max(peak, sending)
+            try:
+                await sender.send(_message(f"user{delivery}@example.com"))
+            finally:
+                sending -= 1
+            return Outcome.ACCEPT
+
+        await asyncio.to_thread(consume, pipeline, send)
+
+        assert settled.outcomes == dict.fromkeys(range(DELIVERY_COUNT), Outcome.ACCEPT)
+        assert len(handler.recipients) == DELIVERY_COUNT
+        assert 1 < peak <= MAX_IN_FLIGHT
+        assert sender.connections_opened <= POOL_SIZE
+        # Settled on the consumer thread only, never on the loop's
+        assert threading.current_thread().name not in settled.threads
+
+    async def test_failed_processing_is_requeued(
+        self, pipeline: DeliveryPipeline[int], settled: Settled
+    ) -> None:
+        async def fail(delivery: int) -> Outcome:
+            if delivery % 2:
+                msg = "unexpected"
+                raise RuntimeError(msg)
+            return Outcome.ACCEPT
+
+        await asyncio.to_thread(consume, pipeline, fail)
+
+        assert settled.outcomes == {
+            delivery: Outcome.REQUEUE if delivery % 2 else Outcome.ACCEPT
+            for delivery in range(DELIVERY_COUNT)
+        }
@@ -0,0 +1,71 @@
+"""Unit tests for MemoryEventDeduplicator."""
+
+import pytest
+
+from app.infrastructure.event_deduplicator.memory_event_deduplicator import (
+    MemoryEventDeduplicator,
+)
+from tests.unit.fakes.fake_clock import FakeClock
+
+MAX_ENTRIES = 3
+
+
+class TestMemoryEventDeduplicator:
+    """Tests for MemoryEventDeduplicator."""
+
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def deduplicator(self, clock: FakeClock) -> MemoryEventDeduplicator:
+        return MemoryEventDeduplicator(
+            window_seconds=10, max_entries=MAX_ENTRIES, clock=clock
+        )
+
+    async def test_first_claim_succeeds(
+        self, deduplicator: MemoryEventDeduplicator
+    ) -> None:
+        assert await deduplicator.claim("event-1") is True
+
+    async def test_duplicate_claim_fails(
+        self, deduplicator: MemoryEventDeduplicator
+    ) -> None:
+        await deduplicator.claim("event-1")
+
+        assert await deduplicator.claim("event-1") is False
+
+    async def test_claim_succeeds_again_after_window(
+        self, deduplicator: MemoryEventDeduplicator, clock: FakeClock
+    ) -> None:
+        await deduplicator.claim("event-1")
+        clock.now = 11
+
+        assert await deduplicator.claim("event-1") is True
+
+    async def test_expired_entries_are_evicted(
+        self, deduplicator: MemoryEventDeduplicator, clock: FakeClock
+    ) -> None:
+        await deduplicator.claim("event-1")
+        await deduplicator.claim("event-2")
+        clock.now = 11
+        await deduplicator.claim("event-3")
+
+        assert len(deduplicator) == 1
+
+    async def test_oldest_entry_dropped_when_full(
+        self, deduplicator: MemoryEventDeduplicator
+    ) -> None:
+        for event_id in ("event-1", "event-2", "event-3", "event-4"):
+            await deduplicator.claim(event_id)
+
+        assert len(deduplicator) == MAX_ENTRIES
+        assert await deduplicator.claim("event-1") is True
+
+    async def test_release_allows_reprocessing(
+        self, deduplicator: MemoryEventDeduplicator
+    ) -> None:
+        await deduplicator.claim("event-1")
+        await deduplicator.release("event-1")
+
+        assert await deduplicator.claim("event-1") is True
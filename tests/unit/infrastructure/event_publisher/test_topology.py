@@ -0,0 +1,56 @@
+"""Unit tests for RabbitMQ topology helpers."""
+
+from datetime import timedelta
+
+import pytest
+
+from app.infrastructure.event_publisher.topology import (
+    RetryPolicy,
+    main_queue_specification,
+    retry_queue_specification,
+)
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy.next_delay()."""
+
+    @pytest.fixture
+    def retry_policy(self) -> RetryPolicy:
+        return RetryPolicy(delays_seconds=(5, 15), max_attempts=4)
+
+    @pytest.mark.parametrize(
+        ("attempt", "expected"),
+        [
+            (1, 5),
+            (2, 15),
+            (3, 15),  # Last delay is reused
+            (4, None),  # Max attempts reached, dead-letter
+            (5, None),
+        ],
+    )
+    def test_next_delay(
+        self, retry_policy: RetryPolicy, attempt: int, expected: int | None
+    ) -> None:
+        assert retry_policy.next_delay(attempt) == expected
+
+    def test_empty_delays_raise(self) -> None:
+        with pytest.raises(ValueError, match="At least one retry delay"):
+            RetryPolicy(delays_seconds=(), max_attempts=3)
+
+
+class TestQueueSpecifications:
+    """Tests for queue specifications."""
+
+    def test_main_queue_dead_letters_to_exchange_dlx(self) -> None:
+        spec = main_queue_specification("registration", "user_events")
+
+        assert spec.name == "user_events"
+        assert spec.dead_letter_exchange == "registration.dlx"
+
+    def test_retry_queue_expires_back_to_main_queue(self) -> None:
+        spec = retry_queue_specification("user_events", 15)
+
+        assert spec.name == "user_events.retry.15s"
+        assert spec.message_ttl == timedelta(seconds=15)
+        assert spec.dead_letter_exchange == ""
+        assert spec.dead_letter_routing_key == "user_events"
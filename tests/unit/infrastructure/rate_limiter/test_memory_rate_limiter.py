@@ -0,0 +1,56 @@
+"""Unit tests for MemoryRateLimiter."""
+
+import pytest
+
+from app.infrastructure.rate_limiter.memory_rate_limiter import MemoryRateLimiter
+from tests.unit.fakes.fake_clock import FakeClock
+
+CAPACITY = 2
+REFILL_PER_SECOND = 0.5
+
+
+class TestMemoryRateLimiter:
+    """Tests for MemoryRateLimiter."""
+
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def limiter(self, clock: FakeClock) -> MemoryRateLimiter:
+        return MemoryRateLimiter(max_entries=2, clock=clock)
+
+    async def acquire(self, limiter: MemoryRateLimiter, key: str = "key") -> float:
+        return await limiter.acquire(key, CAPACITY, REFILL_PER_SECOND)
+
+    async def test_burst_up_to_capacity(self, limiter: MemoryRateLimiter) -> None:
+        assert await self.acquire(limiter) == 0
+        assert await self.acquire(limiter) == 0
+        assert await self.acquire(limiter) == pytest.approx(2.0)
+
+    async def test_tokens_refill_over_time(
+        self, limiter: MemoryRateLimiter, clock: FakeClock
+    ) -> None:
+        for _ in range(CAPACITY):
+            await self.acquire(limiter)
+
+        clock.now = 1.0
+        assert await self.acquire(limiter) == pytest.approx(1.0)
+        clock.now = 2.0
+        assert await self.acquire(limiter) == 0
+
+    async def test_keys_have_separate_buckets(self, limiter: MemoryRateLimiter) -> None:
+        for _ in range(CAPACITY):
+            await self.acquire(limiter, "a")
+
+        assert await self.acquire(limiter, "b") == 0
+
+    async def test_least_recently_used_bucket_is_dropped(
+        self, limiter: MemoryRateLimiter
+    ) -> None:
+        for _ in range(CAPACITY):
+            await self.acquire(limiter, "a")
+        await self.acquire(limiter, "b")
+        await self.acquire(limiter, "c")
+
+        assert await self.acquire(limiter, "a") == 0
@@ -0,0 +1,99 @@
+"""Unit tests for RedisRateLimiter local fast path."""
+
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+
+from app.infrastructure.rate_limiter.redis_rate_limiter import RedisRateLimiter
+from tests.unit.fakes.fake_clock import FakeClock
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+CAPACITY = 100
+
+
+class FakeScript:
+    """Stands in for the Lua script: fixed bucket state, records the calls."""
+
+    def __init__(self) -> None:
+        self.tokens = float(CAPACITY)
+        self.retry_ms = 0
+        self.keys: list[str] = []
+        self.calls: list[list[Any]] = []
+
+    async def __call__(self, keys: list[str], args: list[Any]) -> list[Any]:
+        self.keys.extend(keys)
+        self.calls.append(args)
+        _capacity, _rate, debt = args
+        self.tokens -= debt + 1
+        return [self.retry_ms, str(self.tokens)]
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.script = FakeScript()
+
+    def register_script(self, _source: str) -> FakeScript:
+        return self.script
+
+
+class TestRedisRateLimiter:
+    """Tests for RedisRateLimiter."""
+
+    @pytest.fixture
+    def client(self) -> FakeRedis:
+        return FakeRedis()
+
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def limiter(self, client: FakeRedis, clock: FakeClock) -> RedisRateLimiter:
+        return RedisRateLimiter(
+            cast("Redis", client),
+            local_fraction=0.05,
+            local_seconds=1.0,
+            clock=clock,
+        )
+
+    async def test_grants_locally_then_charges_debt(
+        self, limiter: RedisRateLimiter, client: FakeRedis
+    ) -> None:
+        # 99 tokens left after the first call, so 4 can be granted locally
+        for _ in range(6):
+            assert await limiter.acquire("key", CAPACITY, 1.0) == 0
+
+        assert [args[2] for args in client.script.calls] == [0, 4]
+        assert client.script.tokens == CAPACITY - 6
+        assert client.script.keys == ["rate_limit:key", "rate_limit:key"]
+
+    async def test_local_budget_expires(
+        self, limiter: RedisRateLimiter, client: FakeRedis, clock: FakeClock
+    ) -> None:
+        await limiter.acquire("key", CAPACITY, 1.0)
+        await limiter.acquire("key", CAPACITY, 1.0)
+
+        clock.now = 1.0
+        await limiter.acquire("key", CAPACITY, 1.0)
+
+        assert [args[2] for args in client.script.calls] == [0, 1]
+
+    async def test_no_local_budget_near_the_limit(
+        self, limiter: RedisRateLimiter, client: FakeRedis
+    ) -> None:
+        client.script.tokens = 10.0
+
+        await limiter.acquire("key", CAPACITY, 1.0)
+        await limiter.acquire("key", CAPACITY, 1.0)
+
+        assert [args[2] for args in client.script.calls] == [0, 0]
+
+    async def test_returns_retry_after_seconds(
+        self, limiter: RedisRateLimiter, client: FakeRedis
+    ) -> None:
+        client.script.tokens = 0.5
+        client.script.retry_ms = 1500
+
+        assert await limiter.acquire("key", CAPACITY, 1.0) == pytest.approx(1.5)
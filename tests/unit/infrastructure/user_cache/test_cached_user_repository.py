@@ -0,0 +1,61 @@
+"""Unit tests for CachedUserRepository and CachingUnitOfWork."""
+
+import pytest
+
+from app.domain import Email, Password, User
+from app.infrastructure.user_cache.cached_user_repository import CachingUnitOfWork
+from app.infrastructure.user_cache.memory_user_cache import MemoryUserCache
+from tests.unit.fakes.fake_unit_of_work import FakeUnitOfWork
+
+EMAIL = Email("user@example.com")
+
+
+class TestCachingUnitOfWork:
+    """Tests for CachingUnitOfWork."""
+
+    @pytest.fixture
+    def cache(self) -> MemoryUserCache:
+        return MemoryUserCache()
+
+    @pytest.fixture
+    async def inner(self) -> FakeUnitOfWork:
+        inner = FakeUnitOfWork()
+        user = User.create(email=EMAIL, password=Password.from_hash("hash"))
+        await inner.user_repository.save(user)
+        return inner
+
+    async def test_second_lookup_is_served_from_cache(
+        self, inner: FakeUnitOfWork, cache: MemoryUserCache
+    ) -> None:
+        for _ in range(2):
+            async with CachingUnitOfWork(inner, cache) as uow:
+                user = await uow.user_repository.get_by_email(EMAIL)
+                assert user is not None
+
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_save_invalidates_entry(
+        self, inner: FakeUnitOfWork, cache: MemoryUserCache
+    ) -> None:
+        async with CachingUnitOfWork(inner, cache) as uow:
+            user = await uow.user_repository.get_by_email(EMAIL)
+            assert user is not None
+            user.activate()
+            await uow.user_repository.save(user)
+
+        async with CachingUnitOfWork(inner, cache) as uow:
+            user = await uow.user_repository.get_by_email(EMAIL)
+            assert user is not None
+            assert user.is_active is True
+
+    async def test_entry_cached_before_commit_is_invalidated_after(
+        self, inner: FakeUnitOfWork, cache: MemoryUserCache
+    ) -> None:
+        async with CachingUnitOfWork(inner, cache) as uow:
+            user = await uow.user_repository.get_by_email(EMAIL)
+            assert user is not None
+            await uow.user_repository.save(user)
+            # A concurrent read caching the row before this commit
+            await cache.set(user)
+
+        assert await cache.get(EMAIL) is None
@@ -0,0 +1,70 @@
+"""Unit tests for MemoryUserCache."""
+
+import pytest
+
+from app.domain import Email, Password, User
+from app.infrastructure.user_cache.memory_user_cache import MemoryUserCache
+from tests.unit.fakes.fake_clock import FakeClock
+
+
+def make_user(email: str) -> User:
+    return User.create(email=Email(email), password=Password.from_hash("hash"))
+
+
+class TestMemoryUserCache:
+    """Tests for MemoryUserCache."""
+
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def cache(self, clock: FakeClock) -> MemoryUserCache:
+        return MemoryUserCache(ttl_seconds=10, max_entries=2, clock=clock)
+
+    async def test_hit_returns_a_fresh_copy(self, cache: MemoryUserCache) -> None:
+        user = make_user("a@example.com")
+        await cache.set(user)
+
+        cached = await cache.get(user.email)
+        assert cached is not None
+        cached.activate()
+
+        again = await cache.get(user.email)
+        assert again is not None
+        assert again.id == user.id
+        assert again.is_active is False
+        assert (cache.hits, cache.misses) == (2, 0)
+
+    async def test_entry_expires(
+        self, cache: MemoryUserCache, clock: FakeClock
+    ) -> None:
+        user = make_user("a@example.com")
+        await cache.set(user)
+
+        clock.now = 10.0
+
+        assert await cache.get(user.email) is None
+        assert cache.misses == 1
+
+    async def test_invalidate(self, cache: MemoryUserCache) -> None:
+        user = make_user("a@example.com")
+        await cache.set(user)
+
+        await cache.invalidate(user.email)
+
+        assert await cache.get(user.email) is None
+
+    async def test_least_recently_used_entry_is_dropped(
+        self, cache: MemoryUserCache
+    ) -> None:
+        first, second, third = (
+            make_user(f"{name}@example.com") for name in ("a", "b", "c")
+        )
+        await cache.set(first)
+        await cache.set(second)
+        await cache.get(first.email)
+        await cache.set(third)
+
+        assert await cache.get(first.email) is not None
+        assert await cache.get(second.email) is None
@@ -0,0 +1,94 @@
+"""Unit tests for PubSubUserCache."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, cast
+
+import redis.asyncio as redis
+
+from app.domain import Email, Password, User
+from app.infrastructure.user_cache.memory_user_cache import MemoryUserCache
+from app.infrastructure.user_cache.pubsub_user_cache import (
+    INVALIDATION_CHANNEL,
+    PubSubUserCache,
+)
+
+
+def make_user(email: str) -> User:
+    return User.create(email=Email(email), password=Password.from_hash("hash"))
+
+
+class FakePubSub:
+    """Delivers the invalidations it is sent, until its connection drops."""
+
+    def __init__(self, subscriptions: asyncio.Queue["FakePubSub"]) -> None:
+        self._subscriptions = subscriptions
+        self.closed = False
+        self._messages: asyncio.Queue[str | None] = asyncio.Queue()
+
+    def send(self, email: str) -> None:
+        self._messages.put_nowait(email)
+
+    def drop(self) -> None:
+        self._messages.put_nowait(None)
+
+    async def subscribe(self, channel: str) -> None:
+        assert channel == INVALIDATION_CHANNEL
+        self._subscriptions.put_nowait(self)
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        yield {"type": "subscribe", "data": 1}
+        while (email := await self._messages.get()) is not None:
+            yield {"type": "message", "data": email}
+        msg = "Connection closed by server."
+        raise redis.ConnectionError(msg)
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class FakeRedis:
+    """Hands out a new FakePubSub per subscription."""
+
+    def __init__(self) -> None:
+        self.subscriptions: asyncio.Queue[FakePubSub] = asyncio.Queue()
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self.subscriptions)
+
+
+class TestPubSubUserCache:
+    """Tests for PubSubUserCache."""
+
+    async def test_listen_resubscribes_and_clears_after_a_dropped_connection(
+        self,
+    ) -> None:
+        client = FakeRedis()
+        local = MemoryUserCache()
+        cache = PubSubUserCache(
+            local, cast("redis.Redis", client), retry_seconds=0, max_retry_seconds=0
+        )
+        listener = asyncio.create_task(cache.listen())
+        try:
+            first = await asyncio.wait_for(client.subscriptions.get(), 1)
+            invalidated, stale = make_user("a@example.com"), make_user("b@example.com")
+            await cache.set(invalidated)
+            first.send("a@example.com")
+            await asyncio.sleep(0)
+            assert await cache.get(invalidated.email) is None
+
+            await cache.set(stale)
+            first.drop()
+            second = await asyncio.wait_for(client.subscriptions.get(), 1)
+
+            assert first.closed
+            assert not listener.done()
+            # Invalidations published while disconnected are lost
+            assert await cache.get(stale.email) is None
+
+            await cache.set(stale)
+            second.send("b@example.com")
+            await asyncio.sleep(0)
+            assert await cache.get(stale.email) is None
+        finally:
+            listener.cancel()
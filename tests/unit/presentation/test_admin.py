@@ -0,0 +1,95 @@
+"""Unit tests for the admin routes."""
+
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Any
+
+import orjson
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.presentation.dependencies import user_exporter
+from app.presentation.routers.v1.admin import router
+
+URL = "/admin/users/export"
+TOKEN = "admin-token"  # noqa: S105 Possible hardcoded password
+HEADERS = {"Authorization": f"Bearer {TOKEN}"}
+ROWS = [
+    {"id": 1, "email": "first@example.com", "is_active": True},
+    {"id": 2, "email": "second@example.com", "is_active": False},
+]
+
+
+class FakeExporter:
+    def __init__(self) -> None:
+        self.with_password_hash: bool | None = None
+
+    def __call__(self, *, with_password_hash: bool = False) -> AsyncIterator[Any]:
+        self.with_password_hash = with_password_hash
+        return self._batches()
+
+    @staticmethod
+    async def _batches() -> AsyncIterator[list[dict[str, Any]]]:
+        for row in ROWS:
+            yield [row]
+
+
+class TestExportUsersRoute:
+    """Tests for GET /admin/users/export."""
+
+    @pytest.fixture
+    def exporter(self) -> FakeExporter:
+        return FakeExporter()
+
+    @pytest.fixture
+    async def client(
+        self, exporter: FakeExporter, monkeypatch: pytest.MonkeyPatch
+    ) -> AsyncGenerator[AsyncClient]:
+        monkeypatch.setattr(settings, "admin_token", TOKEN)
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[user_exporter] = lambda: exporter
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+
+    async def test_streams_ndjson(
+        self, client: AsyncClient, exporter: FakeExporter
+    ) -> None:
+        response = await client.get(URL, headers=HEADERS)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [orjson.loads(line) for line in response.content.splitlines()] == ROWS
+        assert exporter.with_password_hash is False
+
+    async def test_streams_csv_with_password_hash(
+        self, client: AsyncClient, exporter: FakeExporter
+    ) -> None:
+        response = await client.get(
+            URL,
+            params={"export_format": "csv", "with_password_hash": "true"},
+            headers=HEADERS,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        header = response.text.splitlines()[0]
+        assert header.endswith(",hashed_password")
+        assert exporter.with_password_hash is True
+
+    async def test_wrong_token_is_unauthorized(self, client: AsyncClient) -> None:
+        response = await client.get(URL, headers={"Authorization": "Bearer wrong"})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_routes_are_disabled_without_token(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "admin_token", None)
+
+        response = await client.get(URL, headers=HEADERS)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,66 @@
+"""Unit tests for the export encoders."""
+
+import csv
+import io
+from collections.abc import AsyncIterator
+from typing import Any
+
+import orjson
+
+from app.presentation.export_encoders import encode_csv, encode_ndjson
+
+COLUMNS = ("id", "email", "is_active")
+BATCHES = [
+    [
+        {"id": 1, "email": "first@example.com", "is_active": True},
+        {"id": 2, "email": "second, quoted@example.com", "is_active": False},
+    ],
+    [{"id": 3, "email": "third@example.com", "is_active": False}],
+]
+
+
+async def dict_batches(
+    items: list[list[dict[str, Any]]],
+) -> AsyncIterator[list[dict[str, Any]]]:
+    for rows in items:
+        yield rows
+
+
+async def tuple_batches(
+    items: list[list[dict[str, Any]]],
+) -> AsyncIterator[list[tuple[Any, ...]]]:
+    # Records iterate over their values, as tuples do
+    for rows in items:
+        yield [tuple(row.values()) for row in rows]
+
+
+class TestEncodeNdjson:
+    """Tests for encode_ndjson."""
+
+    async def test_one_chunk_per_batch_one_line_per_row(self) -> None:
+        chunks = [chunk async for chunk in encode_ndjson(dict_batches(BATCHES))]
+
+        assert len(chunks) == len(BATCHES)
+        lines = b"".join(chunks).splitlines()
+        assert [orjson.loads(line) for line in lines] == [
+            row for rows in BATCHES for row in rows
+        ]
+
+
+class TestEncodeCsv:
+    """Tests for encode_csv."""
+
+    async def test_header_then_one_chunk_per_batch(self) -> None:
+        chunks = [chunk async for chunk in encode_csv(tuple_batches(BATCHES), COLUMNS)]
+
+        assert len(chunks) == len(BATCHES)
+        reader = csv.reader(io.StringIO(b"".join(chunks).decode()))
+        assert next(reader) == list(COLUMNS)
+        assert [row[1] for row in reader] == [
+            row["email"] for rows in BATCHES for row in rows
+        ]
+
+    async def test_no_rows_is_a_header(self) -> None:
+        chunks = [chunk async for chunk in encode_csv(tuple_batches([]), COLUMNS)]
+
+        assert chunks == [b"id,email,is_active\r\n"]
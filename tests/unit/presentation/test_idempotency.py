@@ -0,0 +1,121 @@
+"""Unit tests for IdempotencyMiddleware."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.infrastructure.idempotency_store.memory_idempotency_store import (
+    MemoryIdempotencyStore,
+)
+from app.presentation.idempotency import IdempotencyMiddleware
+
+KEY = {"Idempotency-Key": "key-1"}
+PAYLOAD = {"email": "user@example.com"}
+
+
+class Route:
+    """Counts calls, can be held open or made to fail."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.failures = 0
+        self.gate: asyncio.Event | None = None
+
+
+class TestIdempotencyMiddleware:
+    """Tests for IdempotencyMiddleware."""
+
+    @pytest.fixture
+    def route(self) -> Route:
+        return Route()
+
+    @pytest.fixture
+    async def client(self, route: Route) -> AsyncGenerator[AsyncClient]:
+        app = FastAPI()
+        store = MemoryIdempotencyStore()
+        app.add_middleware(
+            IdempotencyMiddleware,
+            store=lambda: store,
+            paths=["/register"],
+            wait_seconds=1.0,
+        )
+
+        @app.post("/register", status_code=status.HTTP_201_CREATED)
+        async def register(request: Request) -> JSONResponse:
+            route.calls += 1
+            if route.gate is not None:
+                await route.gate.wait()
+            if route.failures:
+                route.failures -= 1
+                return JSONResponse({}, status.HTTP_503_SERVICE_UNAVAILABLE)
+            body = await request.json()
+            return JSONResponse({"call": route.calls, **body}, status.HTTP_201_CREATED)
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+
+    async def test_retry_replays_stored_response(
+        self, client: AsyncClient, route: Route
+    ) -> None:
+        first = await client.post("/register", json=PAYLOAD, headers=KEY)
+        retry = await client.post("/register", json=PAYLOAD, headers=KEY)
+
+        assert route.calls == 1
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert retry.json() == first.json()
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert retry.headers["content-type"] == "application/json"
+
+    async def test_concurrent_duplicates_wait_for_first_result(
+        self, client: AsyncClient, route: Route
+    ) -> None:
+        route.gate = asyncio.Event()
+        requests = [
+            asyncio.create_task(client.post("/register", json=PAYLOAD, headers=KEY))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        route.gate.set()
+        responses = await asyncio.gather(*requests)
+
+        assert route.calls == 1
+        assert {response.status_code for response in responses} == {
+            status.HTTP_201_CREATED
+        }
+
+    async def test_key_reused_with_another_body_is_rejected(
+        self, client: AsyncClient
+    ) -> None:
+        await client.post("/register", json=PAYLOAD, headers=KEY)
+
+        response = await client.post(
+            "/register", json={"email": "other@example.com"}, headers=KEY
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    async def test_server_error_is_not_stored(
+        self, client: AsyncClient, route: Route
+    ) -> None:
+        route.failures = 1
+
+        first = await client.post("/register", json=PAYLOAD, headers=KEY)
+        retry = await client.post("/register", json=PAYLOAD, headers=KEY)
+
+        assert first.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert route.calls == 2  # noqa: PLR2004 Magic value used in comparison
+
+    async def test_requests_without_key_always_run(
+        self, client: AsyncClient, route: Route
+    ) -> None:
+        await client.post("/register", json=PAYLOAD)
+        await client.post("/register", json=PAYLOAD)
+
+        assert route.calls == 2  # noqa: PLR2004 Magic value used in comparison
@@ -0,0 +1,131 @@
+"""Unit tests for the admin user listing route."""
+
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+import pytest
+from fastapi import FastAPI, HTTPException, status
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.domain import Email, Password, User
+from app.presentation.dependencies import user_lister
+from app.presentation.pagination import decode_cursor, encode_cursor
+from app.presentation.routers.v1.users import router
+
+URL = "/users"
+TOKEN = "admin-token"  # noqa: S105 Possible hardcoded password
+HEADERS = {"Authorization": f"Bearer {TOKEN}"}
+
+
+class FakeLister:
+    """Pages through its users, records the arguments of the last call."""
+
+    def __init__(self, users: list[User]) -> None:
+        self.users = users
+        self.calls: list[dict[str, Any]] = []
+
+    async def __call__(
+        self,
+        limit: int,
+        after: tuple[datetime, UUID],
+        *,
+        is_active: bool | None = None,
+        email_prefix: str | None = None,
+    ) -> list[User]:
+        self.calls.append({"is_active": is_active, "email_prefix": email_prefix})
+        users = [
+            user for user in self.users if (user.created_at, user.id.value) > after
+        ]
+        return users[:limit]
+
+
+class TestPagination:
+    """Tests for the keyset cursors."""
+
+    def test_cursor_round_trip(self) -> None:
+        after = (datetime.now(UTC), UUID(int=42))
+
+        assert decode_cursor(encode_cursor(*after)) == after
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not a cursor",
+            # Without a time zone
+            encode_cursor(datetime(2026, 1, 1), UUID(int=42)),  # noqa: DTZ001 naive on purpose
+        ],
+    )
+    def test_invalid_cursor_is_a_bad_request(self, cursor: str) -> None:
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor)
+
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestListUsersRoute:
+    """Tests for GET /users."""
+
+    @pytest.fixture
+    def lister(self) -> FakeLister:
+        start = datetime(2026, 1, 1, tzinfo=UTC)
+        users = []
+        for index in range(5):
+            user = User.create(
+                email=Email(f"user{index}@example.com"),
+                password=Password.from_hash("hash"),
+            )
+            user.created_at = start + timedelta(minutes=index)
+            users.append(user)
+        return FakeLister(users)
+
+    @pytest.fixture
+    async def client(
+        self, lister: FakeLister, monkeypatch: pytest.MonkeyPatch
+    ) -> AsyncGenerator[AsyncClient]:
+        monkeypatch.setattr(settings, "admin_token", TOKEN)
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[user_lister] = lambda: lister
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+
+    async def test_pages_follow_the_next_cursor(self, client: AsyncClient) -> None:
+        emails: list[str] = []
+        params: dict[str, Any] = {"limit": 2}
+        while True:
+            response = await client.get(URL, params=params, headers=HEADERS)
+            assert response.status_code == status.HTTP_200_OK
+            body = response.json()
+            emails.extend(user["email"] for user in body["users"])
+            if body["next_cursor"] is None:
+                break
+            params["cursor"] = body["next_cursor"]
+
+        assert emails == [f"user{index}@example.com" for index in range(5)]
+
+    async def test_filters_are_passed_on(
+        self, client: AsyncClient, lister: FakeLister
+    ) -> None:
+        response = await client.get(
+            URL,
+            params={"is_active": "false", "email_prefix": "user1"},
+            headers=HEADERS,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert lister.calls == [{"is_active": False, "email_prefix": "user1"}]
+
+    async def test_invalid_cursor_is_a_bad_request(self, client: AsyncClient) -> None:
+        response = await client.get(URL, params={"cursor": "?"}, headers=HEADERS)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_requires_the_admin_token(self, client: AsyncClient) -> None:
+        response = await client.get(URL)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,43 @@
+"""Unit tests for the metrics route."""
+
+from collections.abc import AsyncGenerator
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.presentation.dependencies import metrics
+from app.presentation.routers.v1.metrics import router
+
+URL = "/metrics"
+TOKEN = "admin-token"  # noqa: S105 Possible hardcoded password
+METRICS = {"user_cache": {"hits": 1}}
+
+
+class TestMetricsRoute:
+    """Tests for GET /metrics."""
+
+    @pytest.fixture
+    async def client(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> AsyncGenerator[AsyncClient]:
+        monkeypatch.setattr(settings, "admin_token", TOKEN)
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[metrics] = lambda: METRICS
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+
+    async def test_admin_gets_the_metrics(self, client: AsyncClient) -> None:
+        response = await client.get(URL, headers={"Authorization": f"Bearer {TOKEN}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == METRICS
+
+    async def test_requires_the_admin_token(self, client: AsyncClient) -> None:
+        response = await client.get(URL, headers={"Authorization": "Bearer wrong"})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,110 @@
+"""Unit tests for RateLimitMiddleware."""
+
+from collections.abc import AsyncGenerator
+
+import pytest
+from fastapi import FastAPI, Request, status
+from httpx import ASGITransport, AsyncClient
+
+from app.config import RateLimitRule, RouteRateLimit
+from app.infrastructure.rate_limiter.memory_rate_limiter import MemoryRateLimiter
+from app.presentation.rate_limit import RateLimitMiddleware
+from tests.unit.fakes.fake_clock import FakeClock
+
+RULES = {
+    "/register": RouteRateLimit(
+        ip=RateLimitRule(capacity=3, refill_per_second=1),
+        email=RateLimitRule(capacity=1, refill_per_second=0.1),
+    ),
+}
+
+
+class TestRateLimitMiddleware:
+    """Tests for RateLimitMiddleware."""
+
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def app(self, clock: FakeClock) -> FastAPI:
+        app = FastAPI()
+        limiter = MemoryRateLimiter(clock=clock)
+        app.add_middleware(
+            RateLimitMiddleware, rate_limiter=lambda: limiter, rules=RULES
+        )
+
+        @app.post("/register")
+        async def register(request: Request) -> dict[str, object]:
+            return {"body": (await request.body()).decode()}
+
+        @app.post("/other")
+        async def other() -> None:
+            return None
+
+        return app
+
+    @pytest.fixture
+    async def client(self, app: FastAPI) -> AsyncGenerator[AsyncClient]:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+
+    async def test_body_is_replayed_to_the_route(self, client: AsyncClient) -> None:
+        response = await client.post("/register", json={"email": "a@example.com"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"body": '{"email":"a@example.com"}'}
+
+    async def test_limits_per_normalized_email(self, client: AsyncClient) -> None:
+        await client.post("/register", json={"email": "a@example.com"})
+
+        response = await client.post("/register", json={"email": " A@Example.com"})
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers["Retry-After"] == "10"
+
+    async def test_limits_per_basic_auth_email(self, client: AsyncClient) -> None:
+        await client.post("/register", auth=("a@example.com", "password"))
+
+        response = await client.post("/register", auth=("a@example.com", "password"))
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    async def test_bad_credentials_do_not_exhaust_the_owner_bucket(
+        self, app: FastAPI, client: AsyncClient
+    ) -> None:
+        for _ in range(2):
+            await client.post("/register", auth=("a@example.com", "guess"))
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app, client=("203.0.113.7", 123)),
+            base_url="http://test",
+        ) as owner:
+            response = await owner.post("/register", auth=("a@example.com", "secret"))
+
+        assert response.status_code == status.HTTP_200_OK
+
+    async def test_limits_per_ip(self, client: AsyncClient, clock: FakeClock) -> None:
+        for index in range(3):
+            response = await client.post("/register", json={"email": f"{index}@a.io"})
+            assert response.status_code == status.HTTP_200_OK
+
+        response = await client.post("/register", json={"email": "3@a.io"})
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers["Retry-After"] == "1"
+
+        clock.now = 1.0
+        response = await client.post("/register", json={"email": "3@a.io"})
+        assert response.status_code == status.HTTP_200_OK
+
+    async def test_invalid_body_is_left_to_the_route(self, client: AsyncClient) -> None:
+        for _ in range(2):
+            response = await client.post("/register", content=b"not json")
+            assert response.status_code == status.HTTP_200_OK
+
+    async def test_other_routes_are_not_limited(self, client: AsyncClient) -> None:
+        for _ in range(5):
+            response = await client.post("/other")
+            assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,100 @@
+"""Unit tests for the batch registration route."""
+
+from collections.abc import AsyncGenerator
+
+import orjson
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from app.application.use_cases.register_users import RegisterUsersUseCase
+from app.config import settings
+from app.presentation.batch import NDJSON_MEDIA_TYPE
+from app.presentation.dependencies import register_users_use_case
+from app.presentation.routers.v1.users import router
+from tests.unit.fakes.fake_code_store import FakeCodeStore
+from tests.unit.fakes.fake_event_publisher import FakeEventPublisher
+from tests.unit.fakes.fake_unit_of_work import FakeUnitOfWork
+
+URL = "/users/register:batch"
+PASSWORD = "securepassword123"  # noqa: S105 Possible hardcoded password
+TOKEN = "admin-token"  # noqa: S105 Possible hardcoded password
+ITEMS = [
+    {"email": "first@example.com", "password": PASSWORD},
+    {"email": "not-an-email", "password": PASSWORD},
+    {"email": "first@example.com", "password": PASSWORD},
+    {"email": "second@example.com", "password": PASSWORD},
+]
+
+
+class TestRegisterBatchRoute:
+    """Tests for POST /users/register:batch."""
+
+    @pytest.fixture
+    async def client(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> AsyncGenerator[AsyncClient]:
+        monkeypatch.setattr(settings, "admin_token", TOKEN)
+        uow = FakeUnitOfWork()
+        use_case = RegisterUsersUseCase(
+            uow_factory=lambda: uow,
+            code_store=FakeCodeStore(),
+            event_publisher=FakeEventPublisher(),
+        )
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[register_users_use_case] = lambda: use_case
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test",
+            headers={"Authorization": f"Bearer {TOKEN}"},
+        ) as client:
+            yield client
+
+    async def test_json_array_gets_a_result_per_item(self, client: AsyncClient) -> None:
+        response = await client.post(URL, json=ITEMS)
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert (body["registered"], body["failed"]) == (2, 2)
+        assert [result["status"] for result in body["results"]] == [
+            status.HTTP_201_CREATED,
+            status.HTTP_422_UNPROCESSABLE_CONTENT,
+            status.HTTP_409_CONFLICT,
+            status.HTTP_201_CREATED,
+        ]
+        assert [result["email"] for result in body["results"]] == [
+            item["email"] for item in ITEMS
+        ]
+        assert body["results"][0]["user_id"] is not None
+
+    async def test_ndjson_lines_are_items(self, client: AsyncClient) -> None:
+        content = b"\n".join(orjson.dumps(item) for item in ITEMS) + b"\n"
+
+        response = await client.post(
+            URL, content=content, headers={"Content-Type": NDJSON_MEDIA_TYPE}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["registered"] == 2  # noqa: PLR2004 Magic value used in comparison
+
+    async def test_body_must_be_an_array(self, client: AsyncClient) -> None:
+        response = await client.post(URL, json=ITEMS[0])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_too_many_items_are_refused(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "register_batch_max_items", 1)
+
+        response = await client.post(URL, json=ITEMS)
+
+        assert response.status_code == status.HTTP_413_CONTENT_TOO_LARGE
+
+    async def test_requires_the_admin_token(self, client: AsyncClient) -> None:
+        response = await client.post(
+            URL, json=ITEMS, headers={"Authorization": "Bearer wrong"}
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
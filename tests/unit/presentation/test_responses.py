@@ -0,0 +1,68 @@
+"""Unit tests for lean JSON responses."""
+
+import orjson
+from fastapi import status
+
+from app.application.dto.user_dto import (
+    ActivateUserResponse,
+    RegisterUserResponse,
+    ResendCodeResponse,
+)
+from app.domain import Email, UserId
+from app.presentation.responses import (
+    JSONBytesResponse,
+    activate_user_response,
+    register_user_response,
+    resend_code_response,
+)
+from app.presentation.schemas.users import (
+    ActivateResponseSchema,
+    RegisterResponseSchema,
+    ResendCodeResponseSchema,
+)
+
+USER_ID = UserId.generate()
+EMAIL = Email("user@example.com")
+
+
+class TestJSONBytesResponse:
+    """Tests for JSONBytesResponse."""
+
+    def test_bytes_content_is_sent_as_is(self) -> None:
+        response = JSONBytesResponse(b'{"a":1}')
+
+        assert response.body == b'{"a":1}'
+        assert response.headers["content-type"] == "application/json"
+
+
+class TestUserResponses:
+    """Lean responses must match what the response schemas document."""
+
+    def test_register_user_response(self) -> None:
+        result = RegisterUserResponse(USER_ID, EMAIL, "registered")
+
+        response = register_user_response(result)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        expected = RegisterResponseSchema(
+            user_id=USER_ID.value, email=EMAIL.value, message="registered"
+        )
+        assert orjson.loads(response.body) == expected.model_dump(mode="json")
+
+    def test_activate_user_response(self) -> None:
+        result = ActivateUserResponse(USER_ID, EMAIL, is_active=True)
+
+        response = activate_user_response(result)
+
+        assert response.status_code == status.HTTP_200_OK
+        expected = ActivateResponseSchema(user_id=USER_ID.value, email=EMAIL.value)
+        assert orjson.loads(response.body) == expected.model_dump(mode="json")
+
+    def test_resend_code_response(self) -> None:
+        result = ResendCodeResponse(EMAIL, "sent")
+
+        response = resend_code_response(result)
+
+        assert response.status_code == status.HTTP_200_OK
+        expected = ResendCodeResponseSchema(email=EMAIL.value, message="sent")
+        assert orjson.loads(response.body) == expected.model_dump(mode="json")